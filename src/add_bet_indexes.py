@@ -0,0 +1,25 @@
+"""
+Migration script to create the indexes declared on the paper trading and
+game stats models for tables that already exist
+"""
+
+from database import Base, get_engine
+
+INDEXED_TABLES = ['single_bets', 'parlay_bets', 'parlay_legs', 'bankroll_snapshots', 'game_stats']
+
+def add_bet_indexes():
+    """Create any model-declared indexes that are missing from the database"""
+
+    engine = get_engine()
+
+    for table_name in INDEXED_TABLES:
+        table = Base.metadata.tables[table_name]
+        for index in table.indexes:
+            print(f"Ensuring {index.name} on {table_name}...")
+            index.create(engine, checkfirst=True)
+            print(f"✓ {index.name} is in place")
+
+    print("\nMigration completed successfully!")
+
+if __name__ == "__main__":
+    add_bet_indexes()
@@ -0,0 +1,56 @@
+"""
+Migration script to turn potential_payout into a database-generated column
+on single_bets and parlay_bets
+"""
+
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+GENERATED_PAYOUTS = {
+    'single_bets': (
+        'CASE WHEN odds < 0 THEN stake + stake * (100 / abs(odds)) '
+        'ELSE stake + stake * (odds / 100) END'
+    ),
+    'parlay_bets': 'stake * payout_multiplier',
+}
+
+def add_computed_payouts():
+    """Replace the stored potential_payout columns with GENERATED ... STORED ones"""
+
+    db_url = os.getenv('DATABASE_URL', 'postgresql://localhost/sports_betting')
+    engine = create_engine(db_url)
+
+    with engine.connect() as conn:
+        for table_name, expression in GENERATED_PAYOUTS.items():
+            # Check if the column is already generated
+            check_query = text("""
+                SELECT is_generated
+                FROM information_schema.columns
+                WHERE table_name = :table_name
+                AND column_name = 'potential_payout'
+            """)
+
+            row = conn.execute(check_query, {"table_name": table_name}).first()
+
+            if row and row[0] == 'ALWAYS':
+                print(f"{table_name}.potential_payout is already generated")
+                continue
+
+            print(f"Converting {table_name}.potential_payout to a generated column...")
+            if row:
+                conn.execute(text(f"ALTER TABLE {table_name} DROP COLUMN potential_payout"))
+            conn.execute(text(f"""
+                ALTER TABLE {table_name}
+                ADD COLUMN potential_payout DOUBLE PRECISION
+                GENERATED ALWAYS AS ({expression}) STORED
+            """))
+            conn.commit()
+            print(f"✓ {table_name}.potential_payout is now computed by the database")
+
+        print("\nMigration completed successfully!")
+
+if __name__ == "__main__":
+    add_computed_payouts()
@@ -0,0 +1,63 @@
+"""
+Migration script to store bet and leg status as SMALLINT codes
+on single_bets, parlay_bets and parlay_legs
+"""
+
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+STATUS_TABLES = ['single_bets', 'parlay_bets', 'parlay_legs']
+
+# Must match STATUS_CODES in database.py
+STATUS_CASE = """
+    CASE status
+        WHEN 'pending' THEN 0
+        WHEN 'won' THEN 1
+        WHEN 'lost' THEN 2
+        WHEN 'void' THEN 3
+    END
+"""
+
+def add_integer_status():
+    """Convert the string status columns to SMALLINT codes"""
+
+    db_url = os.getenv('DATABASE_URL', 'postgresql://localhost/sports_betting')
+    engine = create_engine(db_url)
+
+    with engine.connect() as conn:
+        for table_name in STATUS_TABLES:
+            check_query = text("""
+                SELECT data_type
+                FROM information_schema.columns
+                WHERE table_name = :table_name
+                AND column_name = 'status'
+            """)
+
+            row = conn.execute(check_query, {"table_name": table_name}).first()
+
+            if not row:
+                print(f"{table_name}.status does not exist - skipping")
+                continue
+
+            if row[0] == 'smallint':
+                print(f"{table_name}.status is already a status code")
+                continue
+
+            print(f"Converting {table_name}.status to SMALLINT...")
+            conn.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN status DROP DEFAULT"))
+            conn.execute(text(f"""
+                ALTER TABLE {table_name}
+                ALTER COLUMN status TYPE SMALLINT
+                USING {STATUS_CASE}
+            """))
+            conn.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN status SET DEFAULT 0"))
+            conn.commit()
+            print(f"✓ {table_name}.status converted")
+
+        print("\nMigration completed successfully!")
+
+if __name__ == "__main__":
+    add_integer_status()
@@ -0,0 +1,73 @@
+"""
+Migration script to move timestamp defaults from the application to the database
+(server-side now() and timezone-aware columns)
+"""
+
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+# (table, column, whether the column gets a now() server default);
+# resolved_at stays NULL until a bet is resolved
+TIMESTAMP_COLUMNS = [
+    ('team_defensive_stats', 'last_updated', True),
+    ('paper_trading_account', 'created_at', True),
+    ('paper_trading_account', 'last_updated', True),
+    ('single_bets', 'placed_at', True),
+    ('single_bets', 'resolved_at', False),
+    ('parlay_bets', 'placed_at', True),
+    ('parlay_bets', 'resolved_at', False),
+    ('bankroll_snapshots', 'timestamp', True),
+]
+
+def add_server_timestamps():
+    """Convert timestamp columns to TIMESTAMPTZ, with a now() server default where one applies"""
+
+    db_url = os.getenv('DATABASE_URL', 'postgresql://localhost/sports_betting')
+    engine = create_engine(db_url)
+
+    with engine.connect() as conn:
+        for table_name, column_name, server_default in TIMESTAMP_COLUMNS:
+            check_query = text("""
+                SELECT data_type, column_default
+                FROM information_schema.columns
+                WHERE table_name = :table_name
+                AND column_name = :column_name
+            """)
+
+            row = conn.execute(check_query, {
+                "table_name": table_name,
+                "column_name": column_name
+            }).first()
+
+            if not row:
+                print(f"{table_name}.{column_name} does not exist - skipping")
+                continue
+
+            data_type, column_default = row
+
+            if data_type == 'timestamp without time zone':
+                # Existing values were written with datetime.utcnow()
+                print(f"Converting {table_name}.{column_name} to TIMESTAMPTZ...")
+                conn.execute(text(f"""
+                    ALTER TABLE {table_name}
+                    ALTER COLUMN "{column_name}" TYPE TIMESTAMPTZ
+                    USING "{column_name}" AT TIME ZONE 'UTC'
+                """))
+
+            if server_default and not column_default:
+                print(f"Adding now() default to {table_name}.{column_name}...")
+                conn.execute(text(f"""
+                    ALTER TABLE {table_name}
+                    ALTER COLUMN "{column_name}" SET DEFAULT now()
+                """))
+
+            conn.commit()
+            print(f"✓ {table_name}.{column_name} is up to date")
+
+        print("\nMigration completed successfully!")
+
+if __name__ == "__main__":
+    add_server_timestamps()
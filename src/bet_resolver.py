@@ -3,16 +3,22 @@ Bet Resolution Logic
 Handles automatic and manual resolution of bets
 """
 
-from database import get_session, SingleBet, ParlayBet, Player, GameStats
+from database import Session, SingleBet, ParlayBet, Player, GameStats
 from paper_trading import PaperTradingManager
 from datetime import datetime, timedelta
 
 class BetResolver:
     """Handles bet resolution using GameStats data"""
 
-    def __init__(self):
-        self.session = get_session()
-        self.manager = PaperTradingManager()
+    def __init__(self, manager=None):
+        if manager is None:
+            # Shared with the manager; expire_on_commit=False keeps the account
+            # and bets loaded across the manager's commits
+            self.session = Session()
+            self.manager = PaperTradingManager(session=self.session)
+        else:
+            self.manager = manager
+            self.session = manager.session
 
     def close(self):
         """Close database sessions"""
@@ -40,24 +46,22 @@ class BetResolver:
                 resolvable.append((bet.id, 'single', bet.player_name, game_stats.game_date))
 
         # Check parlay bets
+        for parlay in self._resolvable_parlays():
+            parlay_date = parlay.legs[0].game_date if parlay.legs else None
+            resolvable.append((parlay.id, 'parlay', f"{parlay.num_picks}-leg parlay", parlay_date))
+
+        return resolvable
+
+    def _resolvable_parlays(self):
+        """Pending parlays whose legs all have a matching game"""
         pending_parlays = self.session.query(ParlayBet).filter_by(
             status='pending'
         ).all()
 
-        for parlay in pending_parlays:
-            # Check if ALL legs can be resolved
-            all_resolvable = True
-            for leg in parlay.legs:
-                game_stats = self._find_matching_game_stats_for_leg(leg)
-                if not game_stats:
-                    all_resolvable = False
-                    break
-
-            if all_resolvable:
-                parlay_date = parlay.legs[0].game_date if parlay.legs else None
-                resolvable.append((parlay.id, 'parlay', f"{parlay.num_picks}-leg parlay", parlay_date))
-
-        return resolvable
+        return [
+            parlay for parlay in pending_parlays
+            if all(self._find_matching_game_stats_for_leg(leg) for leg in parlay.legs)
+        ]
 
     def auto_resolve_single_bet(self, bet_id):
         """
@@ -150,19 +154,17 @@ class BetResolver:
         """
         Batch auto-resolve all resolvable bets
 
+        Single bets with a result are resolved together in one
+        resolve_single_bets_batch call (one update, snapshot and commit);
+        DNP voids and parlays are resolved one by one.
+
         Returns: (num_resolved, num_failed)
         """
-        resolvable = self.check_resolvable_bets()
-
         num_resolved = 0
         num_failed = 0
 
-        for bet_id, bet_type, player_name, game_date in resolvable:
-            if bet_type == 'single':
-                success, result = self.auto_resolve_single_bet(bet_id)
-            else:
-                success, result = self.auto_resolve_parlay_bet(bet_id)
-
+        def report(bet_type, bet_id, success, result):
+            nonlocal num_resolved, num_failed
             if success:
                 num_resolved += 1
                 print(f"Resolved {bet_type} bet {bet_id}: {result}")
@@ -170,6 +172,42 @@ class BetResolver:
                 num_failed += 1
                 print(f"Failed to resolve {bet_type} bet {bet_id}: {result}")
 
+        # Collect the actual result of every resolvable single bet
+        results = {}
+
+        pending_singles = self.session.query(SingleBet).filter_by(
+            status='pending'
+        ).all()
+
+        for bet in pending_singles:
+            game_stats = self._find_matching_game_stats(bet)
+
+            if not game_stats:
+                continue
+
+            if game_stats.minutes == 0 or game_stats.minutes is None:
+                # DNP voids go through the single-bet path
+                report('single', bet.id, *self.auto_resolve_single_bet(bet.id))
+                continue
+
+            actual_result = getattr(game_stats, bet.stat_type, None)
+
+            if actual_result is None:
+                report('single', bet.id, False, f"Stat type '{bet.stat_type}' not found in game data")
+            else:
+                results[bet.id] = actual_result
+
+        if results:
+            profits = self.manager.resolve_single_bets_batch(results)
+            for bet_id in results:
+                if bet_id in profits:
+                    report('single', bet_id, True, profits[bet_id])
+                else:
+                    report('single', bet_id, False, "Failed to resolve bet")
+
+        for parlay in self._resolvable_parlays():
+            report('parlay', parlay.id, *self.auto_resolve_parlay_bet(parlay.id))
+
         return num_resolved, num_failed
 
     # ==================== MANUAL RESOLUTION ====================
@@ -5,7 +5,7 @@ Fetch NBA player statistics using the nba_api library
 from nba_api.stats.endpoints import playergamelog, commonplayerinfo, leaguedashteamstats
 from nba_api.stats.static import players, teams
 from database import get_session, Player, GameStats, Team, TeamDefensiveStats
-from datetime import datetime
+from sqlalchemy import func, insert
 import time
 import pandas as pd
 
@@ -102,14 +102,13 @@ class NBADataCollector:
                 if existing:
                     # Update existing record
                     existing.def_rating = def_rating
-                    existing.last_updated = datetime.utcnow()
+                    existing.last_updated = func.now()
                 else:
                     # Create new record
                     defensive_stat = TeamDefensiveStats(
                         team_id=team.id,
                         team_name=team_name,
-                        def_rating=def_rating,
-                        last_updated=datetime.utcnow()
+                        def_rating=def_rating
                     )
                     self.session.add(defensive_stat)
 
@@ -157,18 +156,26 @@ class NBADataCollector:
             
             print(f"Found {len(games_df)} games for {player_name}")
 
-            # Sort by date (oldest first) to calculate rest days correctly
+            # Sort by date (oldest first) to calculate rest days correctly;
+            # dates are parsed once, so the sort is chronological
+            games_df = games_df.assign(GAME_DATE=pd.to_datetime(games_df['GAME_DATE']))
             games_df = games_df.sort_values('GAME_DATE', ascending=True)
 
-            # Store each game in database
+            # Games already stored for these dates, with one query
+            existing_games = {
+                game.game_date: game
+                for game in self.session.query(GameStats).filter(
+                    GameStats.player_id == player.id,
+                    GameStats.game_date.in_(games_df['GAME_DATE'].dt.date.tolist())
+                )
+            }
+
+            # Collect new games and insert them together
+            new_games = []
             prev_game_date = None
             for idx, game in games_df.iterrows():
-                # Check if this game already exists
-                game_date = pd.to_datetime(game['GAME_DATE'])
-                existing = self.session.query(GameStats).filter_by(
-                    player_id=player.id,
-                    game_date=game_date
-                ).first()
+                game_date = game['GAME_DATE']
+                existing = existing_games.get(game_date.date())
 
                 # Calculate days of rest (days since previous game)
                 if prev_game_date is not None:
@@ -191,9 +198,9 @@ class NBADataCollector:
                 is_home = 'vs.' in matchup
                 opponent = matchup.split('vs.' if is_home else '@')[1].strip()
 
-                game_stat = GameStats(
+                new_games.append(dict(
                     player_id=player.id,
-                    game_date=game_date,
+                    game_date=game_date.date(),
                     opponent=opponent,
                     is_home=is_home,
                     days_rest=days_rest,
@@ -211,10 +218,12 @@ class NBADataCollector:
                     steals=float(game['STL']) if pd.notna(game['STL']) else None,
                     blocks=float(game['BLK']) if pd.notna(game['BLK']) else None,
                     turnovers=float(game['TOV']) if pd.notna(game['TOV']) else None
-                )
-                self.session.add(game_stat)
+                ))
 
                 prev_game_date = game_date
+
+            if new_games:
+                self.session.execute(insert(GameStats), new_games)
             
             self.session.commit()
             print(f"Successfully stored stats for {player_name}")
@@ -2,17 +2,41 @@
 Database schema for sports betting prediction model
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date, Boolean, ForeignKey, DateTime
+from sqlalchemy import create_engine, Column, Integer, String, Float, Date, Boolean, ForeignKey, DateTime, Computed, Index, SmallInteger, TypeDecorator, func
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import scoped_session, sessionmaker, relationship
 import os
 from dotenv import load_dotenv
-from datetime import datetime
 
 load_dotenv()
 
 Base = declarative_base()
 
+# Bet/leg status codes as stored in the database
+PENDING, WON, LOST, VOID = 0, 1, 2, 3
+STATUS_CODES = {'pending': PENDING, 'won': WON, 'lost': LOST, 'void': VOID}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+class BetStatus(TypeDecorator):
+    """
+    Bet status stored as a SMALLINT code but read and written as its name
+
+    Queries and models keep using 'pending'/'won'/'lost'/'void'; integer
+    codes are also accepted on write.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        return STATUS_CODES[value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return STATUS_NAMES[value]
+
 class Player(Base):
     """Store player information"""
     __tablename__ = 'players'
@@ -52,7 +76,7 @@ class TeamDefensiveStats(Base):
     def_rating_vs_centers = Column(Float)
 
     # Timestamp for data freshness
-    last_updated = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_updated = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 class GameStats(Base):
     """Store individual game statistics for players"""
@@ -108,8 +132,8 @@ class PaperTradingAccount(Base):
     total_bets_won = Column(Integer, default=0)
     total_bets_lost = Column(Integer, default=0)
     total_bets_void = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     single_bets = relationship("SingleBet", back_populates="account")
@@ -133,7 +157,12 @@ class SingleBet(Base):
     # Bet details
     stake = Column(Float, nullable=False)  # Amount wagered
     odds = Column(Float, default=-110)  # American odds format
-    potential_payout = Column(Float, nullable=False)  # stake * multiplier
+    # Stake + profit at the American odds, filled in by the database
+    potential_payout = Column(Float, Computed(
+        'CASE WHEN odds < 0 THEN stake + stake * (100 / abs(odds)) '
+        'ELSE stake + stake * (odds / 100) END',
+        persisted=True
+    ))
 
     # Prediction data (snapshot at time of bet)
     prediction = Column(Float, nullable=False)  # Model's prediction
@@ -148,13 +177,13 @@ class SingleBet(Base):
     game_date = Column(Date)  # Scheduled game date
 
     # Bet status
-    status = Column(String(20), default='pending')  # 'pending', 'won', 'lost', 'void'
+    status = Column(BetStatus, default='pending')  # 'pending', 'won', 'lost', 'void'
     actual_result = Column(Float)  # Actual stat value (when resolved)
     profit_loss = Column(Float, default=0.0)  # Actual P/L
 
     # Timestamps
-    placed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    resolved_at = Column(DateTime)
+    placed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    resolved_at = Column(DateTime(timezone=True))
 
     # Relationships
     account = relationship("PaperTradingAccount", back_populates="single_bets")
@@ -170,7 +199,7 @@ class ParlayBet(Base):
     # Bet details
     stake = Column(Float, nullable=False)
     payout_multiplier = Column(Float, nullable=False)  # e.g., 3.0 for 3x
-    potential_payout = Column(Float, nullable=False)
+    potential_payout = Column(Float, Computed('stake * payout_multiplier', persisted=True))
 
     # Prediction data (overall parlay)
     parlay_probability = Column(Float, nullable=False)  # Combined probability
@@ -178,12 +207,12 @@ class ParlayBet(Base):
     num_picks = Column(Integer, nullable=False)  # Number of legs
 
     # Bet status
-    status = Column(String(20), default='pending')  # 'pending', 'won', 'lost', 'void'
+    status = Column(BetStatus, default='pending')  # 'pending', 'won', 'lost', 'void'
     profit_loss = Column(Float, default=0.0)
 
     # Timestamps
-    placed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    resolved_at = Column(DateTime)
+    placed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    resolved_at = Column(DateTime(timezone=True))
 
     # Relationships
     account = relationship("PaperTradingAccount", back_populates="parlay_bets")
@@ -194,7 +223,7 @@ class ParlayLeg(Base):
     __tablename__ = 'parlay_legs'
 
     id = Column(Integer, primary_key=True)
-    parlay_id = Column(Integer, ForeignKey('parlay_bets.id'), nullable=False)
+    parlay_id = Column(Integer, ForeignKey('parlay_bets.id'), nullable=False, index=True)
 
     # Pick details
     player_id = Column(Integer, ForeignKey('players.id'), nullable=False)
@@ -214,7 +243,7 @@ class ParlayLeg(Base):
     game_date = Column(Date)
 
     # Resolution
-    status = Column(String(20), default='pending')  # 'pending', 'won', 'lost', 'void'
+    status = Column(BetStatus, default='pending')  # 'pending', 'won', 'lost', 'void'
     actual_result = Column(Float)
 
     # Relationships
@@ -231,29 +260,72 @@ class BankrollSnapshot(Base):
     total_profit = Column(Float, nullable=False)  # Cumulative profit
     total_bets = Column(Integer, nullable=False)
     win_rate = Column(Float)  # Percentage
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationship
     account = relationship("PaperTradingAccount", back_populates="snapshots")
 
-def create_database(db_url=None):
-    """Create all tables in the database"""
+# Composite indexes for the paper trading queries: (account_id, status) filters
+# with the ORDER BY column last so pending/history pulls are index range scans
+Index('ix_single_bets_account_status_placed',
+      SingleBet.account_id, SingleBet.status, SingleBet.placed_at.desc())
+Index('ix_single_bets_account_status_resolved',
+      SingleBet.account_id, SingleBet.status, SingleBet.resolved_at.desc())
+Index('ix_single_bets_account_status_confidence',
+      SingleBet.account_id, SingleBet.status, SingleBet.confidence)
+Index('ix_parlay_bets_account_status_placed',
+      ParlayBet.account_id, ParlayBet.status, ParlayBet.placed_at.desc())
+Index('ix_parlay_bets_account_status_resolved',
+      ParlayBet.account_id, ParlayBet.status, ParlayBet.resolved_at.desc())
+Index('ix_bankroll_snapshots_account_timestamp',
+      BankrollSnapshot.account_id, BankrollSnapshot.timestamp)
+
+# Lookback query (a player's most recent n games): index range scan in
+# game_date order; on PostgreSQL the stat columns are carried in the index
+# so reads of just those columns can skip the table
+Index('ix_game_stats_player_date',
+      GameStats.player_id, GameStats.game_date.desc(),
+      postgresql_include=['points', 'rebounds', 'assists', 'minutes', 'days_rest'])
+
+# One engine (and connection pool) per database URL for the whole process,
+# and one session factory per engine
+_engines = {}
+_session_factories = {}
+
+def get_engine(db_url=None):
+    """
+    Get the shared engine for a database URL, on the 2.0-style execution path
+
+    Keeps the compiled SQL cache enabled (sized for our query set) and pings
+    pooled connections before handing them out. Engines are created once and
+    reused, so sessions draw from one pool instead of each building their own.
+    """
     if db_url is None:
         db_url = os.getenv('DATABASE_URL', 'postgresql://localhost/sports_betting')
-    
-    engine = create_engine(db_url)
+
+    if db_url not in _engines:
+        _engines[db_url] = create_engine(
+            db_url, future=True, query_cache_size=1200, pool_pre_ping=True, pool_size=8
+        )
+    return _engines[db_url]
+
+def create_database(db_url=None):
+    """Create all tables in the database"""
+    engine = get_engine(db_url)
     Base.metadata.create_all(engine)
     print(f"Database tables created successfully!")
     return engine
 
 def get_session(db_url=None):
-    """Get a database session"""
-    if db_url is None:
-        db_url = os.getenv('DATABASE_URL', 'postgresql://localhost/sports_betting')
-    
-    engine = create_engine(db_url)
-    Session = sessionmaker(bind=engine)
-    return Session()
+    """Get a new database session on the shared engine"""
+    engine = get_engine(db_url)
+    if engine not in _session_factories:
+        _session_factories[engine] = sessionmaker(bind=engine, future=True)
+    return _session_factories[engine]()
+
+# Thread-local session for request handlers. Objects stay loaded after
+# commit, so reading e.g. the account bankroll does not trigger a reload.
+Session = scoped_session(sessionmaker(bind=get_engine(), future=True, expire_on_commit=False))
 
 if __name__ == "__main__":
     create_database()
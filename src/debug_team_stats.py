@@ -4,9 +4,19 @@ Debug script to see what team stats are available from NBA API
 """
 
 from nba_api.stats.endpoints import leaguedashteamstats
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import time
 
+def fetch_team_stats(season, measure_type):
+    """Fetch league team stats for one measure type as a DataFrame"""
+    team_stats = leaguedashteamstats.LeagueDashTeamStats(
+        season=season,
+        measure_type=measure_type,
+        per_mode='PerGame'
+    )
+    return team_stats.get_data_frames()[0]
+
 def check_available_stats():
     """Check what stats are available from the NBA API"""
 
@@ -15,19 +25,20 @@ def check_available_stats():
 
     season = '2025-26'
 
+    # Base and advanced requests are independent, so run them concurrently
+    executor = ThreadPoolExecutor(max_workers=2)
+    base_future = executor.submit(fetch_team_stats, season, 'Base')
+    adv_future = executor.submit(fetch_team_stats, season, 'Advanced')
+    executor.shutdown(wait=False)
+
     try:
         # Try to get team stats
         print(f"\nFetching team stats for {season} season...")
-        team_stats = leaguedashteamstats.LeagueDashTeamStats(
-            season=season,
-            measure_type='Base',
-            per_mode='PerGame'
-        )
+        stats_df = base_future.result()
 
+        # Small delay to respect API rate limits
         time.sleep(0.6)
 
-        stats_df = team_stats.get_data_frames()[0]
-
         print(f"✓ Found data for {len(stats_df)} teams")
         print(f"\nAvailable columns ({len(stats_df.columns)} total):")
         print("-"*80)
@@ -65,13 +76,7 @@ def check_available_stats():
         print("="*80)
 
         try:
-            advanced_stats = leaguedashteamstats.LeagueDashTeamStats(
-                season=season,
-                measure_type='Advanced',
-                per_mode='PerGame'
-            )
-            time.sleep(0.6)
-            adv_df = advanced_stats.get_data_frames()[0]
+            adv_df = adv_future.result()
 
             print(f"✓ Found advanced stats with {len(adv_df.columns)} columns")
 
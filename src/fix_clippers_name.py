@@ -4,6 +4,7 @@ Fix the LA Clippers name mismatch in the database
 """
 
 from database import get_session, Team
+from sqlalchemy import update
 
 def fix_clippers_name():
     """Update Clippers name to match NBA API"""
@@ -11,21 +12,21 @@ def fix_clippers_name():
     session = get_session()
 
     try:
-        # Find the Clippers team
-        clippers = session.query(Team).filter_by(abbreviation='LAC').first()
-
-        if not clippers:
-            print("Clippers team not found in database!")
-            return
-
-        print(f"Current name: {clippers.name}")
         print(f"Updating to: LA Clippers")
 
-        # Update the name
-        clippers.name = "LA Clippers"
+        # Single UPDATE statement - no SELECT or ORM object needed
+        result = session.execute(
+            update(Team)
+            .where(Team.abbreviation == 'LAC')
+            .values(name="LA Clippers")
+        )
         session.commit()
 
-        print("✓ Successfully updated LA Clippers name")
+        if result.rowcount == 0:
+            print("Clippers team not found in database!")
+            return
+
+        print(f"✓ Successfully updated LA Clippers name ({result.rowcount} row(s))")
 
     except Exception as e:
         print(f"Error: {e}")
@@ -4,11 +4,14 @@ Analyzes combinations of picks and calculates optimal bet sizing
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Callable, List, Optional
 from scipy.stats import norm
 from simple_model import SimplePredictor
+import logging
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Pick:
@@ -47,7 +50,8 @@ class MultiPickAnalyzer:
         self.model = prediction_model
 
     def evaluate_pick(self, pick: Pick, opponent: Optional[str] = None,
-                     days_rest: Optional[int] = None) -> Pick:
+                     days_rest: Optional[int] = None,
+                     opponent_factor: Optional[float] = None) -> Pick:
         """
         Evaluate a single pick using the prediction model
 
@@ -55,6 +59,8 @@ class MultiPickAnalyzer:
             pick: Pick object to evaluate
             opponent: Opponent team name for defensive adjustment
             days_rest: Days of rest before the game
+            opponent_factor: Prefetched opponent adjustment factor (skips the
+                per-pick defensive stats lookup when provided)
 
         Returns:
             Updated Pick object with prediction and probability filled in
@@ -74,28 +80,22 @@ class MultiPickAnalyzer:
         prediction, std_dev, _ = predictor.predict_weighted_average(pick.player_name)
 
         if prediction is None or std_dev is None:
-            print(f"Warning: No data available for {pick.player_name} - {pick.stat_type}")
+            logger.warning("No data available for %s - %s", pick.player_name, pick.stat_type)
             return pick
 
         # Apply opponent adjustment if provided
-        if opponent:
+        if opponent_factor is not None:
+            prediction = prediction * opponent_factor
+        elif opponent:
             prediction = predictor.apply_opponent_adjustment(prediction, opponent)
 
         # Apply rest adjustment if provided
         if days_rest is not None:
             prediction = predictor.apply_rest_adjustment(prediction, days_rest)
 
-        # Calculate probability based on direction
-        if pick.direction.upper() == 'OVER':
-            probability = 1 - norm.cdf(pick.line, prediction, std_dev)
-        elif pick.direction.upper() == 'UNDER':
-            probability = norm.cdf(pick.line, prediction, std_dev)
-        else:
-            raise ValueError(f"Invalid direction: {pick.direction}. Must be 'OVER' or 'UNDER'")
-
         # Update pick with prediction and probability
         pick.prediction = prediction
-        pick.probability = probability
+        pick.probability = self._pick_probability(pick, prediction, std_dev)
 
         # Close temp predictor session if we created one
         if predictor != self.model:
@@ -103,8 +103,99 @@ class MultiPickAnalyzer:
 
         return pick
 
+    def predict_many(self, picks: List[Pick], opponent_map: Optional[dict] = None,
+                     rest_map: Optional[dict] = None,
+                     on_pick_done: Optional[Callable[[int, int, Pick], None]] = None) -> List[Pick]:
+        """
+        Evaluate several picks with one recent-games query
+
+        All players' recent games are loaded together, opponent factors are
+        prefetched in one lookup, and every pick (whatever its stat type) is
+        predicted from those shared rows.
+
+        Args:
+            picks: Pick objects to evaluate
+            opponent_map: Dict mapping player_name -> opponent_team
+            rest_map: Dict mapping player_name -> days_rest
+            on_pick_done: Optional callback(i, n, pick) fired as each pick's
+                prediction is made (probabilities are filled in afterwards, for
+                the whole batch at once)
+
+        Returns:
+            The same Pick objects with prediction and probability filled in
+            (left as None when there is no data)
+        """
+        opponent_map = opponent_map or {}
+        rest_map = rest_map or {}
+
+        opponents = [opponent_map.get(pick.player_name) for pick in picks]
+        rest_days = [rest_map.get(pick.player_name) for pick in picks]
+
+        recent_stats = self.model.get_recent_stats_many([pick.player_name for pick in picks])
+        opponent_factors = self.model.get_opponent_factors(opponents)
+
+        n_picks = len(picks)
+        evaluated, std_devs = [], []
+        for i, (pick, opponent, days_rest, opponent_factor) in enumerate(
+                zip(picks, opponents, rest_days, opponent_factors), 1):
+            player_stats = recent_stats.get(pick.player_name)
+            stat_values = player_stats[pick.stat_type].dropna().values if player_stats is not None else []
+
+            if len(stat_values) == 0:
+                logger.warning("No data available for %s - %s", pick.player_name, pick.stat_type)
+                if on_pick_done:
+                    on_pick_done(i, n_picks, pick)
+                continue
+
+            prediction, std_dev = self.model.weighted_average(stat_values)
+
+            if opponent:
+                prediction = prediction * opponent_factor
+
+            if days_rest is not None:
+                prediction = self.model.apply_rest_adjustment(prediction, days_rest)
+
+            pick.prediction = prediction
+            evaluated.append(pick)
+            std_devs.append(std_dev)
+
+            if on_pick_done:
+                on_pick_done(i, n_picks, pick)
+
+        # Probabilities for every evaluated pick in one vectorized call
+        if evaluated:
+            evaluation = self.model.evaluate_against_lines(
+                [pick.prediction for pick in evaluated], std_devs, [pick.line for pick in evaluated]
+            )
+            for pick, prob_over, prob_under in zip(evaluated, evaluation['prob_over'],
+                                                   evaluation['prob_under']):
+                pick.probability = float(self._direction_probability(pick, prob_over, prob_under))
+
+        return picks
+
+    @staticmethod
+    def _direction_probability(pick: Pick, prob_over: float, prob_under: float) -> float:
+        """Pick the OVER or UNDER probability according to the pick's direction"""
+        if pick.direction.upper() == 'OVER':
+            return prob_over
+        elif pick.direction.upper() == 'UNDER':
+            return prob_under
+        else:
+            raise ValueError(f"Invalid direction: {pick.direction}. Must be 'OVER' or 'UNDER'")
+
+    @staticmethod
+    def _pick_probability(pick: Pick, prediction: float, std_dev: float) -> float:
+        """Probability that a pick hits, assuming a normal distribution"""
+        if pick.direction.upper() == 'OVER':
+            return 1 - norm.cdf(pick.line, prediction, std_dev)
+        elif pick.direction.upper() == 'UNDER':
+            return norm.cdf(pick.line, prediction, std_dev)
+        else:
+            raise ValueError(f"Invalid direction: {pick.direction}. Must be 'OVER' or 'UNDER'")
+
     def analyze_parlay(self, parlay: Parlay, opponent_map: Optional[dict] = None,
-                      rest_map: Optional[dict] = None) -> Parlay:
+                      rest_map: Optional[dict] = None, verbose: bool = False,
+                      on_pick_done: Optional[Callable[[int, int, Pick], None]] = None) -> Parlay:
         """
         Analyze a parlay bet with multiple picks
 
@@ -112,42 +203,56 @@ class MultiPickAnalyzer:
             parlay: Parlay object with picks to analyze
             opponent_map: Dict mapping player_name -> opponent_team
             rest_map: Dict mapping player_name -> days_rest
+            verbose: Log the analysis at INFO instead of DEBUG
+            on_pick_done: Optional callback(i, n, pick) fired as each pick finishes
 
         Returns:
             Updated Parlay object with analysis results
         """
-        print(f"\n{'='*70}")
-        print(f"PARLAY ANALYSIS - {len(parlay.picks)} picks")
-        print(f"{'='*70}")
-
-        opponent_map = opponent_map or {}
-        rest_map = rest_map or {}
+        level = logging.INFO if verbose else logging.DEBUG
 
-        # Evaluate each pick
-        evaluated_picks = []
-        for i, pick in enumerate(parlay.picks, 1):
-            print(f"\n--- Pick {i}: {pick.player_name} {pick.stat_type.upper()} {pick.direction} {pick.line} ---")
+        logger.log(level, "\n%s\nPARLAY ANALYSIS - %d picks\n%s", '=' * 70, len(parlay.picks), '=' * 70)
 
-            opponent = opponent_map.get(pick.player_name)
-            days_rest = rest_map.get(pick.player_name)
+        # Evaluate all picks in one batch (one games query, one opponent lookup)
+        evaluated_picks = self.predict_many(parlay.picks, opponent_map, rest_map, on_pick_done)
 
-            evaluated_pick = self.evaluate_pick(pick, opponent, days_rest)
-            evaluated_picks.append(evaluated_pick)
+        for i, evaluated_pick in enumerate(evaluated_picks, 1):
+            logger.log(level, "\n--- Pick %d: %s %s %s %s ---", i, evaluated_pick.player_name,
+                       evaluated_pick.stat_type.upper(), evaluated_pick.direction, evaluated_pick.line)
 
             if evaluated_pick.prediction is not None:
-                print(f"Prediction: {evaluated_pick.prediction:.2f}")
-                print(f"Probability: {evaluated_pick.probability*100:.1f}%")
+                logger.log(level, "Prediction: %.2f", evaluated_pick.prediction)
+                logger.log(level, "Probability: %.1f%%", evaluated_pick.probability * 100)
             else:
-                print("Could not evaluate this pick (insufficient data)")
+                logger.log(level, "Could not evaluate this pick (insufficient data)")
 
         # Update parlay with evaluated picks
         parlay.picks = evaluated_picks
 
+        return self.price_parlay(parlay, verbose=verbose)
+
+    def price_parlay(self, parlay: Parlay, verbose: bool = False) -> Parlay:
+        """
+        Compute probability, EV, ROI and recommendation for already-evaluated picks
+
+        This is pure arithmetic on pick.probability, so callers that cache
+        per-pick evaluations can re-price a parlay (e.g. a new stake or
+        multiplier) without touching the model.
+
+        Args:
+            parlay: Parlay whose picks have prediction/probability filled in
+            verbose: Log the summary at INFO instead of DEBUG
+
+        Returns:
+            Updated Parlay object with analysis results
+        """
+        level = logging.INFO if verbose else logging.DEBUG
+
         # Calculate parlay probability (all picks must hit)
         pick_probabilities = [p.probability for p in parlay.picks if p.probability is not None]
 
         if len(pick_probabilities) != len(parlay.picks):
-            print("\nWarning: Could not evaluate all picks. Cannot calculate parlay probability.")
+            logger.warning("Could not evaluate all picks. Cannot calculate parlay probability.")
             parlay.recommendation = "SKIP - Insufficient data"
             return parlay
 
@@ -179,26 +284,39 @@ class MultiPickAnalyzer:
         else:
             parlay.recommendation = "SKIP - Negative expected value"
 
-        # Print summary
-        print(f"\n{'='*70}")
-        print(f"PARLAY SUMMARY")
-        print(f"{'='*70}")
-        print(f"Number of picks: {len(parlay.picks)}")
-        print(f"Individual probabilities: {[f'{p*100:.1f}%' for p in pick_probabilities]}")
-        print(f"Parlay probability: {parlay.parlay_probability*100:.1f}%")
-        print(f"Payout multiplier: {parlay.payout_multiplier}x")
-        print(f"Stake: ${parlay.stake:.2f}")
-        print(f"Potential payout: ${potential_payout:.2f}")
-        print(f"Expected value: ${parlay.expected_value:.2f}")
-        print(f"ROI: {parlay.roi:.1f}%")
-        print(f"Quarter Kelly bet size: {quarter_kelly*100:.1f}% of bankroll")
-        print(f"\nRECOMMENDATION: {parlay.recommendation}")
-        print(f"{'='*70}\n")
+        # Log summary (skip building the record entirely when the level is off)
+        if logger.isEnabledFor(level):
+            logger.log(
+                level,
+                "\n%s\nPARLAY SUMMARY\n%s\n"
+                "Number of picks: %d\n"
+                "Individual probabilities: %s\n"
+                "Parlay probability: %.1f%%\n"
+                "Payout multiplier: %sx\n"
+                "Stake: $%.2f\n"
+                "Potential payout: $%.2f\n"
+                "Expected value: $%.2f\n"
+                "ROI: %.1f%%\n"
+                "Quarter Kelly bet size: %.1f%% of bankroll\n"
+                "\nRECOMMENDATION: %s\n%s\n",
+                '=' * 70, '=' * 70,
+                len(parlay.picks),
+                [f'{p*100:.1f}%' for p in pick_probabilities],
+                parlay.parlay_probability * 100,
+                parlay.payout_multiplier,
+                parlay.stake,
+                potential_payout,
+                parlay.expected_value,
+                parlay.roi,
+                quarter_kelly * 100,
+                parlay.recommendation,
+                '=' * 70
+            )
 
         return parlay
 
     def compare_parlays(self, parlays: List[Parlay], opponent_map: Optional[dict] = None,
-                       rest_map: Optional[dict] = None) -> List[Parlay]:
+                       rest_map: Optional[dict] = None, verbose: bool = False) -> List[Parlay]:
         """
         Compare multiple parlay options and rank them
 
@@ -206,35 +324,38 @@ class MultiPickAnalyzer:
             parlays: List of Parlay objects to compare
             opponent_map: Dict mapping player_name -> opponent_team
             rest_map: Dict mapping player_name -> days_rest
+            verbose: Log the comparison at INFO instead of DEBUG
 
         Returns:
             List of analyzed parlays sorted by expected value
         """
+        level = logging.INFO if verbose else logging.DEBUG
         analyzed_parlays = []
 
         for i, parlay in enumerate(parlays, 1):
-            print(f"\n{'#'*70}")
-            print(f"OPTION {i}")
-            print(f"{'#'*70}")
-            analyzed = self.analyze_parlay(parlay, opponent_map, rest_map)
+            logger.log(level, "\n%s\nOPTION %d\n%s", '#' * 70, i, '#' * 70)
+            analyzed = self.analyze_parlay(parlay, opponent_map, rest_map, verbose=verbose)
             analyzed_parlays.append(analyzed)
 
         # Sort by expected value (descending)
         analyzed_parlays.sort(key=lambda p: p.expected_value if p.expected_value else -float('inf'),
                             reverse=True)
 
-        # Print comparison
-        print(f"\n{'='*70}")
-        print(f"PARLAY COMPARISON (Ranked by Expected Value)")
-        print(f"{'='*70}")
-
-        for i, parlay in enumerate(analyzed_parlays, 1):
-            print(f"\nRank {i}:")
-            print(f"  Picks: {len(parlay.picks)}")
-            print(f"  Parlay Probability: {parlay.parlay_probability*100:.1f}%" if parlay.parlay_probability else "  N/A")
-            print(f"  Expected Value: ${parlay.expected_value:.2f}" if parlay.expected_value else "  N/A")
-            print(f"  ROI: {parlay.roi:.1f}%" if parlay.roi else "  N/A")
-            print(f"  Recommendation: {parlay.recommendation}")
+        # Log comparison
+        if logger.isEnabledFor(level):
+            logger.log(level, "\n%s\nPARLAY COMPARISON (Ranked by Expected Value)\n%s", '=' * 70, '=' * 70)
+
+            for i, parlay in enumerate(analyzed_parlays, 1):
+                logger.log(
+                    level,
+                    "\nRank %d:\n  Picks: %d\n%s\n%s\n%s\n  Recommendation: %s",
+                    i,
+                    len(parlay.picks),
+                    f"  Parlay Probability: {parlay.parlay_probability*100:.1f}%" if parlay.parlay_probability else "  N/A",
+                    f"  Expected Value: ${parlay.expected_value:.2f}" if parlay.expected_value else "  N/A",
+                    f"  ROI: {parlay.roi:.1f}%" if parlay.roi else "  N/A",
+                    parlay.recommendation
+                )
 
         return analyzed_parlays
 
@@ -243,6 +364,8 @@ if __name__ == "__main__":
     # Example usage
     from simple_model import SimplePredictor
 
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     # Create predictor
     predictor = SimplePredictor(stat_type='points', lookback_games=10)
 
@@ -281,6 +404,6 @@ if __name__ == "__main__":
         'Stephen Curry': 2   # 2 days rest (optimal)
     }
 
-    result = analyzer.analyze_parlay(parlay, opponent_map, rest_map)
+    result = analyzer.analyze_parlay(parlay, opponent_map, rest_map, verbose=True)
 
     predictor.close()
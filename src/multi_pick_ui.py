@@ -2,16 +2,31 @@
 Streamlit UI for multi-pick parlay analysis
 """
 
+import logging
+import time
+from dataclasses import replace
 import streamlit as st
 from database import get_session, Player
-from simple_model import SimplePredictor
-from multi_pick_analyzer import Pick, Parlay, MultiPickAnalyzer
+import numpy as np
 import pandas as pd
 
+# Keep the analyzer's per-pick log records off the hot path
+logging.getLogger('multi_pick_analyzer').setLevel(logging.WARNING)
+
 # PrizePicks color scheme
 PRIZEPICKS_GREEN = "#00d662"
 DARK_BG = "#0e1117"
-CARD_BG = "#1a1d24"
+
+# Default payout multipliers indexed by number of picks (index 0 unused)
+DEFAULT_MULTIPLIERS = (1.0, 1.0, 3.0, 6.0, 10.0, 15.0, 25.0)
+
+# Display labels for days of rest
+REST_DESCRIPTIONS = {
+    0: "Back-to-back",
+    1: "1 day rest",
+    2: "2 days rest (optimal)",
+    3: "3 days rest"
+}
 
 # Page configuration
 st.set_page_config(
@@ -22,75 +37,65 @@ st.set_page_config(
 )
 
 # Custom CSS for PrizePicks styling
-st.markdown(f"""
-    <style>
-    .main {{
-        background-color: {DARK_BG};
-    }}
-    .stButton>button {{
-        background-color: {PRIZEPICKS_GREEN};
-        color: black;
-        font-weight: bold;
-        border-radius: 8px;
-        border: none;
-        padding: 0.5rem 1rem;
-    }}
-    .stButton>button:hover {{
-        background-color: #00c158;
-    }}
-    .pick-card {{
-        background-color: {CARD_BG};
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 0.5rem 0;
-        border-left: 4px solid {PRIZEPICKS_GREEN};
-    }}
-    .metric-card {{
-        background-color: {CARD_BG};
-        padding: 1.5rem;
-        border-radius: 8px;
-        text-align: center;
-        margin: 0.5rem;
-    }}
-    .metric-value {{
-        font-size: 2rem;
-        font-weight: bold;
-        color: {PRIZEPICKS_GREEN};
-    }}
-    .metric-label {{
-        font-size: 0.9rem;
-        color: #888;
-        margin-top: 0.5rem;
-    }}
-    .recommendation-bet {{
-        background-color: {PRIZEPICKS_GREEN};
-        color: black;
-        padding: 1rem;
-        border-radius: 8px;
-        font-size: 1.2rem;
-        font-weight: bold;
-        text-align: center;
-        margin: 1rem 0;
-    }}
-    .recommendation-skip {{
-        background-color: #ff4444;
-        color: white;
-        padding: 1rem;
-        border-radius: 8px;
-        font-size: 1.2rem;
-        font-weight: bold;
-        text-align: center;
-        margin: 1rem 0;
-    }}
-    h1, h2, h3 {{
-        color: {PRIZEPICKS_GREEN};
-    }}
-    </style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def build_css(green, dark_bg):
+    """Format the page stylesheet once; reruns reuse the cached string"""
+    return f"""
+        <style>
+        .main {{
+            background-color: {dark_bg};
+        }}
+        .stButton>button {{
+            background-color: {green};
+            color: black;
+            font-weight: bold;
+            border-radius: 8px;
+            border: none;
+            padding: 0.5rem 1rem;
+        }}
+        .stButton>button:hover {{
+            background-color: #00c158;
+        }}
+        [data-testid="stMetricValue"] {{
+            font-weight: bold;
+            color: {green};
+        }}
+        .recommendation-bet {{
+            background-color: {green};
+            color: black;
+            padding: 1rem;
+            border-radius: 8px;
+            font-size: 1.2rem;
+            font-weight: bold;
+            text-align: center;
+            margin: 1rem 0;
+        }}
+        .recommendation-skip {{
+            background-color: #ff4444;
+            color: white;
+            padding: 1rem;
+            border-radius: 8px;
+            font-size: 1.2rem;
+            font-weight: bold;
+            text-align: center;
+            margin: 1rem 0;
+        }}
+        h1, h2, h3 {{
+            color: {green};
+        }}
+        </style>
+    """
+
+st.markdown(build_css(PRIZEPICKS_GREEN, DARK_BG), unsafe_allow_html=True)
 
 # Initialize session state
+# Picks are keyed by a stable, monotonically increasing id so removals
+# never shift the remaining entries
 if 'picks' not in st.session_state:
-    st.session_state.picks = []
+    st.session_state.picks = {}
+
+if 'next_pick_id' not in st.session_state:
+    st.session_state.next_pick_id = 0
 
 if 'opponent_map' not in st.session_state:
     st.session_state.opponent_map = {}
@@ -98,16 +103,68 @@ if 'opponent_map' not in st.session_state:
 if 'rest_map' not in st.session_state:
     st.session_state.rest_map = {}
 
+# (pick_keys, evaluated_at, evaluations) of the last Analyze, so analyzing
+# the same picks again skips the model
+if 'last_evaluation' not in st.session_state:
+    st.session_state.last_evaluation = None
+
+# Seconds a parlay's pick evaluations are reused for repeat Analyze clicks
+EVALUATION_TTL = 3600
+
 # Load players from database
-@st.cache_data
+@st.cache_resource
 def load_players():
-    """Load all players from database"""
+    """Load all player names from database"""
     session = get_session()
-    players = session.query(Player).order_by(Player.name).all()
-    player_names = [p.name for p in players]
+    rows = session.query(Player.name).order_by(Player.name).all()
+    player_names = [name for (name,) in rows]
     session.close()
     return player_names
 
+def evaluate_picks(pick_keys, on_pick_done=None):
+    """
+    Model predictions/probabilities for a set of picks, in one batch
+
+    pick_keys is a tuple of (player, stat_type, line, direction, opponent,
+    days_rest). on_pick_done is passed through to predict_many for progress
+    updates. Not wrapped in st.cache_data: the progress callback draws into
+    this run's placeholder, which a cache hit would try to replay in a later
+    run. Repeat clicks reuse st.session_state.last_evaluation instead.
+
+    Returns: list of (prediction, probability) in pick order
+    """
+    # Model modules are imported lazily so the sidebar paints before they load
+    from simple_model import SimplePredictor
+    from multi_pick_analyzer import MultiPickAnalyzer, Pick
+
+    # The predictor's session lives for this call alone, so concurrent
+    # browser sessions never share it
+    predictor = SimplePredictor(stat_type='points', lookback_games=10)
+    analyzer = MultiPickAnalyzer(predictor)
+    picks = [
+        Pick(player_name=player, stat_type=stat_type, line=line, direction=direction)
+        for player, stat_type, line, direction, _, _ in pick_keys
+    ]
+    opponent_map = {key[0]: key[4] for key in pick_keys if key[4]}
+    rest_map = {key[0]: key[5] for key in pick_keys if key[5] is not None}
+
+    try:
+        evaluated = analyzer.predict_many(picks, opponent_map, rest_map, on_pick_done)
+    finally:
+        predictor.close()
+    return [(pick.prediction, pick.probability) for pick in evaluated]
+
+@st.cache_data
+def quarter_kelly(probability, payout_multiplier):
+    """
+    Quarter Kelly stake as a percent of bankroll, floored at 0
+
+    Independent of stake, so it is only recomputed when the probability or
+    multiplier changes. The epsilon keeps a 1.0x multiplier from dividing by zero.
+    """
+    kelly_fraction = (probability * payout_multiplier - 1.0) / (payout_multiplier - 1.0 + 1e-12)
+    return max(0.0, kelly_fraction) * 25.0
+
 # Sidebar - Add Pick Form
 st.sidebar.title("🏀 Add Pick")
 st.sidebar.markdown("---")
@@ -143,6 +200,8 @@ with st.sidebar.form("add_pick_form", clear_on_submit=True):
         submitted = st.form_submit_button("➕ Add Pick", use_container_width=True)
 
         if submitted:
+            from multi_pick_analyzer import Pick
+
             # Create pick
             pick = Pick(
                 player_name=player,
@@ -152,7 +211,8 @@ with st.sidebar.form("add_pick_form", clear_on_submit=True):
             )
 
             # Add to session state
-            st.session_state.picks.append(pick)
+            st.session_state.picks[st.session_state.next_pick_id] = pick
+            st.session_state.next_pick_id += 1
 
             # Store adjustments if provided
             if opponent:
@@ -168,29 +228,36 @@ st.sidebar.markdown("---")
 st.sidebar.title("📋 Current Picks")
 
 if st.session_state.picks:
-    for i, pick in enumerate(st.session_state.picks):
-        col1, col2 = st.sidebar.columns([4, 1])
-
-        with col1:
-            st.markdown(f"""
-                <div class="pick-card">
-                    <strong>{pick.player_name}</strong><br>
-                    {pick.stat_type.upper()} {pick.direction} {pick.line}
-                </div>
-            """, unsafe_allow_html=True)
-
-        with col2:
-            if st.button("❌", key=f"remove_{i}"):
-                st.session_state.picks.pop(i)
-                # Clean up adjustments
-                if pick.player_name in st.session_state.opponent_map:
-                    del st.session_state.opponent_map[pick.player_name]
-                if pick.player_name in st.session_state.rest_map:
-                    del st.session_state.rest_map[pick.player_name]
-                st.rerun()
+    # One selectable table for all picks instead of a card + button per pick
+    pick_ids = list(st.session_state.picks)
+    picks = list(st.session_state.picks.values())
+    picks_df = pd.DataFrame({
+        'Player': [p.player_name for p in picks],
+        'Stat': [p.stat_type.upper() for p in picks],
+        'Dir': [p.direction for p in picks],
+        'Line': [p.line for p in picks]
+    }, index=pick_ids)
+
+    selection = st.sidebar.dataframe(
+        picks_df,
+        on_select='rerun',
+        selection_mode='multi-row',
+        hide_index=True,
+        use_container_width=True,
+        key='picks_table'
+    )
+    selected_rows = set(selection.selection.rows)
+
+    if st.sidebar.button("❌ Remove Selected", use_container_width=True, disabled=not selected_rows):
+        for i in selected_rows:
+            removed = st.session_state.picks.pop(pick_ids[i])
+            # Clean up adjustments
+            st.session_state.opponent_map.pop(removed.player_name, None)
+            st.session_state.rest_map.pop(removed.player_name, None)
+        st.rerun()
 
     if st.sidebar.button("🗑️ Clear All Picks", use_container_width=True):
-        st.session_state.picks = []
+        st.session_state.picks = {}
         st.session_state.opponent_map = {}
         st.session_state.rest_map = {}
         st.rerun()
@@ -204,202 +271,195 @@ st.markdown("---")
 if not st.session_state.picks:
     st.info("👈 Add picks using the sidebar to get started!")
 else:
-    # Parlay configuration
-    col1, col2, col3 = st.columns([2, 2, 1])
-
-    with col1:
-        # Default payout multipliers based on number of picks
-        num_picks = len(st.session_state.picks)
-        default_multipliers = {
-            1: 1.0,
-            2: 3.0,
-            3: 6.0,
-            4: 10.0,
-            5: 15.0,
-            6: 25.0
-        }
-        default_multiplier = default_multipliers.get(num_picks, num_picks * 3.0)
-
-        payout_multiplier = st.number_input(
-            "Payout Multiplier",
-            min_value=1.0,
-            value=default_multiplier,
-            step=0.5,
-            help=f"Default for {num_picks}-pick parlay"
-        )
+    # Parlay configuration (a form so typing in the inputs does not rerun the page)
+    with st.form("analyze_form"):
+        col1, col2, col3 = st.columns([2, 2, 1])
 
-    with col2:
-        stake = st.number_input(
-            "Stake ($)",
-            min_value=1.0,
-            value=10.0,
-            step=1.0
-        )
+        with col1:
+            # Default payout multipliers based on number of picks
+            num_picks = len(st.session_state.picks)
+            if num_picks < len(DEFAULT_MULTIPLIERS):
+                default_multiplier = DEFAULT_MULTIPLIERS[num_picks]
+            else:
+                default_multiplier = num_picks * 3.0
+
+            payout_multiplier = st.number_input(
+                "Payout Multiplier",
+                min_value=1.0,
+                value=default_multiplier,
+                step=0.5,
+                help=f"Default for {num_picks}-pick parlay"
+            )
+
+        with col2:
+            stake = st.number_input(
+                "Stake ($)",
+                min_value=1.0,
+                value=10.0,
+                step=1.0
+            )
 
-    with col3:
-        st.markdown("<br>", unsafe_allow_html=True)
-        analyze_button = st.button("🔍 Analyze Parlay", use_container_width=True)
+        with col3:
+            st.markdown("<br>", unsafe_allow_html=True)
+            analyze_button = st.form_submit_button("🔍 Analyze Parlay", use_container_width=True)
 
     # Analysis results
     if analyze_button:
-        with st.spinner("Analyzing parlay..."):
-            try:
-                # Create parlay object
-                parlay = Parlay(
-                    picks=st.session_state.picks.copy(),
-                    payout_multiplier=payout_multiplier,
-                    stake=stake
+        status = st.empty()
+        try:
+            from multi_pick_analyzer import MultiPickAnalyzer, Parlay
+
+            # Evaluate all picks in one batch, keyed only on the picks and
+            # their adjustments so a new stake or multiplier re-prices the
+            # parlay without re-running the model
+            pick_keys = tuple(
+                (
+                    pick.player_name,
+                    pick.stat_type,
+                    pick.line,
+                    pick.direction,
+                    st.session_state.opponent_map.get(pick.player_name),
+                    st.session_state.rest_map.get(pick.player_name)
                 )
-
-                # Initialize analyzer
-                predictor = SimplePredictor(stat_type='points', lookback_games=10)
-                analyzer = MultiPickAnalyzer(predictor)
-
-                # Analyze parlay (suppress console output)
-                import io
-                import sys
-                old_stdout = sys.stdout
-                sys.stdout = io.StringIO()
-
-                result = analyzer.analyze_parlay(
-                    parlay,
-                    opponent_map=st.session_state.opponent_map,
-                    rest_map=st.session_state.rest_map
+                for pick in st.session_state.picks.values()
+            )
+            last = st.session_state.last_evaluation
+            if last and last[0] == pick_keys and time.time() - last[1] < EVALUATION_TTL:
+                evaluations = last[2]
+            else:
+                status.markdown("Analyzing parlay...")
+                evaluations = evaluate_picks(
+                    pick_keys,
+                    on_pick_done=lambda i, n, pick: status.markdown(
+                        f"Evaluated {i}/{n}: {pick.player_name}"
+                    )
                 )
-
-                sys.stdout = old_stdout
-                predictor.close()
-
-                # Display results
-                st.markdown("## 📊 Analysis Results")
-                st.markdown("---")
-
-                # Recommendation banner
-                if result.recommendation and "BET" in result.recommendation:
-                    st.markdown(f"""
-                        <div class="recommendation-bet">
-                            ✅ {result.recommendation}
-                        </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                        <div class="recommendation-skip">
-                            ❌ {result.recommendation}
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                # Metrics
-                metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
-
-                with metric_col1:
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{result.parlay_probability*100:.1f}%</div>
-                            <div class="metric-label">Parlay Probability</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                with metric_col2:
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">${result.expected_value:.2f}</div>
-                            <div class="metric-label">Expected Value</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                with metric_col3:
-                    roi_color = PRIZEPICKS_GREEN if result.roi > 0 else "#ff4444"
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value" style="color: {roi_color};">{result.roi:.1f}%</div>
-                            <div class="metric-label">ROI</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                with metric_col4:
-                    # Calculate Kelly
-                    if result.payout_multiplier > 1 and result.parlay_probability:
-                        kelly_fraction = (result.parlay_probability * result.payout_multiplier - 1) / \
-                                       (result.payout_multiplier - 1)
-                        quarter_kelly = kelly_fraction * 0.25 * 100
-                    else:
-                        quarter_kelly = 0
-
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{quarter_kelly:.1f}%</div>
-                            <div class="metric-label">Quarter Kelly</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                # Payout breakdown
-                st.markdown("### 💰 Payout Breakdown")
-                potential_payout = stake * payout_multiplier
-                potential_profit = potential_payout - stake
-
-                payout_col1, payout_col2, payout_col3 = st.columns(3)
-                with payout_col1:
-                    st.metric("Stake", f"${stake:.2f}")
-                with payout_col2:
-                    st.metric("Potential Payout", f"${potential_payout:.2f}")
-                with payout_col3:
-                    st.metric("Potential Profit", f"${potential_profit:.2f}",
-                             delta=f"{(potential_profit/stake)*100:.0f}%")
-
-                # Individual pick breakdown
-                st.markdown("### 📈 Individual Pick Breakdown")
-
-                pick_data = []
+                status.empty()
+                st.session_state.last_evaluation = (pick_keys, time.time(), evaluations)
+            evaluated_picks = [
+                replace(pick, prediction=prediction, probability=probability)
+                for pick, (prediction, probability) in zip(st.session_state.picks.values(), evaluations)
+            ]
+
+            # Create parlay object and price it (stake/multiplier only affect this step)
+            parlay = Parlay(
+                picks=evaluated_picks,
+                payout_multiplier=payout_multiplier,
+                stake=stake
+            )
+            # Pricing is arithmetic on the cached probabilities; no model needed
+            result = MultiPickAnalyzer(prediction_model=None).price_parlay(parlay)
+
+            # Display results
+            st.markdown("## 📊 Analysis Results")
+            st.markdown("---")
+
+            # Recommendation banner
+            if result.recommendation and "BET" in result.recommendation:
+                st.markdown(f"""
+                    <div class="recommendation-bet">
+                        ✅ {result.recommendation}
+                    </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                    <div class="recommendation-skip">
+                        ❌ {result.recommendation}
+                    </div>
+                """, unsafe_allow_html=True)
+
+            # Metrics
+            metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+
+            with metric_col1:
+                st.metric("Parlay Probability", f"{result.parlay_probability*100:.1f}%")
+
+            with metric_col2:
+                st.metric("Expected Value", f"${result.expected_value:.2f}")
+
+            with metric_col3:
+                # Delta arrow/colour replaces the old green/red ROI styling
+                st.metric("ROI", f"{result.roi:.1f}%",
+                         delta="+EV" if result.roi > 0 else "-EV")
+
+            with metric_col4:
+                kelly_pct = quarter_kelly(result.parlay_probability, result.payout_multiplier)
+                st.metric("Quarter Kelly", f"{kelly_pct:.1f}%")
+
+            # Payout breakdown
+            st.markdown("### 💰 Payout Breakdown")
+            potential_payout = stake * payout_multiplier
+            potential_profit = potential_payout - stake
+
+            payout_col1, payout_col2, payout_col3 = st.columns(3)
+            with payout_col1:
+                st.metric("Stake", f"${stake:.2f}")
+            with payout_col2:
+                st.metric("Potential Payout", f"${potential_payout:.2f}")
+            with payout_col3:
+                st.metric("Potential Profit", f"${potential_profit:.2f}",
+                         delta=f"{(potential_profit/stake)*100:.0f}%")
+
+            # Individual pick breakdown
+            st.markdown("### 📈 Individual Pick Breakdown")
+
+            # Build the table column-wise
+            players, stats, lines, directions, predictions, probabilities = [], [], [], [], [], []
+            for pick in result.picks:
+                if pick.prediction is not None and pick.probability is not None:
+                    players.append(pick.player_name)
+                    stats.append(pick.stat_type.upper())
+                    lines.append(pick.line)
+                    directions.append(pick.direction)
+                    predictions.append(pick.prediction)
+                    probabilities.append(pick.probability)
+
+            if players:
+                # Edge in the bet's favour: prediction - line for OVER, line - prediction for UNDER
+                pred_arr = np.asarray(predictions, dtype=float)
+                line_arr = np.asarray(lines, dtype=float)
+                sign = np.where(np.asarray(directions) == "OVER", 1.0, -1.0)
+                edges = sign * (pred_arr - line_arr)
+
+                df = pd.DataFrame({
+                    "Player": players,
+                    "Stat": stats,
+                    "Line": lines,
+                    "Direction": directions,
+                    "Prediction": [f"{p:.2f}" for p in pred_arr],
+                    "Probability": [f"{p*100:.1f}%" for p in probabilities],
+                    "Edge": [f"{e:+.2f}" for e in edges]
+                })
+                st.dataframe(df, use_container_width=True, hide_index=True)
+
+            # Show adjustments applied
+            if st.session_state.opponent_map or st.session_state.rest_map:
+                st.markdown("### ⚙️ Adjustments Applied")
+
+                adj_data = []
                 for pick in result.picks:
-                    if pick.prediction is not None and pick.probability is not None:
-                        pick_data.append({
+                    adjustments = []
+                    if pick.player_name in st.session_state.opponent_map:
+                        adjustments.append(f"Opponent: {st.session_state.opponent_map[pick.player_name]}")
+                    if pick.player_name in st.session_state.rest_map:
+                        days = st.session_state.rest_map[pick.player_name]
+                        rest_desc = REST_DESCRIPTIONS.get(days, f"{days} days rest")
+                        adjustments.append(f"Rest: {rest_desc}")
+
+                    if adjustments:
+                        adj_data.append({
                             "Player": pick.player_name,
-                            "Stat": pick.stat_type.upper(),
-                            "Line": pick.line,
-                            "Direction": pick.direction,
-                            "Prediction": f"{pick.prediction:.2f}",
-                            "Probability": f"{pick.probability*100:.1f}%",
-                            "Edge": f"{pick.prediction - pick.line:+.2f}" if pick.direction == "OVER"
-                                    else f"{pick.line - pick.prediction:+.2f}"
+                            "Adjustments": ", ".join(adjustments)
                         })
 
-                if pick_data:
-                    df = pd.DataFrame(pick_data)
-                    st.dataframe(df, use_container_width=True, hide_index=True)
-
-                # Show adjustments applied
-                if st.session_state.opponent_map or st.session_state.rest_map:
-                    st.markdown("### ⚙️ Adjustments Applied")
-
-                    adj_data = []
-                    for pick in result.picks:
-                        adjustments = []
-                        if pick.player_name in st.session_state.opponent_map:
-                            adjustments.append(f"Opponent: {st.session_state.opponent_map[pick.player_name]}")
-                        if pick.player_name in st.session_state.rest_map:
-                            days = st.session_state.rest_map[pick.player_name]
-                            rest_desc = {
-                                0: "Back-to-back",
-                                1: "1 day rest",
-                                2: "2 days rest (optimal)",
-                                3: "3 days rest"
-                            }.get(days, f"{days} days rest")
-                            adjustments.append(f"Rest: {rest_desc}")
-
-                        if adjustments:
-                            adj_data.append({
-                                "Player": pick.player_name,
-                                "Adjustments": ", ".join(adjustments)
-                            })
-
-                    if adj_data:
-                        adj_df = pd.DataFrame(adj_data)
-                        st.dataframe(adj_df, use_container_width=True, hide_index=True)
-
-            except Exception as e:
-                st.error(f"Error analyzing parlay: {str(e)}")
-                import traceback
-                st.code(traceback.format_exc())
+                if adj_data:
+                    adj_df = pd.DataFrame(adj_data)
+                    st.dataframe(adj_df, use_container_width=True, hide_index=True)
+
+        except Exception as e:
+            st.error(f"Error analyzing parlay: {str(e)}")
+            import traceback
+            st.code(traceback.format_exc())
 
 # Footer
 st.markdown("---")
@@ -4,18 +4,53 @@ Handles bet placement, resolution, and analytics for paper trading
 """
 
 from database import (
-    get_session, PaperTradingAccount, SingleBet, ParlayBet, ParlayLeg,
-    BankrollSnapshot, Player
+    Session, PaperTradingAccount, SingleBet, ParlayBet, ParlayLeg,
+    BankrollSnapshot, Player, WON, LOST, VOID
 )
-from datetime import datetime, timedelta
-from sqlalchemy import desc, func
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import case, desc, func, select, update
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.util import identity_key
+import numpy as np
+
+# Minimum spacing between snapshots when the bankroll has not moved
+SNAPSHOT_INTERVAL = timedelta(seconds=60)
+
+# Profit per $1 staked on a winning single bet at -110 odds
+PROFIT_PER_DOLLAR = 100.0 / 110.0
+
+def _utcnow():
+    """Current time as an aware UTC datetime, for the TIMESTAMPTZ resolved_at columns"""
+    return datetime.now(timezone.utc)
+
+def _resolve_outcomes(lines, actual, stakes, payouts, is_over):
+    """
+    Outcome math for a batch of single bets, on plain arrays
+
+    A push exactly on the line is void (stake refunded); wins pay out
+    potential_payout, profit at -110 odds.
+
+    Returns: (status_codes, profit, bankroll_credit), with the database
+    status codes so they can be written as-is
+    """
+    void = actual == lines
+    won = ~void & np.where(is_over, actual > lines, actual < lines)
+
+    status_codes = np.where(void, VOID, np.where(won, WON, LOST)).astype(np.int8)
+    profit = np.where(void, 0.0, np.where(won, stakes * PROFIT_PER_DOLLAR, -stakes))
+    credit = float(payouts[won].sum() + stakes[void].sum())
+
+    return status_codes, profit, credit
 
 class PaperTradingManager:
     """Manages paper trading account and bet operations"""
 
-    def __init__(self, user_id='default_user'):
-        self.session = get_session()
+    def __init__(self, user_id='default_user', session=None):
+        self.session = session or Session()
         self.user_id = user_id
+        self._last_snapshot = None  # (time, values) of the last snapshot written
+        self._player_id_cache = {}  # player name -> Player.id, filled lazily
+        self._summary_cache = None  # get_account_summary result, cleared on every commit
         self.account = self._get_or_create_account()
 
     def _get_or_create_account(self):
@@ -31,10 +66,13 @@ class PaperTradingManager:
                 current_bankroll=1000.0
             )
             self.session.add(account)
-            self.session.commit()
+            self.session.flush()  # Get account.id
 
             # Create initial snapshot
-            self._create_snapshot()
+            self.account = account
+            self._create_snapshot(force=True)
+
+            self._commit()
 
         return account
 
@@ -42,10 +80,18 @@ class PaperTradingManager:
         """Close database session"""
         self.session.close()
 
+    def refresh(self):
+        """Drop loaded state so the next reads pick up changes made elsewhere"""
+        self.session.expire_all()
+        self._summary_cache = None
+
     # ==================== ACCOUNT MANAGEMENT ====================
 
     def get_account_summary(self):
-        """Return current account metrics"""
+        """Return current account metrics (cached until the next bet change)"""
+        if self._summary_cache is not None:
+            return self._summary_cache
+
         total_profit = self.account.current_bankroll - self.account.starting_bankroll
 
         # Calculate ROI
@@ -61,18 +107,21 @@ class PaperTradingManager:
         else:
             win_rate = 0
 
-        # Count pending bets
-        pending_singles = self.session.query(SingleBet).filter_by(
-            account_id=self.account.id,
-            status='pending'
-        ).count()
-
-        pending_parlays = self.session.query(ParlayBet).filter_by(
-            account_id=self.account.id,
-            status='pending'
-        ).count()
+        # Count pending bets (both tables in one round trip)
+        pending_singles, pending_parlays = self.session.execute(
+            select(
+                select(func.count(SingleBet.id)).where(
+                    SingleBet.account_id == self.account.id,
+                    SingleBet.status == 'pending'
+                ).scalar_subquery(),
+                select(func.count(ParlayBet.id)).where(
+                    ParlayBet.account_id == self.account.id,
+                    ParlayBet.status == 'pending'
+                ).scalar_subquery()
+            )
+        ).one()
 
-        return {
+        self._summary_cache = {
             'current_bankroll': self.account.current_bankroll,
             'starting_bankroll': self.account.starting_bankroll,
             'total_profit': total_profit,
@@ -84,6 +133,7 @@ class PaperTradingManager:
             'total_void': self.account.total_bets_void,
             'pending_bets': pending_singles + pending_parlays
         }
+        return self._summary_cache
 
     def check_sufficient_funds(self, stake):
         """Validate user has enough bankroll"""
@@ -101,10 +151,9 @@ class PaperTradingManager:
         self.account.total_bets_won = 0
         self.account.total_bets_lost = 0
         self.account.total_bets_void = 0
-        self.account.last_updated = datetime.utcnow()
 
-        self.session.commit()
-        self._create_snapshot()
+        self._create_snapshot(force=True)
+        self._commit()
 
     # ==================== SINGLE BET OPERATIONS ====================
 
@@ -123,29 +172,27 @@ class PaperTradingManager:
                 return None
 
             # Get player_id
-            player = self.session.query(Player).filter_by(name=player_name).first()
-            if not player:
+            player_id = self._resolve_player_id(player_name)
+            if not player_id:
                 print(f"Player {player_name} not found in database")
                 return None
 
-            # Calculate potential payout (at -110 odds)
+            # Potential payout (stake + profit at -110) is computed by the database
             odds = -110
-            potential_payout = stake + (stake * (100 / 110))  # Stake + profit
 
             # Calculate EV
-            expected_value = (probability * (stake * (100 / 110))) - ((1 - probability) * stake)
+            expected_value = stake * (probability * (1 + PROFIT_PER_DOLLAR) - 1)
 
             # Create bet
             bet = SingleBet(
                 account_id=self.account.id,
-                player_id=player.id,
+                player_id=player_id,
                 player_name=player_name,
                 stat_type=stat_type,
                 line=line,
                 direction=direction,
                 stake=stake,
                 odds=odds,
-                potential_payout=potential_payout,
                 prediction=prediction,
                 probability=probability,
                 expected_value=expected_value,
@@ -161,13 +208,12 @@ class PaperTradingManager:
             # Deduct stake from bankroll
             self.account.current_bankroll -= stake
             self.account.total_bets_placed += 1
-            self.account.last_updated = datetime.utcnow()
-
-            self.session.commit()
 
-            # Create snapshot
+            # Snapshot goes out in the same transaction as the change
             self._create_snapshot()
 
+            self._commit()
+
             return bet.id
 
         except Exception as e:
@@ -210,9 +256,6 @@ class PaperTradingManager:
             if not sufficient:
                 return None
 
-            # Calculate potential payout
-            potential_payout = stake * payout_multiplier
-
             # Convert numpy types to Python native types
             parlay_probability = float(parlay_probability)
             expected_value = float(expected_value)
@@ -222,7 +265,6 @@ class PaperTradingManager:
                 account_id=self.account.id,
                 stake=stake,
                 payout_multiplier=payout_multiplier,
-                potential_payout=potential_payout,
                 parlay_probability=parlay_probability,
                 expected_value=expected_value,
                 num_picks=len(picks_data)
@@ -231,20 +273,18 @@ class PaperTradingManager:
             self.session.add(parlay)
             self.session.flush()  # Get parlay.id
 
+            # Look up any missing player_ids (cached, uncached names in one query)
+            name_to_id = self._resolve_player_ids(
+                [p['player_name'] for p in picks_data if not p.get('player_id')]
+            )
+
             # Create parlay legs
             for pick_data in picks_data:
-                # Use player_id from picks_data if provided, otherwise look up
-                if 'player_id' in pick_data and pick_data['player_id']:
-                    player_id = pick_data['player_id']
-                else:
-                    player = self.session.query(Player).filter_by(
-                        name=pick_data['player_name']
-                    ).first()
-
-                    if not player:
-                        print(f"Player {pick_data['player_name']} not found")
-                        continue
-                    player_id = player.id
+                # Use player_id from picks_data if provided, otherwise the looked-up id
+                player_id = pick_data.get('player_id') or name_to_id.get(pick_data['player_name'])
+                if not player_id:
+                    print(f"Player {pick_data['player_name']} not found")
+                    continue
 
                 # Convert numpy types to Python native types
                 prediction = float(pick_data['prediction'])
@@ -272,13 +312,12 @@ class PaperTradingManager:
             # Deduct stake from bankroll
             self.account.current_bankroll -= stake
             self.account.total_bets_placed += 1
-            self.account.last_updated = datetime.utcnow()
 
-            self.session.commit()
-
-            # Create snapshot
+            # Snapshot goes out in the same transaction as the change
             self._create_snapshot()
 
+            self._commit()
+
             return parlay.id
 
         except Exception as e:
@@ -290,14 +329,18 @@ class PaperTradingManager:
 
     def get_pending_parlay_bets(self):
         """Get all pending parlay bets with legs"""
-        return self.session.query(ParlayBet).filter_by(
+        return self.session.query(ParlayBet).options(
+            selectinload(ParlayBet.legs)
+        ).filter_by(
             account_id=self.account.id,
             status='pending'
         ).order_by(desc(ParlayBet.placed_at)).all()
 
     def get_parlay_bet_history(self, limit=50, status_filter=None):
         """Get resolved parlay bets"""
-        query = self.session.query(ParlayBet).filter(
+        query = self.session.query(ParlayBet).options(
+            selectinload(ParlayBet.legs)
+        ).filter(
             ParlayBet.account_id == self.account.id,
             ParlayBet.status.in_(['won', 'lost', 'void'])
         )
@@ -316,14 +359,14 @@ class PaperTradingManager:
         Returns: profit_loss amount
         """
         try:
-            bet = self.session.query(SingleBet).get(bet_id)
+            # Only the columns the outcome needs, no ORM object
+            bet = self.session.query(
+                SingleBet.line, SingleBet.direction, SingleBet.stake, SingleBet.potential_payout
+            ).filter_by(id=bet_id, status='pending').first()
 
-            if not bet or bet.status != 'pending':
+            if not bet:
                 return None
 
-            # Update actual result
-            bet.actual_result = actual_result
-
             # Determine outcome
             if bet.direction == "OVER":
                 won = actual_result > bet.line
@@ -332,36 +375,111 @@ class PaperTradingManager:
 
             # Handle push (exactly on line)
             if actual_result == bet.line:
-                bet.status = 'void'
-                bet.profit_loss = 0
+                status = 'void'
+                profit_loss = 0
                 self.account.current_bankroll += bet.stake  # Refund
                 self.account.total_bets_void += 1
             elif won:
-                bet.status = 'won'
-                profit = bet.stake * (100 / 110)  # At -110 odds
-                bet.profit_loss = profit
+                status = 'won'
+                profit_loss = bet.stake * PROFIT_PER_DOLLAR
                 self.account.current_bankroll += bet.potential_payout
                 self.account.total_bets_won += 1
             else:
-                bet.status = 'lost'
-                bet.profit_loss = -bet.stake
+                status = 'lost'
+                profit_loss = -bet.stake
                 self.account.total_bets_lost += 1
 
-            bet.resolved_at = datetime.utcnow()
-            self.account.last_updated = datetime.utcnow()
+            # Direct UPDATE without session synchronization; a SingleBet the
+            # caller already loaded (BetResolver.auto_resolve_single_bet does)
+            # is expired below instead, so it reloads the resolved row
+            self.session.execute(
+                update(SingleBet)
+                .where(SingleBet.id == bet_id)
+                .values(
+                    actual_result=actual_result,
+                    status=status,
+                    profit_loss=profit_loss,
+                    resolved_at=_utcnow()
+                )
+                .execution_options(synchronize_session=False)
+            )
 
-            self.session.commit()
+            loaded_bet = self.session.identity_map.get(identity_key(SingleBet, bet_id))
+            if loaded_bet is not None:
+                self.session.expire(loaded_bet)
 
-            # Create snapshot
+            # Snapshot goes out in the same transaction as the change
             self._create_snapshot()
 
-            return bet.profit_loss
+            self._commit()
+
+            return profit_loss
 
         except Exception as e:
             self.session.rollback()
             print(f"Error resolving bet: {e}")
             return None
 
+    def resolve_single_bets_batch(self, results):
+        """
+        Resolve many single bets with one fetch, one bulk update and one commit
+
+        results: Dict mapping bet_id -> actual_result
+        Returns: Dict mapping bet_id -> profit_loss for the bets resolved
+        """
+        try:
+            bets = self.session.query(SingleBet).filter(
+                SingleBet.id.in_(list(results)),
+                SingleBet.status == 'pending'
+            ).all()
+
+            if not bets:
+                return {}
+
+            ids = [bet.id for bet in bets]
+            lines = np.array([bet.line for bet in bets], dtype=float)
+            stakes = np.array([bet.stake for bet in bets], dtype=float)
+            payouts = np.array([bet.potential_payout for bet in bets], dtype=float)
+            is_over = np.array([bet.direction == "OVER" for bet in bets])
+            actual = np.array([results[bet_id] for bet_id in ids], dtype=float)
+
+            status_codes, profit, credit = _resolve_outcomes(lines, actual, stakes, payouts, is_over)
+
+            resolved_at = _utcnow()
+            self.session.bulk_update_mappings(SingleBet, [
+                {
+                    'id': bet_id,
+                    'status': code,
+                    'profit_loss': float(bet_profit),
+                    'actual_result': float(bet_actual),
+                    'resolved_at': resolved_at
+                }
+                for bet_id, code, bet_profit, bet_actual in zip(ids, status_codes.tolist(), profit, actual)
+            ])
+
+            # Bulk writes bypass the loaded objects; reload them on next access
+            for bet in bets:
+                self.session.expire(bet)
+
+            # Refund voids, pay out wins
+            _, n_won, n_lost, n_void = np.bincount(status_codes, minlength=4).tolist()
+            self.account.current_bankroll += credit
+            self.account.total_bets_won += n_won
+            self.account.total_bets_lost += n_lost
+            self.account.total_bets_void += n_void
+
+            # Snapshot goes out in the same transaction as the change
+            self._create_snapshot()
+
+            self._commit()
+
+            return dict(zip(ids, profit.tolist()))
+
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error resolving bets: {e}")
+            return {}
+
     def resolve_parlay_bet(self, parlay_id, leg_results):
         """
         Resolve a parlay bet
@@ -370,19 +488,21 @@ class PaperTradingManager:
         Returns: profit_loss amount
         """
         try:
-            parlay = self.session.query(ParlayBet).get(parlay_id)
+            parlay = self.session.query(ParlayBet).options(
+                selectinload(ParlayBet.legs)
+            ).filter(ParlayBet.id == parlay_id).first()
 
             if not parlay or parlay.status != 'pending':
                 return None
 
-            # Resolve each leg
+            # Resolve each leg (outcomes kept in locals, written in one bulk update)
             all_won = True
             any_void = False
+            leg_mappings = []
 
             for leg in parlay.legs:
                 if leg.id in leg_results:
                     actual = leg_results[leg.id]
-                    leg.actual_result = actual
 
                     # Determine outcome for this leg
                     if leg.direction == "OVER":
@@ -392,41 +512,50 @@ class PaperTradingManager:
 
                     # Handle push
                     if actual == leg.line:
-                        leg.status = 'void'
+                        leg_status = 'void'
                         any_void = True
                     elif won:
-                        leg.status = 'won'
+                        leg_status = 'won'
                     else:
-                        leg.status = 'lost'
+                        leg_status = 'lost'
                         all_won = False
 
+                    leg_mappings.append({'id': leg.id, 'status': leg_status, 'actual_result': actual})
+
             # Determine parlay outcome
             if any_void:
                 # Conservative: void entire parlay
-                parlay.status = 'void'
-                parlay.profit_loss = 0
+                status = 'void'
+                profit_loss = 0
                 self.account.current_bankroll += parlay.stake  # Refund
                 self.account.total_bets_void += 1
             elif all_won:
-                parlay.status = 'won'
-                profit = parlay.potential_payout - parlay.stake
-                parlay.profit_loss = profit
+                status = 'won'
+                profit_loss = parlay.potential_payout - parlay.stake
                 self.account.current_bankroll += parlay.potential_payout
                 self.account.total_bets_won += 1
             else:
-                parlay.status = 'lost'
-                parlay.profit_loss = -parlay.stake
+                status = 'lost'
+                profit_loss = -parlay.stake
                 self.account.total_bets_lost += 1
 
-            parlay.resolved_at = datetime.utcnow()
-            self.account.last_updated = datetime.utcnow()
+            self.session.bulk_update_mappings(ParlayLeg, leg_mappings)
+            self.session.execute(
+                update(ParlayBet)
+                .where(ParlayBet.id == parlay_id)
+                .values(status=status, profit_loss=profit_loss, resolved_at=_utcnow())
+            )
 
-            self.session.commit()
+            # Bulk writes bypass the loaded objects; reload them on next access
+            for leg in parlay.legs:
+                self.session.expire(leg)
 
-            # Create snapshot
+            # Snapshot goes out in the same transaction as the change
             self._create_snapshot()
 
-            return parlay.profit_loss
+            self._commit()
+
+            return profit_loss
 
         except Exception as e:
             self.session.rollback()
@@ -448,17 +577,16 @@ class PaperTradingManager:
 
             bet.status = 'void'
             bet.profit_loss = 0
-            bet.resolved_at = datetime.utcnow()
+            bet.resolved_at = _utcnow()
 
             self.account.current_bankroll += refund
             self.account.total_bets_void += 1
-            self.account.last_updated = datetime.utcnow()
-
-            self.session.commit()
 
-            # Create snapshot
+            # Snapshot goes out in the same transaction as the change
             self._create_snapshot()
 
+            self._commit()
+
             return True
 
         except Exception as e:
@@ -470,109 +598,152 @@ class PaperTradingManager:
 
     def calculate_metrics_by_stat_type(self):
         """Calculate performance metrics by stat type"""
-        metrics = {}
-
-        for stat_type in ['points', 'rebounds', 'assists']:
-            bets = self.session.query(SingleBet).filter(
-                SingleBet.account_id == self.account.id,
-                SingleBet.stat_type == stat_type,
-                SingleBet.status.in_(['won', 'lost'])
-            ).all()
-
-            if not bets:
-                metrics[stat_type] = {
-                    'total_bets': 0,
-                    'wins': 0,
-                    'losses': 0,
-                    'win_rate': 0,
-                    'total_profit': 0,
-                    'roi': 0,
-                    'avg_confidence': 0
-                }
-                continue
-
-            wins = sum(1 for b in bets if b.status == 'won')
-            total = len(bets)
-            win_rate = (wins / total) * 100
+        stat_types = ['points', 'rebounds', 'assists']
+
+        # One GROUP BY pass instead of loading every resolved bet per stat type
+        rows = self.session.query(
+            SingleBet.stat_type,
+            func.count().label('total'),
+            func.sum(case((SingleBet.status == 'won', 1), else_=0)).label('wins'),
+            func.sum(SingleBet.profit_loss).label('profit'),
+            func.sum(SingleBet.stake).label('stake'),
+            func.avg(SingleBet.confidence).label('avg_conf')
+        ).filter(
+            SingleBet.account_id == self.account.id,
+            SingleBet.status.in_(['won', 'lost']),
+            SingleBet.stat_type.in_(stat_types)
+        ).group_by(SingleBet.stat_type).all()
+
+        metrics = {
+            stat_type: {
+                'total_bets': 0,
+                'wins': 0,
+                'losses': 0,
+                'win_rate': 0,
+                'total_profit': 0,
+                'roi': 0,
+                'avg_confidence': 0
+            }
+            for stat_type in stat_types
+        }
 
-            total_profit = sum(b.profit_loss for b in bets)
-            total_stake = sum(b.stake for b in bets)
+        for row in rows:
+            total = row.total
+            wins = int(row.wins)
+            total_profit = row.profit or 0
+            total_stake = row.stake or 0
             roi = (total_profit / total_stake * 100) if total_stake > 0 else 0
 
-            avg_confidence = sum(b.confidence for b in bets) / total
-
-            metrics[stat_type] = {
+            metrics[row.stat_type] = {
                 'total_bets': total,
                 'wins': wins,
                 'losses': total - wins,
-                'win_rate': win_rate,
+                'win_rate': (wins / total) * 100,
                 'total_profit': total_profit,
                 'roi': roi,
-                'avg_confidence': avg_confidence
+                'avg_confidence': row.avg_conf
             }
 
         return metrics
 
     def calculate_confidence_correlation(self):
         """Analyze win rate by confidence level"""
-        bets = self.session.query(SingleBet).filter(
+        bucket = case(
+            (SingleBet.confidence < 1.0, 'low'),      # 0-1 σ
+            (SingleBet.confidence < 2.0, 'medium'),   # 1-2 σ
+            else_='high'                              # 2+ σ
+        ).label('bucket')
+
+        rows = self.session.query(
+            bucket,
+            func.count().label('total'),
+            func.sum(case((SingleBet.status == 'won', 1), else_=0)).label('wins'),
+            func.avg(SingleBet.profit_loss).label('avg_profit')
+        ).filter(
             SingleBet.account_id == self.account.id,
             SingleBet.status.in_(['won', 'lost'])
-        ).all()
+        ).group_by(bucket).all()
 
-        buckets = {
-            'low': [],      # 0-1 σ
-            'medium': [],   # 1-2 σ
-            'high': []      # 2+ σ
+        results = {
+            level: {
+                'total_bets': 0,
+                'win_rate': 0,
+                'avg_profit': 0
+            }
+            for level in ['low', 'medium', 'high']
         }
 
-        for bet in bets:
-            if bet.confidence < 1.0:
-                buckets['low'].append(bet)
-            elif bet.confidence < 2.0:
-                buckets['medium'].append(bet)
-            else:
-                buckets['high'].append(bet)
-
-        results = {}
-        for level, bucket_bets in buckets.items():
-            if not bucket_bets:
-                results[level] = {
-                    'total_bets': 0,
-                    'win_rate': 0,
-                    'avg_profit': 0
-                }
-            else:
-                wins = sum(1 for b in bucket_bets if b.status == 'won')
-                total = len(bucket_bets)
-                win_rate = (wins / total) * 100
-                avg_profit = sum(b.profit_loss for b in bucket_bets) / total
-
-                results[level] = {
-                    'total_bets': total,
-                    'win_rate': win_rate,
-                    'avg_profit': avg_profit
-                }
+        for row in rows:
+            results[row.bucket] = {
+                'total_bets': row.total,
+                'win_rate': (int(row.wins) / row.total) * 100,
+                'avg_profit': row.avg_profit
+            }
 
         return results
 
     def get_bankroll_history(self, days=30):
-        """Get bankroll snapshots for charting"""
-        cutoff = datetime.utcnow() - timedelta(days=days)
+        """
+        Get bankroll snapshots for charting
+
+        Returns: (timestamps, bankrolls, profits) - timestamps as a list of
+        timezone-aware datetimes, bankrolls/profits as float64 arrays
+        """
+        cutoff = func.now() - timedelta(days=days)
+
+        rows = self.session.execute(
+            select(BankrollSnapshot.timestamp, BankrollSnapshot.bankroll, BankrollSnapshot.total_profit)
+            .where(
+                BankrollSnapshot.account_id == self.account.id,
+                BankrollSnapshot.timestamp >= cutoff
+            )
+            .order_by(BankrollSnapshot.timestamp)
+        ).all()
 
-        snapshots = self.session.query(BankrollSnapshot).filter(
-            BankrollSnapshot.account_id == self.account.id,
-            BankrollSnapshot.timestamp >= cutoff
-        ).order_by(BankrollSnapshot.timestamp).all()
+        timestamps = [row.timestamp for row in rows]
+        bankrolls = np.fromiter((row.bankroll for row in rows), dtype=np.float64, count=len(rows))
+        profits = np.fromiter((row.total_profit for row in rows), dtype=np.float64, count=len(rows))
 
-        return [(s.timestamp, s.bankroll, s.total_profit) for s in snapshots]
+        return timestamps, bankrolls, profits
 
     # ==================== HELPER METHODS ====================
 
-    def _create_snapshot(self):
-        """Create a bankroll snapshot"""
+    def _commit(self):
+        """Commit and drop the cached account summary"""
+        self.session.commit()
+        self._summary_cache = None
+
+    def _resolve_player_id(self, name):
+        """Player.id for a name, from the cache when possible"""
+        return self._resolve_player_ids([name]).get(name)
+
+    def _resolve_player_ids(self, names):
+        """
+        Map player names to Player.id, querying only names not already cached
+
+        Returns: Dict of name -> id for the names that exist
+        """
+        missing = [name for name in names if name not in self._player_id_cache]
+        if missing:
+            self._player_id_cache.update(self.session.query(Player.name, Player.id).filter(
+                Player.name.in_(missing)
+            ).all())
+
+        return {name: self._player_id_cache[name] for name in names if name in self._player_id_cache}
+
+    def _create_snapshot(self, force=False):
+        """
+        Add a bankroll snapshot to the current transaction
+
+        The caller commits it along with the change that caused it. Unless
+        force is set, a snapshot is skipped when it would repeat the last one
+        exactly, or when it comes within SNAPSHOT_INTERVAL of the last one
+        with an unchanged bankroll.
+        """
         try:
-            total_profit = self.account.current_bankroll - self.account.starting_bankroll
+            now = datetime.utcnow()
+            bankroll = self.account.current_bankroll
+            total_profit = bankroll - self.account.starting_bankroll
 
             resolved_bets = self.account.total_bets_won + self.account.total_bets_lost
             if resolved_bets > 0:
@@ -580,16 +751,25 @@ class PaperTradingManager:
             else:
                 win_rate = 0
 
+            key = (bankroll, total_profit, self.account.total_bets_placed, win_rate)
+
+            if not force and self._last_snapshot is not None:
+                last_time, last_key = self._last_snapshot
+                if key == last_key:
+                    return
+                if now - last_time < SNAPSHOT_INTERVAL and bankroll == last_key[0]:
+                    return
+
             snapshot = BankrollSnapshot(
                 account_id=self.account.id,
-                bankroll=self.account.current_bankroll,
+                bankroll=bankroll,
                 total_profit=total_profit,
                 total_bets=self.account.total_bets_placed,
                 win_rate=win_rate
             )
 
             self.session.add(snapshot)
-            self.session.commit()
+            self._last_snapshot = (now, key)
 
         except Exception as e:
             print(f"Error creating snapshot: {e}")
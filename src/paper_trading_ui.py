@@ -4,18 +4,171 @@ Streamlit interface for paper trading mode
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
+from database import Session
 from paper_trading import PaperTradingManager
 from bet_resolver import BetResolver
 from datetime import datetime, timedelta
 
+# Serialize chart JSON with orjson (much faster on numeric arrays)
+pio.json.config.default_engine = "orjson"
+
+# Status column labels; the marker stands in for per-cell background styling
+STATUS_LABELS = {
+    'won': '🟢 WON',
+    'lost': '🔴 LOST',
+    'void': '🟡 VOID',
+    'pending': 'PENDING'
+}
+
+# Column configs for the tables; numbers ship to the browser as numbers and
+# are formatted client-side (so they also sort numerically)
+MONEY_COLUMN = st.column_config.NumberColumn(format="$%.2f")
+PERCENT_COLUMN = st.column_config.NumberColumn(format="%.1f%%")
+
+SINGLE_HISTORY_COLUMNS = {
+    'Line': st.column_config.NumberColumn(format="%g"),
+    'Prediction': st.column_config.NumberColumn(format="%.2f"),
+    'Actual': st.column_config.NumberColumn(format="%.2f"),
+    'Stake': MONEY_COLUMN,
+    'P/L': MONEY_COLUMN,
+    'Status': st.column_config.TextColumn()
+}
+
+PARLAY_HISTORY_COLUMNS = {
+    'Legs': st.column_config.NumberColumn(format="%d-leg"),
+    'Multiplier': st.column_config.NumberColumn(format="%gx"),
+    'Stake': MONEY_COLUMN,
+    'P/L': MONEY_COLUMN,
+    'Status': st.column_config.TextColumn()
+}
+
+# History sections: (subheader, column config, empty-table message)
+HISTORY_TABLES = {
+    'single': ("Single Bets", SINGLE_HISTORY_COLUMNS, "No single bet history"),
+    'parlay': ("Parlays", PARLAY_HISTORY_COLUMNS, "No parlay history")
+}
+
+def get_trading_services():
+    """
+    Manager/resolver pair for the current script run
+
+    Built over the thread-local Session on first use in a run and kept in
+    that session's info dict, so the page and the cached reads below share
+    one pair without sharing it between browser sessions. The session (and
+    the pair with it) is removed when render_paper_trading_mode returns.
+    """
+    session = Session()
+    services = session.info.get('trading_services')
+    if services is None:
+        manager = PaperTradingManager(session=session)
+        services = session.info['trading_services'] = (manager, BetResolver(manager=manager))
+    return services
+
+# Read-only queries, cached briefly so reruns that change nothing skip the
+# database. Anything that places, resolves or voids a bet calls
+# clear_cached_reads() before rerunning.
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_account_summary():
+    manager, _ = get_trading_services()
+    return manager.get_account_summary()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_bankroll_history(days):
+    manager, _ = get_trading_services()
+    return manager.get_bankroll_history(days=days)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_metrics_by_stat_type():
+    manager, _ = get_trading_services()
+    return manager.calculate_metrics_by_stat_type()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_confidence_correlation():
+    manager, _ = get_trading_services()
+    return manager.calculate_confidence_correlation()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def single_history_frame(limit):
+    """Last `limit` resolved single bets as a display DataFrame (empty if none)"""
+    manager, _ = get_trading_services()
+    singles = manager.get_single_bet_history(limit=limit)
+
+    df = pd.DataFrame({
+        'ID': [bet.id for bet in singles],
+        'Date': pd.to_datetime([bet.placed_at for bet in singles]).strftime('%Y-%m-%d'),
+        'Player': [bet.player_name for bet in singles],
+        'Stat': [bet.stat_type.upper() for bet in singles],
+        'Line': [bet.line for bet in singles],
+        'Direction': [bet.direction for bet in singles],
+        'Prediction': [bet.prediction for bet in singles],
+        'Actual': [bet.actual_result for bet in singles],
+        'Stake': [bet.stake for bet in singles],
+        'P/L': [bet.profit_loss for bet in singles],
+        'Status': [bet.status for bet in singles]
+    })
+
+    # Numbers stay numeric (32-bit is plenty for display); formatting
+    # happens at display time
+    df = df.astype({'ID': 'int32', 'Line': 'float32', 'Prediction': 'float32',
+                    'Actual': 'float32', 'Stake': 'float32', 'P/L': 'float32'})
+    df['Status'] = df['Status'].map(STATUS_LABELS)
+
+    return df
+
+@st.cache_data(ttl=30, show_spinner=False)
+def parlay_history_frame(limit):
+    """Last `limit` resolved parlays as a display DataFrame (empty if none)"""
+    manager, _ = get_trading_services()
+    parlays = manager.get_parlay_bet_history(limit=limit)
+
+    legs_summaries = [
+        ", ".join([f"{leg.player_name} {leg.stat_type.upper()}" for leg in parlay.legs])
+        for parlay in parlays
+    ]
+
+    df = pd.DataFrame({
+        'ID': [parlay.id for parlay in parlays],
+        'Date': pd.to_datetime([parlay.placed_at for parlay in parlays]).strftime('%Y-%m-%d'),
+        'Legs': [parlay.num_picks for parlay in parlays],
+        'Picks': legs_summaries,
+        'Multiplier': [parlay.payout_multiplier for parlay in parlays],
+        'Stake': [parlay.stake for parlay in parlays],
+        'P/L': [parlay.profit_loss for parlay in parlays],
+        'Status': [parlay.status for parlay in parlays]
+    })
+
+    # Numbers stay numeric (32-bit is plenty for display); formatting
+    # happens at display time
+    df = df.astype({'ID': 'int32', 'Legs': 'int32', 'Multiplier': 'float32',
+                    'Stake': 'float32', 'P/L': 'float32'})
+    df['Picks'] = df['Picks'].where(df['Picks'].str.len() <= 50, df['Picks'].str[:50] + "...")
+    df['Status'] = df['Status'].map(STATUS_LABELS)
+
+    return df
+
+def clear_cached_reads():
+    """Evict the cached queries after a bet changes"""
+    for cached in (cached_account_summary, cached_bankroll_history, cached_metrics_by_stat_type,
+                   cached_confidence_correlation, single_history_frame, parlay_history_frame):
+        cached.clear()
+
 def render_paper_trading_mode():
     """Main entry point for Paper Trading mode"""
+    try:
+        _render_paper_trading_page()
+    finally:
+        # Runs on st.rerun() too; the next run starts from a fresh session,
+        # so it sees bets placed or resolved from another page
+        Session.remove()
 
-    # Initialize manager
-    manager = PaperTradingManager()
-    resolver = BetResolver()
+def _render_paper_trading_page():
+    """Sidebar controls and tabs for one Paper Trading run"""
+    manager, resolver = get_trading_services()
 
     # Sidebar controls
     st.sidebar.markdown("---")
@@ -31,6 +184,7 @@ def render_paper_trading_mode():
                 st.sidebar.warning(f"⚠️ Failed to resolve {num_failed} bets")
             if num_resolved == 0 and num_failed == 0:
                 st.sidebar.info("No bets ready to resolve")
+            clear_cached_reads()
             st.rerun()
 
     # Reset account (danger zone)
@@ -39,29 +193,26 @@ def render_paper_trading_mode():
         if st.button("Reset Account", use_container_width=True):
             manager.reset_account()
             st.sidebar.success("Account reset to $1000")
+            clear_cached_reads()
             st.rerun()
 
     # Main tabs
     tab1, tab2, tab3 = st.tabs(["📊 Overview", "⏳ Pending Bets", "📜 History"])
 
     with tab1:
-        render_portfolio_overview(manager)
+        render_portfolio_overview()
 
     with tab2:
         render_pending_bets(manager, resolver)
 
     with tab3:
-        render_bet_history(manager)
-
-    # Cleanup
-    manager.close()
-    resolver.close()
+        render_bet_history()
 
-def render_portfolio_overview(manager):
+def render_portfolio_overview():
     """Render portfolio overview dashboard"""
 
     # Get account summary
-    summary = manager.get_account_summary()
+    summary = cached_account_summary()
 
     # Metric cards
     col1, col2, col3, col4 = st.columns(4)
@@ -99,37 +250,32 @@ def render_portfolio_overview(manager):
     # Bankroll chart
     st.markdown("---")
     st.subheader("💰 Bankroll Over Time")
-    render_bankroll_chart(manager)
+    render_bankroll_chart()
 
     # Metrics by stat type
     st.markdown("---")
     st.subheader("📈 Performance by Stat Type")
-    render_metrics_by_stat(manager)
+    render_metrics_by_stat()
 
     # Confidence correlation
     st.markdown("---")
     st.subheader("🎯 Confidence Correlation")
-    render_confidence_correlation(manager)
+    render_confidence_correlation()
 
-def render_bankroll_chart(manager):
+def render_bankroll_chart():
     """Render bankroll progression chart"""
 
-    history = manager.get_bankroll_history(days=30)
+    timestamps, bankrolls, _ = cached_bankroll_history(30)
 
-    if not history:
+    if not timestamps:
         st.info("No bankroll history yet. Place some bets to see your progression!")
         return
 
-    # Prepare data
-    timestamps = [h[0] for h in history]
-    bankrolls = [h[1] for h in history]
-    profits = [h[2] for h in history]
-
     # Create figure
     fig = go.Figure()
 
-    # Add bankroll line
-    fig.add_trace(go.Scatter(
+    # Add bankroll line (WebGL so long histories stay cheap to draw)
+    fig.add_trace(go.Scattergl(
         x=timestamps,
         y=bankrolls,
         mode='lines+markers',
@@ -156,45 +302,49 @@ def render_bankroll_chart(manager):
         hovermode='x unified',
         showlegend=True,
         height=400,
-        yaxis=dict(tickprefix="$")
+        yaxis=dict(tickprefix="$"),
+        transition_duration=0
     )
 
     st.plotly_chart(fig, use_container_width=True)
 
-def render_metrics_by_stat(manager):
+def render_metrics_by_stat():
     """Render performance breakdown by stat type"""
 
-    metrics = manager.calculate_metrics_by_stat_type()
+    metrics = cached_metrics_by_stat_type()
 
     if not metrics:
         st.info("No completed bets yet. Resolve some bets to see performance metrics!")
         return
 
-    # Create DataFrame
-    data = []
-    for stat_type, stats in metrics.items():
-        data.append({
-            'Stat Type': stat_type.upper(),
-            'Win Rate': f"{stats['win_rate']:.1f}%",
-            'Total Bets': stats['total_bets'],
-            'Profit': f"${stats['total_profit']:.2f}",
-            'ROI': f"{stats['roi']:.1f}%"
-        })
-
-    if data:
-        df = pd.DataFrame(data)
+    # Create DataFrame column-wise
+    stats = list(metrics.values())
+    win_rates = np.fromiter((s['win_rate'] for s in stats), dtype=float, count=len(stats))
+    df = pd.DataFrame({
+        'Stat Type': [stat_type.upper() for stat_type in metrics],
+        'Win Rate': win_rates,
+        'Total Bets': [s['total_bets'] for s in stats],
+        'Profit': [s['total_profit'] for s in stats],
+        'ROI': [s['roi'] for s in stats]
+    })
+    df = df.astype({'Win Rate': 'float32', 'Total Bets': 'int32',
+                    'Profit': 'float32', 'ROI': 'float32'})
+
+    if not df.empty:
 
         # Display table
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        st.dataframe(df, use_container_width=True, hide_index=True,
+                     column_config={'Win Rate': PERCENT_COLUMN, 'Profit': MONEY_COLUMN,
+                                    'ROI': PERCENT_COLUMN})
 
         # Create bar chart for win rate
         fig = go.Figure()
 
         fig.add_trace(go.Bar(
-            x=[d['Stat Type'] for d in data],
-            y=[float(d['Win Rate'].rstrip('%')) for d in data],
-            marker_color=['#28a745' if float(d['Win Rate'].rstrip('%')) >= 50 else '#dc3545' for d in data],
-            text=[d['Win Rate'] for d in data],
+            x=df['Stat Type'],
+            y=win_rates,
+            marker_color=np.where(win_rates >= 50, '#28a745', '#dc3545'),
+            texttemplate='%{y:.1f}%',
             textposition='outside'
         ))
 
@@ -203,34 +353,35 @@ def render_metrics_by_stat(manager):
             yaxis_title="Win Rate (%)",
             showlegend=False,
             height=300,
-            yaxis=dict(range=[0, 100])
+            yaxis=dict(range=[0, 100]),
+            transition_duration=0
         )
 
         st.plotly_chart(fig, use_container_width=True)
 
-def render_confidence_correlation(manager):
+def render_confidence_correlation():
     """Render win rate by confidence level"""
 
-    correlation = manager.calculate_confidence_correlation()
+    correlation = cached_confidence_correlation()
 
     if not correlation:
         st.info("No completed bets yet. Resolve some bets to see confidence correlation!")
         return
 
-    # Create DataFrame
-    data = []
-    for confidence_level, stats in correlation.items():
-        data.append({
-            'Confidence Level': confidence_level.upper(),
-            'Win Rate': f"{stats['win_rate']:.1f}%",
-            'Total Bets': stats['total_bets']
-        })
+    # Create DataFrame column-wise
+    stats = list(correlation.values())
+    win_rates = np.fromiter((s['win_rate'] for s in stats), dtype=float, count=len(stats))
+    df = pd.DataFrame({
+        'Confidence Level': [level.upper() for level in correlation],
+        'Win Rate': win_rates,
+        'Total Bets': [s['total_bets'] for s in stats]
+    })
 
-    if data:
-        df = pd.DataFrame(data)
+    if not df.empty:
 
         # Display table
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        st.dataframe(df, use_container_width=True, hide_index=True,
+                     column_config={'Win Rate': PERCENT_COLUMN})
 
         # Create bar chart
         fig = go.Figure()
@@ -238,10 +389,10 @@ def render_confidence_correlation(manager):
         colors = {'LOW': '#ffc107', 'MEDIUM': '#17a2b8', 'HIGH': '#28a745'}
 
         fig.add_trace(go.Bar(
-            x=[d['Confidence Level'] for d in data],
-            y=[float(d['Win Rate'].rstrip('%')) for d in data],
-            marker_color=[colors.get(d['Confidence Level'], '#6c757d') for d in data],
-            text=[d['Win Rate'] for d in data],
+            x=df['Confidence Level'],
+            y=win_rates,
+            marker_color=df['Confidence Level'].map(colors).fillna('#6c757d'),
+            texttemplate='%{y:.1f}%',
             textposition='outside'
         ))
 
@@ -250,11 +401,28 @@ def render_confidence_correlation(manager):
             yaxis_title="Win Rate (%)",
             showlegend=False,
             height=300,
-            yaxis=dict(range=[0, 100])
+            yaxis=dict(range=[0, 100]),
+            transition_duration=0
         )
 
         st.plotly_chart(fig, use_container_width=True)
 
+def _bet_details_cols(*sections):
+    """Lay out (title, lines) sections side by side for a bet card.
+
+    A line is either a string or a (text, caption) pair.
+    """
+    for col, (title, lines) in zip(st.columns(len(sections)), sections):
+        with col:
+            st.markdown(f"**{title}**")
+            for line in lines:
+                if isinstance(line, tuple):
+                    text, caption = line
+                    st.write(text)
+                    st.caption(caption)
+                else:
+                    st.write(line)
+
 def render_pending_bets(manager, resolver):
     """Render pending bets with resolution interface"""
 
@@ -277,63 +445,76 @@ def render_pending_singles(manager, resolver):
         return
 
     for bet in pending:
-        with st.expander(
-            f"#{bet.id} - {bet.player_name} | {bet.stat_type.upper()} {bet.direction} {bet.line} (${bet.stake})",
-            expanded=False
-        ):
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown("**Bet Details**")
-                st.write(f"Player: {bet.player_name}")
-                st.write(f"Stat: {bet.stat_type.upper()}")
-                st.write(f"Line: {bet.line}")
-                st.write(f"Direction: {bet.direction}")
-                st.write(f"Stake: ${bet.stake:.2f}")
-                st.write(f"Potential Payout: ${bet.potential_payout:.2f}")
-                if bet.opponent:
-                    st.write(f"Opponent: {bet.opponent}")
-                if bet.game_date:
-                    st.write(f"Game Date: {bet.game_date}")
-
-            with col2:
-                st.markdown("**Prediction Data**")
-                st.write(f"Model Prediction: {bet.prediction:.2f}")
-                st.write(f"Win Probability: {bet.probability*100:.1f}%")
-                st.write(f"Expected Value: ${bet.expected_value:.2f}")
-                st.write(f"Confidence: {bet.confidence:.2f}σ")
-                st.write(f"Placed: {bet.placed_at.strftime('%Y-%m-%d %H:%M')}")
-
-            st.markdown("---")
-            st.markdown("**Manual Resolution**")
-
-            col_resolve1, col_resolve2, col_resolve3 = st.columns([2, 1, 1])
-
-            with col_resolve1:
-                actual_result = st.number_input(
-                    f"Actual {bet.stat_type} value",
-                    min_value=0.0,
-                    step=0.5,
-                    key=f"resolve_single_{bet.id}"
-                )
+        single_bet_card(bet, resolver)
+
+@st.fragment
+def single_bet_card(bet, resolver):
+    """One pending single bet; its inputs rerun only this card"""
+    # The body (columns and resolution inputs) is only built while the card
+    # is toggled open; an expander would build it even when collapsed
+    if not st.toggle(
+        f"#{bet.id} - {bet.player_name} | {bet.stat_type.upper()} {bet.direction} {bet.line} (${bet.stake})",
+        key=f"exp_single_{bet.id}"
+    ):
+        return
+
+    with st.container(border=True):
+        details = [
+            f"Player: {bet.player_name}",
+            f"Stat: {bet.stat_type.upper()}",
+            f"Line: {bet.line}",
+            f"Direction: {bet.direction}",
+            f"Stake: ${bet.stake:.2f}",
+            f"Potential Payout: ${bet.potential_payout:.2f}"
+        ]
+        if bet.opponent:
+            details.append(f"Opponent: {bet.opponent}")
+        if bet.game_date:
+            details.append(f"Game Date: {bet.game_date}")
+
+        _bet_details_cols(
+            ("Bet Details", details),
+            ("Prediction Data", [
+                f"Model Prediction: {bet.prediction:.2f}",
+                f"Win Probability: {bet.probability*100:.1f}%",
+                f"Expected Value: ${bet.expected_value:.2f}",
+                f"Confidence: {bet.confidence:.2f}σ",
+                f"Placed: {bet.placed_at.strftime('%Y-%m-%d %H:%M')}"
+            ])
+        )
 
-            with col_resolve2:
-                if st.button("✅ Resolve", key=f"btn_resolve_{bet.id}", use_container_width=True):
-                    success, result = resolver.manual_resolve_single_bet(bet.id, actual_result)
-                    if success:
-                        st.success(f"Bet resolved! P/L: ${result:.2f}")
-                        st.rerun()
-                    else:
-                        st.error(f"Error: {result}")
-
-            with col_resolve3:
-                if st.button("🚫 Void", key=f"btn_void_{bet.id}", use_container_width=True):
-                    success, message = resolver.void_bet(bet.id, 'single', reason="Manual void")
-                    if success:
-                        st.success(message)
-                        st.rerun()
-                    else:
-                        st.error(message)
+        st.markdown("---")
+        st.markdown("**Manual Resolution**")
+
+        col_resolve1, col_resolve2, col_resolve3 = st.columns([2, 1, 1])
+
+        with col_resolve1:
+            actual_result = st.number_input(
+                f"Actual {bet.stat_type} value",
+                min_value=0.0,
+                step=0.5,
+                key=f"resolve_single_{bet.id}"
+            )
+
+        with col_resolve2:
+            if st.button("✅ Resolve", key=f"btn_resolve_{bet.id}", use_container_width=True):
+                success, result = resolver.manual_resolve_single_bet(bet.id, actual_result)
+                if success:
+                    st.success(f"Bet resolved! P/L: ${result:.2f}")
+                    clear_cached_reads()
+                    st.rerun()
+                else:
+                    st.error(f"Error: {result}")
+
+        with col_resolve3:
+            if st.button("🚫 Void", key=f"btn_void_{bet.id}", use_container_width=True):
+                success, message = resolver.void_bet(bet.id, 'single', reason="Manual void")
+                if success:
+                    st.success(message)
+                    clear_cached_reads()
+                    st.rerun()
+                else:
+                    st.error(message)
 
 def render_pending_parlays(manager, resolver):
     """Render pending parlay bets"""
@@ -345,67 +526,77 @@ def render_pending_parlays(manager, resolver):
         return
 
     for parlay in pending:
-        with st.expander(
-            f"#{parlay.id} - {parlay.num_picks}-leg Parlay | ${parlay.stake} for ${parlay.potential_payout:.2f} ({parlay.payout_multiplier}x)",
-            expanded=False
-        ):
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown("**Parlay Details**")
-                st.write(f"Number of Picks: {parlay.num_picks}")
-                st.write(f"Stake: ${parlay.stake:.2f}")
-                st.write(f"Multiplier: {parlay.payout_multiplier}x")
-                st.write(f"Potential Payout: ${parlay.potential_payout:.2f}")
-                st.write(f"Parlay Probability: {parlay.parlay_probability*100:.1f}%")
-                st.write(f"Expected Value: ${parlay.expected_value:.2f}")
-                st.write(f"Placed: {parlay.placed_at.strftime('%Y-%m-%d %H:%M')}")
-
-            with col2:
-                st.markdown("**Legs**")
-                for i, leg in enumerate(parlay.legs, 1):
-                    st.write(f"{i}. {leg.player_name} | {leg.stat_type.upper()} {leg.direction} {leg.line}")
-                    st.caption(f"   Prediction: {leg.prediction:.2f} | Prob: {leg.probability*100:.1f}%")
-
-            st.markdown("---")
-            st.markdown("**Manual Resolution**")
-
-            # Input for each leg
-            leg_results = {}
-            cols = st.columns(min(len(parlay.legs), 3))
-
-            for i, leg in enumerate(parlay.legs):
-                col_idx = i % 3
-                with cols[col_idx]:
-                    actual = st.number_input(
-                        f"{leg.player_name} {leg.stat_type}",
-                        min_value=0.0,
-                        step=0.5,
-                        key=f"resolve_parlay_{parlay.id}_leg_{leg.id}"
-                    )
-                    leg_results[leg.id] = actual
-
-            col_resolve1, col_resolve2 = st.columns([1, 1])
-
-            with col_resolve1:
-                if st.button("✅ Resolve Parlay", key=f"btn_resolve_parlay_{parlay.id}", use_container_width=True):
-                    success, result = resolver.manual_resolve_parlay_bet(parlay.id, leg_results)
-                    if success:
-                        st.success(f"Parlay resolved! P/L: ${result:.2f}")
-                        st.rerun()
-                    else:
-                        st.error(f"Error: {result}")
-
-            with col_resolve2:
-                if st.button("🚫 Void Parlay", key=f"btn_void_parlay_{parlay.id}", use_container_width=True):
-                    success, message = resolver.void_bet(parlay.id, 'parlay', reason="Manual void")
-                    if success:
-                        st.success(message)
-                        st.rerun()
-                    else:
-                        st.error(message)
-
-def render_bet_history(manager):
+        parlay_bet_card(parlay, resolver)
+
+@st.fragment
+def parlay_bet_card(parlay, resolver):
+    """One pending parlay; its inputs rerun only this card"""
+    # Leg inputs are only built while the card is toggled open
+    if not st.toggle(
+        f"#{parlay.id} - {parlay.num_picks}-leg Parlay | ${parlay.stake} for ${parlay.potential_payout:.2f} ({parlay.payout_multiplier}x)",
+        key=f"exp_parlay_{parlay.id}"
+    ):
+        return
+
+    with st.container(border=True):
+        _bet_details_cols(
+            ("Parlay Details", [
+                f"Number of Picks: {parlay.num_picks}",
+                f"Stake: ${parlay.stake:.2f}",
+                f"Multiplier: {parlay.payout_multiplier}x",
+                f"Potential Payout: ${parlay.potential_payout:.2f}",
+                f"Parlay Probability: {parlay.parlay_probability*100:.1f}%",
+                f"Expected Value: ${parlay.expected_value:.2f}",
+                f"Placed: {parlay.placed_at.strftime('%Y-%m-%d %H:%M')}"
+            ]),
+            ("Legs", [
+                (f"{i}. {leg.player_name} | {leg.stat_type.upper()} {leg.direction} {leg.line}",
+                 f"   Prediction: {leg.prediction:.2f} | Prob: {leg.probability*100:.1f}%")
+                for i, leg in enumerate(parlay.legs, 1)
+            ])
+        )
+
+        st.markdown("---")
+        st.markdown("**Manual Resolution**")
+
+        # Input for each leg
+        leg_results = {}
+        cols = st.columns(min(len(parlay.legs), 3))
+
+        for i, leg in enumerate(parlay.legs):
+            col_idx = i % 3
+            with cols[col_idx]:
+                actual = st.number_input(
+                    f"{leg.player_name} {leg.stat_type}",
+                    min_value=0.0,
+                    step=0.5,
+                    key=f"resolve_parlay_{parlay.id}_leg_{leg.id}"
+                )
+                leg_results[leg.id] = actual
+
+        col_resolve1, col_resolve2 = st.columns([1, 1])
+
+        with col_resolve1:
+            if st.button("✅ Resolve Parlay", key=f"btn_resolve_parlay_{parlay.id}", use_container_width=True):
+                success, result = resolver.manual_resolve_parlay_bet(parlay.id, leg_results)
+                if success:
+                    st.success(f"Parlay resolved! P/L: ${result:.2f}")
+                    clear_cached_reads()
+                    st.rerun()
+                else:
+                    st.error(f"Error: {result}")
+
+        with col_resolve2:
+            if st.button("🚫 Void Parlay", key=f"btn_void_parlay_{parlay.id}", use_container_width=True):
+                success, message = resolver.void_bet(parlay.id, 'parlay', reason="Manual void")
+                if success:
+                    st.success(message)
+                    clear_cached_reads()
+                    st.rerun()
+                else:
+                    st.error(message)
+
+def render_bet_history():
     """Render bet history with filters"""
 
     st.markdown("### Filters")
@@ -438,81 +629,25 @@ def render_bet_history(manager):
     status_map = {"All": None, "Won": "won", "Lost": "lost", "Void": "void"}
     status = status_map[status_filter]
 
-    # Fetch history
+    # Fetch history (cached per limit; the status filter is applied in pandas)
     if bet_type_filter == "All" or bet_type_filter == "Singles":
-        st.markdown("---")
-        st.subheader("Single Bets")
-
-        singles = manager.get_single_bet_history(limit=limit, status_filter=status)
-
-        if singles:
-            data = []
-            for bet in singles:
-                data.append({
-                    'ID': bet.id,
-                    'Date': bet.placed_at.strftime('%Y-%m-%d'),
-                    'Player': bet.player_name,
-                    'Stat': bet.stat_type.upper(),
-                    'Line': bet.line,
-                    'Direction': bet.direction,
-                    'Prediction': f"{bet.prediction:.2f}",
-                    'Actual': f"{bet.actual_result:.2f}" if bet.actual_result else "-",
-                    'Stake': f"${bet.stake:.2f}",
-                    'P/L': f"${bet.profit_loss:.2f}",
-                    'Status': bet.status.upper()
-                })
-
-            df = pd.DataFrame(data)
-
-            # Color code by status
-            def color_status(val):
-                if val == 'WON':
-                    return 'background-color: #d4edda'
-                elif val == 'LOST':
-                    return 'background-color: #f8d7da'
-                elif val == 'VOID':
-                    return 'background-color: #fff3cd'
-                return ''
-
-            styled_df = df.style.applymap(color_status, subset=['Status'])
-            st.dataframe(styled_df, use_container_width=True, hide_index=True)
-        else:
-            st.info("No single bet history")
+        _render_history_table(single_history_frame(limit), 'single', status)
 
     if bet_type_filter == "All" or bet_type_filter == "Parlays":
-        st.markdown("---")
-        st.subheader("Parlays")
-
-        parlays = manager.get_parlay_bet_history(limit=limit, status_filter=status)
-
-        if parlays:
-            data = []
-            for parlay in parlays:
-                legs_summary = ", ".join([f"{leg.player_name} {leg.stat_type.upper()}" for leg in parlay.legs])
-
-                data.append({
-                    'ID': parlay.id,
-                    'Date': parlay.placed_at.strftime('%Y-%m-%d'),
-                    'Legs': f"{parlay.num_picks}-leg",
-                    'Picks': legs_summary[:50] + "..." if len(legs_summary) > 50 else legs_summary,
-                    'Multiplier': f"{parlay.payout_multiplier}x",
-                    'Stake': f"${parlay.stake:.2f}",
-                    'P/L': f"${parlay.profit_loss:.2f}",
-                    'Status': parlay.status.upper()
-                })
-
-            df = pd.DataFrame(data)
-
-            def color_status(val):
-                if val == 'WON':
-                    return 'background-color: #d4edda'
-                elif val == 'LOST':
-                    return 'background-color: #f8d7da'
-                elif val == 'VOID':
-                    return 'background-color: #fff3cd'
-                return ''
-
-            styled_df = df.style.applymap(color_status, subset=['Status'])
-            st.dataframe(styled_df, use_container_width=True, hide_index=True)
-        else:
-            st.info("No parlay history")
+        _render_history_table(parlay_history_frame(limit), 'parlay', status)
+
+def _render_history_table(df, kind, status=None):
+    """Render one history section ('single' or 'parlay'), optionally filtered by status"""
+    title, column_config, empty_message = HISTORY_TABLES[kind]
+
+    if status:
+        df = df[df['Status'] == STATUS_LABELS[status]]
+
+    st.markdown("---")
+    st.subheader(title)
+
+    if not df.empty:
+        st.dataframe(df, use_container_width=True, hide_index=True,
+                     column_config=column_config)
+    else:
+        st.info(empty_message)
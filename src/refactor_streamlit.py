@@ -3,65 +3,56 @@
 Script to refactor streamlit_app.py to add parlay mode
 """
 
+import re
+import textwrap
+from pathlib import Path
+
+SINGLE_MODE_HEADER = (
+    "\n# ========================\n"
+    "# SINGLE PREDICTION MODE\n"
+    "# ========================\n"
+    "if not st.session_state.parlay_mode:\n"
+)
+
+PARLAY_MODE_BLOCK = (
+    "\n# ========================\n"
+    "# PARLAY BUILDER MODE\n"
+    "# ========================\n"
+    "else:\n"
+    "    st.sidebar.info('Parlay Mode - Add multiple picks')\n"
+    "    # TODO: Add parlay UI here\n"
+    "    st.write('Parlay builder coming soon!')\n"
+)
+
 # Read the backup file
-with open('streamlit_app.py.backup', 'r') as f:
-    lines = f.readlines()
+src = Path('streamlit_app.py.backup').read_text()
 
-# Find key line numbers
-player_selection_line = None
-generate_button_line = None
-predictor_close_line = None
+# Find the landmarks as character offsets (first player selection, first
+# generate button, last predictor.close())
+player_selection = re.search(r'^.*# Player selection.*$', src, re.M)
+generate_button = re.search(r'^.*Generate Prediction.*$', src, re.M)
+predictor_close = list(re.finditer(r'^.*predictor\.close\(\).*\n?', src, re.M))[-1]
 
-for i, line in enumerate(lines):
-    if '# Player selection' in line and player_selection_line is None:
-        player_selection_line = i
-    if 'Generate Prediction' in line and generate_button_line is None:
-        generate_button_line = i
-    if 'predictor.close()' in line:
-        predictor_close_line = i
+def line_number(match):
+    """0-based line number of a match, for the progress output"""
+    return src.count('\n', 0, match.start()) if match else None
 
-print(f"Player selection starts at line: {player_selection_line}")
-print(f"Generate button at line: {generate_button_line}")
-print(f"Predictor close at line: {predictor_close_line}")
+print(f"Player selection starts at line: {line_number(player_selection)}")
+print(f"Generate button at line: {line_number(generate_button)}")
+print(f"Predictor close at line: {line_number(predictor_close)}")
 
 # Now we know:
-# - Lines before player_selection_line stay the same
-# - Lines from player_selection_line to predictor_close_line need to be indented and wrapped in if not parlay_mode
-# - After predictor_close_line, add else clause with parlay mode
-
-# Build new file
-new_lines = []
-
-# Part 1: Keep everything up to player selection
-new_lines.extend(lines[:player_selection_line])
-
-# Part 2: Add conditional for single mode
-new_lines.append("\n# ========================\n")
-new_lines.append("# SINGLE PREDICTION MODE\n")
-new_lines.append("# ========================\n")
-new_lines.append("if not st.session_state.parlay_mode:\n")
-
-# Part 3: Indent single prediction content
-for line in lines[player_selection_line:predictor_close_line + 1]:
-    if line.strip():  # Not empty line
-        new_lines.append("    " + line)
-    else:
-        new_lines.append(line)
-
-# Part 4: Add parlay mode
-new_lines.append("\n# ========================\n")
-new_lines.append("# PARLAY BUILDER MODE\n")
-new_lines.append("# ========================\n")
-new_lines.append("else:\n")
-new_lines.append("    st.sidebar.info('Parlay Mode - Add multiple picks')\n")
-new_lines.append("    # TODO: Add parlay UI here\n")
-new_lines.append("    st.write('Parlay builder coming soon!')\n")
+# - Everything before player selection stays the same
+# - Player selection through predictor.close() is indented and wrapped in if not parlay_mode
+# - After predictor.close(), add else clause with parlay mode
+head = src[:player_selection.start()]
+body = src[player_selection.start():predictor_close.end()]
+tail = src[predictor_close.end():]
 
-# Part 5: Add footer
-new_lines.extend(lines[predictor_close_line + 1:])
+# textwrap.indent leaves blank lines alone, like the old per-line loop
+new_src = head + SINGLE_MODE_HEADER + textwrap.indent(body, "    ") + PARLAY_MODE_BLOCK + tail
 
 # Write new file
-with open('streamlit_app.py', 'w') as f:
-    f.writelines(new_lines)
+Path('streamlit_app.py').write_text(new_src)
 
 print("Refactoring complete!")
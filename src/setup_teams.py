@@ -12,15 +12,22 @@ def check_teams():
     session = get_session()
 
     try:
-        teams = session.query(Team).all()
-        print(f"\nTeams in database: {len(teams)}")
+        # Teams with their defensive stats (if any) in one query
+        rows = session.query(Team, TeamDefensiveStats).outerjoin(
+            TeamDefensiveStats, TeamDefensiveStats.team_id == Team.id
+        ).all()
 
-        if teams:
+        # One line per team even if it has stats rows for several seasons
+        team_stats = {}
+        for team, def_stats in rows:
+            team_stats.setdefault(team, def_stats)
+
+        print(f"\nTeams in database: {len(team_stats)}")
+
+        if team_stats:
             print("\nTeam List:")
             print("-" * 60)
-            for team in teams:
-                # Check if defensive stats exist
-                def_stats = session.query(TeamDefensiveStats).filter_by(team_id=team.id).first()
+            for team, def_stats in team_stats.items():
                 def_rating = f"{def_stats.def_rating:.1f}" if def_stats and def_stats.def_rating else "No data"
                 print(f"{team.abbreviation:5s} | {team.name:30s} | Def Rating: {def_rating}")
         else:
@@ -6,17 +6,54 @@ Starts with basic moving averages, will expand to Bayesian models
 import pandas as pd
 import numpy as np
 from database import get_session, Player, GameStats, Team, TeamDefensiveStats
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from sqlalchemy import desc
-
-# Rest adjustment values based on days since last game
-REST_ADJUSTMENTS = {
-    0: -1.5,   # Back-to-back (B2B)
-    1: -0.4,   # 1 day rest
-    2: +1.1,   # 2 days rest (optimal)
-    3: +0.5,   # 3 days rest
-    4: 0.0     # 4+ days rest (normal)
-}
+from functools import lru_cache
+from math import erf, sqrt
+from typing import Optional
+from sqlalchemy import desc, func, select
+from scipy.special import erf as erf_array  # vectorized erf (math.erf is scalar-only)
+
+# Rest adjustment values based on days since last game, indexed by days
+# rest capped at 4 (so an array of rest days can be adjusted in one go)
+REST_ADJUSTMENTS = np.array([
+    -1.5,   # Back-to-back (B2B)
+    -0.4,   # 1 day rest
+    +1.1,   # 2 days rest (optimal)
+    +0.5,   # 3 days rest
+    0.0     # 4+ days rest (normal)
+])
+
+REST_DESCRIPTIONS = (
+    "Back-to-back",
+    "1 day rest",
+    "2 days rest (optimal)",
+    "3 days rest",
+    "4+ days rest"
+)
+
+_SQRT2 = sqrt(2.0)
+
+@lru_cache(maxsize=64)
+def _decay_weights(decay_factor, n):
+    """Normalized decay weights (most recent game first); cached read-only per (decay, n)"""
+    # Most recent game gets weight 1.0, then decay
+    weights = decay_factor ** np.arange(n, dtype=np.float64)
+    weights /= weights.sum()
+    weights.flags.writeable = False
+    return weights
+
+@dataclass
+class AdjustmentTrace:
+    """What an opponent or rest adjustment did to a prediction"""
+    before: float
+    after: float
+    opponent: Optional[str] = None          # Matched team name
+    def_rating: Optional[float] = None
+    league_avg: Optional[float] = None
+    factor: Optional[float] = None          # Opponent multiplier (None = not applied)
+    rest_description: Optional[str] = None
+    rest_adjustment: Optional[float] = None  # Additive rest adjustment (None = not applied)
 
 class SimplePredictor:
     """
@@ -24,74 +61,196 @@ class SimplePredictor:
     This is our starting point - we'll make it more sophisticated later
     """
     
-    def __init__(self, stat_type='points', lookback_games=10):
+    def __init__(self, stat_type='points', lookback_games=10, session=None):
         """
         Args:
             stat_type: Which stat to predict ('points', 'rebounds', 'assists')
             lookback_games: How many recent games to average
+            session: Database session to use (defaults to a new one)
         """
         self.stat_type = stat_type
         self.lookback_games = lookback_games
-        self.session = get_session()
-    
+        # stat_type is fixed for the predictor's lifetime, so the column
+        # extraction (NaNs dropped, contiguous float64) is bound once here
+        self._stat_values = lambda games: games[stat_type].dropna().to_numpy(dtype=np.float64)
+        self.session = session or get_session()
+        self._player_ids = None          # name -> Player.id, loaded on first lookup
+        self._recent_stats_cache = {}    # (name, n_games) -> (DataFrame, stat values) or (None, empty)
+        self._teams = None               # Team rows and defensive ratings, loaded on first lookup
+
+    def clear_cache(self):
+        """Forget cached players, recent stats and teams (e.g. after new data is loaded)"""
+        self._player_ids = None
+        self._recent_stats_cache = {}
+        self._teams = None
+
+    def _get_player_id(self, player_name):
+        """Player.id for a name, or None; all ids are loaded with one query on first use"""
+        if self._player_ids is None:
+            self._player_ids = dict(self.session.query(Player.name, Player.id).all())
+
+        player_id = self._player_ids.get(player_name)
+        if player_id is None:
+            # Player may have been added since the ids were loaded
+            player_id = self.session.query(Player.id).filter_by(name=player_name).scalar()
+            if player_id is not None:
+                self._player_ids[player_name] = player_id
+
+        return player_id
+
     def get_player_recent_stats(self, player_name, n_games=None):
-        """Get recent game stats for a player"""
+        """Get recent game stats for a player (memoized per player and n_games)"""
+        recent_stats, _ = self.get_recent_stat_values(player_name, n_games)
+        return recent_stats
+
+    def get_recent_stat_values(self, player_name, n_games=None):
+        """
+        Recent games plus the predicted stat as a contiguous float64 array
+
+        The stat column is NaN-filtered and converted once, when the games are
+        loaded, so repeated predictions reuse the same buffer.
+
+        Returns: (recent_stats_df or None, stat_values ndarray)
+        """
         if n_games is None:
             n_games = self.lookback_games
+
+        key = (player_name, n_games)
+        if key not in self._recent_stats_cache:
+            recent_stats = self._load_recent_stats(player_name, n_games)
+            if recent_stats is None:
+                stat_values = np.empty(0)
+            else:
+                stat_values = self._stat_values(recent_stats)
+            self._recent_stats_cache[key] = (recent_stats, stat_values)
+
+        return self._recent_stats_cache[key]
+
+    def _load_recent_stats(self, player_name, n_games):
+        """Query the most recent n_games for a player as a DataFrame (None if no data)"""
+        player_id = self._get_player_id(player_name)
         
-        player = self.session.query(Player).filter_by(name=player_name).first()
-        
-        if not player:
+        if player_id is None:
             return None
         
-        # Get most recent games
-        recent_games = self.session.query(GameStats)\
-            .filter_by(player_id=player.id)\
+        # Get most recent games straight into columns (no ORM objects)
+        stmt = select(
+            GameStats.game_date.label('date'),
+            GameStats.opponent,
+            GameStats.is_home,
+            GameStats.days_rest,
+            GameStats.is_back_to_back.label('is_b2b'),
+            GameStats.points,
+            GameStats.rebounds,
+            GameStats.assists,
+            GameStats.minutes
+        ).where(GameStats.player_id == player_id)\
             .order_by(desc(GameStats.game_date))\
-            .limit(n_games)\
-            .all()
-        
-        if not recent_games:
+            .limit(n_games)
+
+        recent_games = pd.read_sql_query(stmt, self.session.connection())
+
+        if recent_games.empty:
             return None
-        
-        # Convert to DataFrame for easy analysis
-        data = []
-        for game in recent_games:
-            data.append({
-                'date': game.game_date,
-                'opponent': game.opponent,
-                'is_home': game.is_home,
-                'days_rest': game.days_rest,
-                'is_b2b': game.is_back_to_back,
-                'points': game.points,
-                'rebounds': game.rebounds,
-                'assists': game.assists,
-                'minutes': game.minutes
-            })
-
-        return pd.DataFrame(data)
-    
-    def predict_simple_average(self, player_name, decay=0.9):
+
+        return recent_games
+
+    def get_recent_stats_many(self, player_names, n_games=None):
         """
-        Simple arithmetic mean of recent games
-        All games are weighted equally
+        Get recent game stats for several players with a single query
+
+        Uses ROW_NUMBER() per player so the lookback limit is applied in the
+        database rather than with one LIMIT query per player.
+
+        Returns:
+            Dict mapping player_name -> DataFrame (most recent game first);
+            players without games are omitted
+        """
+        if n_games is None:
+            n_games = self.lookback_games
+
+        names = set(player_names)
+        if not names:
+            return {}
+
+        game_number = func.row_number().over(
+            partition_by=GameStats.player_id,
+            order_by=desc(GameStats.game_date)
+        ).label('game_number')
+
+        recent = self.session.query(
+            Player.name.label('player_name'),
+            GameStats.game_date.label('date'),
+            GameStats.opponent,
+            GameStats.is_home,
+            GameStats.days_rest,
+            GameStats.is_back_to_back.label('is_b2b'),
+            GameStats.points,
+            GameStats.rebounds,
+            GameStats.assists,
+            GameStats.minutes,
+            GameStats.steals,
+            GameStats.blocks,
+            GameStats.turnovers,
+            game_number
+        ).join(GameStats, GameStats.player_id == Player.id)\
+            .filter(Player.name.in_(names))\
+            .subquery()
+
+        rows = self.session.query(recent)\
+            .filter(recent.c.game_number <= n_games)\
+            .order_by(recent.c.player_name, recent.c.game_number)\
+            .all()
+
+        if not rows:
+            return {}
+
+        games = pd.DataFrame(rows, columns=list(recent.c.keys())).drop(columns='game_number')
+
+        return {
+            name: player_games.drop(columns='player_name').reset_index(drop=True)
+            for name, player_games in games.groupby('player_name', sort=False)
+        }
+
+    @staticmethod
+    def weighted_average(stat_values, decay_factor=0.9):
+        """
+        Exponentially weighted mean and standard deviation
 
         Args:
-            player_name: Name of the player
-            decay: (unused, kept for compatibility)
+            stat_values: Stat values ordered most recent game first
+            decay_factor: How much to decay older games (0.9 = 10% decay per game back)
 
-        Returns: (prediction, std_dev, recent_stats_df)
+        Returns: (prediction, std_dev)
         """
-        recent_stats = self.get_player_recent_stats(player_name)
+        stat_values = np.asarray(stat_values, dtype=np.float64)
+        weights = _decay_weights(decay_factor, len(stat_values))
 
-        if recent_stats is None or recent_stats.empty:
-            return None, None, None
+        prediction = stat_values @ weights
+
+        # Weighted standard deviation (squared deviations in one reused buffer)
+        deviations = stat_values - prediction
+        np.square(deviations, out=deviations)
+        variance = weights @ deviations
+        std_dev = np.sqrt(variance)
+
+        return prediction, std_dev
+
+    def _predict_from_values(self, stat_values, decay_factor=None):
+        """
+        Mean and standard deviation of already-extracted stat values
 
-        # Get the stat we're predicting
-        stat_values = recent_stats[self.stat_type].dropna().values
+        Args:
+            stat_values: Stat values ordered most recent game first
+            decay_factor: None for a simple average, otherwise the weighted-average decay
 
+        Returns: (prediction, std_dev), or (None, None) if there are no values
+        """
         if len(stat_values) == 0:
-            return None, None, None
+            return None, None
+
+        if decay_factor is not None:
+            return self.weighted_average(stat_values, decay_factor)
 
         # Simple average - all games weighted equally
         prediction = np.mean(stat_values)
@@ -99,6 +258,82 @@ class SimplePredictor:
         # Standard deviation (unweighted)
         std_dev = np.std(stat_values, ddof=1) if len(stat_values) > 1 else 0.0
 
+        return prediction, std_dev
+
+    def predict_many(self, player_names, decay_factor=0.9, n_games=None):
+        """
+        Predictions for several players from one recent-games query
+
+        Each player's recent values (most recent first, NaNs dropped) fill a
+        row of a NaN-padded (players, games) array, and all predictions are
+        computed with whole-array reductions.
+
+        Args:
+            player_names: Players to predict
+            decay_factor: Weighted-average decay, or None for a simple average
+            n_games: Games to look back (defaults to lookback_games)
+
+        Returns:
+            (predictions, std_devs) np.ndarrays aligned with player_names;
+            NaN where a player has no data
+        """
+        if n_games is None:
+            n_games = self.lookback_games
+
+        recent_stats = self.get_recent_stats_many(player_names, n_games)
+
+        values = np.full((len(player_names), n_games), np.nan)
+        for i, name in enumerate(player_names):
+            games = recent_stats.get(name)
+            if games is not None:
+                row = self._stat_values(games)
+                values[i, :len(row)] = row
+
+        present = ~np.isnan(values)
+        counts = present.sum(axis=1)
+        has_data = counts > 0
+
+        if decay_factor is None:
+            # Simple average; a single game has no spread
+            weights = present / np.where(has_data, counts, 1)[:, None]
+        else:
+            # Values are left-aligned, so masked decay weights match
+            # _decay_weights(decay_factor, count) for every row
+            weights = np.where(present, _decay_weights(decay_factor, n_games), 0.0)
+            weights /= np.where(has_data, weights.sum(axis=1), 1.0)[:, None]
+
+        filled = np.where(present, values, 0.0)
+        predictions = np.einsum('ij,ij->i', weights, filled)
+        deviations = np.where(present, filled - predictions[:, None], 0.0)
+        variances = np.einsum('ij,ij->i', weights, deviations * deviations)
+
+        if decay_factor is None:
+            # Sample variance (ddof=1) to match predict_simple_average
+            variances = np.where(counts > 1, variances * counts / np.maximum(counts - 1, 1), 0.0)
+
+        predictions[~has_data] = np.nan
+        std_devs = np.sqrt(variances)
+        std_devs[~has_data] = np.nan
+
+        return predictions, std_devs
+
+    def predict_simple_average(self, player_name, decay=0.9):
+        """
+        Simple arithmetic mean of recent games
+        All games are weighted equally
+
+        Args:
+            player_name: Name of the player
+            decay: (unused, kept for compatibility)
+
+        Returns: (prediction, std_dev, recent_stats_df)
+        """
+        recent_stats, stat_values = self.get_recent_stat_values(player_name)
+        prediction, std_dev = self._predict_from_values(stat_values)
+
+        if prediction is None:
+            return None, None, None
+
         return prediction, std_dev, recent_stats
     
     def predict_weighted_average(self, player_name, decay_factor=0.9):
@@ -106,117 +341,253 @@ class SimplePredictor:
         Weighted average giving more weight to recent games
         decay_factor: How much to decay older games (0.9 = 10% decay per game back)
         """
-        recent_stats = self.get_player_recent_stats(player_name)
+        recent_stats, stat_values = self.get_recent_stat_values(player_name)
+        prediction, std_dev = self._predict_from_values(stat_values, decay_factor)
         
-        if recent_stats is None or recent_stats.empty:
+        if prediction is None:
             return None, None, None
         
-        stat_values = recent_stats[self.stat_type].dropna().values
-        
-        if len(stat_values) == 0:
-            return None, None, None
-        
-        # Create weights (most recent game gets weight 1.0, then decay)
-        weights = np.array([decay_factor ** i for i in range(len(stat_values))])
-        weights = weights / weights.sum()  # Normalize
-        
-        prediction = np.sum(stat_values * weights)
-        
-        # Weighted standard deviation
-        variance = np.sum(weights * (stat_values - prediction) ** 2)
-        std_dev = np.sqrt(variance)
-        
         return prediction, std_dev, recent_stats
 
-    def apply_opponent_adjustment(self, base_prediction, opponent_name, league_avg=112.0):
+    def apply_opponent_adjustment(self, base_prediction, opponent_name, league_avg=None, verbose=False,
+                                  def_map=None):
         """
         Adjust prediction based on opponent's defensive rating
 
         Args:
             base_prediction: The unadjusted prediction
             opponent_name: Name or abbreviation of the opponent team
-            league_avg: League average defensive rating (points allowed per 100 possessions)
+            league_avg: League average defensive rating (points allowed per 100 possessions;
+                defaults to self.league_avg)
+            verbose: Print the adjustment details
+            def_map: Optional prefetched {abbreviation: (team name, def_rating)};
+                when given, the opponent is read from it instead of the team table
 
         Returns:
             Adjusted prediction, or base_prediction if no defensive data available
         """
-        if base_prediction is None:
+        trace = self.trace_opponent_adjustment(base_prediction, opponent_name, league_avg, def_map)
+
+        if trace is None:
             return None
 
-        # Try to find the opponent team
-        team = self.session.query(Team).filter(
-            (Team.name.like(f"%{opponent_name}%")) |
-            (Team.abbreviation == opponent_name)
-        ).first()
+        if verbose and trace.factor is not None:
+            print(f"Opponent: {trace.opponent}")
+            print(f"Defensive Rating: {trace.def_rating:.1f} pts/game (League avg: {trace.league_avg})")
+            print(f"Adjustment Factor: {trace.factor:.3f}")
+            print(f"Base Prediction: {trace.before:.2f} → Adjusted: {trace.after:.2f}")
 
-        if not team:
-            print(f"Warning: Opponent team '{opponent_name}' not found. Using unadjusted prediction.")
-            return base_prediction
+        return trace.after
 
-        # Get defensive stats for this team
-        def_stats = self.session.query(TeamDefensiveStats).filter_by(team_id=team.id).first()
+    def trace_opponent_adjustment(self, base_prediction, opponent_name, league_avg=None, def_map=None):
+        """
+        Opponent adjustment as an AdjustmentTrace (see apply_opponent_adjustment)
 
-        if not def_stats or def_stats.def_rating is None:
-            print(f"Warning: No defensive rating for {team.name}. Using unadjusted prediction.")
-            return base_prediction
+        Returns:
+            AdjustmentTrace (after == before if no defensive data), or None if
+            base_prediction is None
+        """
+        if base_prediction is None:
+            return None
+
+        if league_avg is None:
+            league_avg = self.league_avg
+
+        if def_map is not None:
+            opponent, def_rating = def_map.get(opponent_name, (None, None))
+        else:
+            team, def_rating = self._find_opponent_def_rating(opponent_name)
+            opponent = team.name if team else None
+
+        if def_rating is None:
+            return AdjustmentTrace(before=base_prediction, after=base_prediction,
+                                   opponent=opponent)
 
         # Apply adjustment: if opponent allows more points than average, player should score more
         # Formula: if opponent allows MORE points = weaker defense = player scores MORE
-        adjustment_factor = def_stats.def_rating / league_avg
+        adjustment_factor = def_rating / league_avg
         adjusted_prediction = base_prediction * adjustment_factor
 
-        print(f"Opponent: {team.name}")
-        print(f"Defensive Rating: {def_stats.def_rating:.1f} pts/game (League avg: {league_avg})")
-        print(f"Adjustment Factor: {adjustment_factor:.3f}")
-        print(f"Base Prediction: {base_prediction:.2f} → Adjusted: {adjusted_prediction:.2f}")
+        return AdjustmentTrace(
+            before=base_prediction,
+            after=adjusted_prediction,
+            opponent=opponent,
+            def_rating=def_rating,
+            league_avg=league_avg,
+            factor=adjustment_factor
+        )
 
-        return adjusted_prediction
+    def get_opponent_factors(self, opponent_names, league_avg=None):
+        """
+        Look up opponent adjustment factors for several opponents at once
+
+        Opponents are resolved against the cached team table (see
+        _find_opponent_def_rating), once per distinct name.
+
+        Args:
+            opponent_names: Sequence of opponent names/abbreviations (None = no opponent)
+            league_avg: League average defensive rating (defaults to self.league_avg)
+
+        Returns:
+            np.ndarray of multiplicative factors (1.0 where no adjustment applies)
+        """
+        if league_avg is None:
+            league_avg = self.league_avg
+        factors = np.ones(len(opponent_names))
+        ratings = {}
+
+        for i, opponent_name in enumerate(opponent_names):
+            if not opponent_name:
+                continue
+
+            if opponent_name not in ratings:
+                _, ratings[opponent_name] = self._find_opponent_def_rating(opponent_name)
+
+            def_rating = ratings[opponent_name]
+            if def_rating is not None:
+                factors[i] = def_rating / league_avg
+
+        return factors
 
-    def apply_rest_adjustment(self, base_prediction, days_rest):
+    def apply_opponent_adjustment_many(self, base_predictions, opponent_names, league_avg=None):
+        """
+        Vectorized opponent adjustment for a batch of predictions
+
+        Args:
+            base_predictions: Array-like of unadjusted predictions
+            opponent_names: Opponent for each prediction (None = no adjustment)
+            league_avg: League average defensive rating (defaults to self.league_avg)
+
+        Returns:
+            np.ndarray of adjusted predictions
+        """
+        factors = self.get_opponent_factors(opponent_names, league_avg)
+        return np.asarray(base_predictions, dtype=float) * factors
+
+    @property
+    def league_avg(self):
+        """Mean defensive rating across teams (112.0 if there is no data), from the team cache"""
+        if self._teams is None:
+            self._load_teams()
+        return self._league_avg
+
+    def _load_teams(self):
+        """Load every team and its defensive rating (one outer join) once per predictor"""
+        rows = self.session.query(Team, TeamDefensiveStats.def_rating)\
+            .outerjoin(TeamDefensiveStats, TeamDefensiveStats.team_id == Team.id)\
+            .all()
+
+        self._teams = []
+        self._team_by_key = {}           # Exact name/abbreviation -> team
+        self._def_rating_by_team_id = {}
+        for team, def_rating in rows:
+            if team.id not in self._def_rating_by_team_id:
+                self._teams.append(team)
+                self._team_by_key.setdefault(team.abbreviation, team)
+                self._team_by_key.setdefault(team.name, team)
+            if self._def_rating_by_team_id.get(team.id) is None:
+                self._def_rating_by_team_id[team.id] = def_rating
+
+        ratings = np.fromiter(
+            (r for r in self._def_rating_by_team_id.values() if r is not None), dtype=np.float64
+        )
+        self._league_avg = float(ratings.mean()) if ratings.size else 112.0
+
+    def _find_opponent_def_rating(self, opponent_name):
+        """
+        Find an opponent team and its defensive rating
+
+        Exact abbreviations/names are a dict lookup; anything else matches the
+        first team whose name contains opponent_name.
+
+        Returns:
+            (team, def_rating) - either may be None if not available
+        """
+        if self._teams is None:
+            self._load_teams()
+
+        # Try to find the opponent team
+        team = self._team_by_key.get(opponent_name)
+        if team is None:
+            team = next((t for t in self._teams if t.name and opponent_name in t.name), None)
+
+        if not team:
+            print(f"Warning: Opponent team '{opponent_name}' not found. Using unadjusted prediction.")
+            return None, None
+
+        # Defensive rating for this team
+        def_rating = self._def_rating_by_team_id.get(team.id)
+
+        if def_rating is None:
+            print(f"Warning: No defensive rating for {team.name}. Using unadjusted prediction.")
+            return team, None
+
+        return team, def_rating
+
+    def apply_rest_adjustment(self, base_prediction, days_rest, verbose=False):
         """
         Adjust prediction based on rest days since last game
 
         Args:
             base_prediction: The unadjusted prediction
             days_rest: Number of days since last game (0 = back-to-back)
+            verbose: Print the adjustment details
 
         Returns:
             Adjusted prediction
         """
+        trace = self.trace_rest_adjustment(base_prediction, days_rest)
+
+        if trace is None:
+            return None
+
+        if verbose and trace.rest_adjustment is not None:
+            print(f"Rest: {trace.rest_description}")
+            print(f"Rest Adjustment: {trace.rest_adjustment:+.1f}")
+            print(f"Base Prediction: {trace.before:.2f} → Adjusted: {trace.after:.2f}")
+
+        return trace.after
+
+    def trace_rest_adjustment(self, base_prediction, days_rest):
+        """
+        Rest adjustment as an AdjustmentTrace (see apply_rest_adjustment)
+
+        Returns:
+            AdjustmentTrace, or None if base_prediction is None
+        """
         if base_prediction is None:
             return None
 
         if days_rest is None:
             print("Warning: Days rest unknown. Using unadjusted prediction.")
-            return base_prediction
+            return AdjustmentTrace(before=base_prediction, after=base_prediction)
 
         # Cap at 4+ days
         capped_rest = min(days_rest, 4)
-        adjustment = REST_ADJUSTMENTS.get(capped_rest, 0.0)
-        adjusted_prediction = base_prediction + adjustment
-
-        rest_description = {
-            0: "Back-to-back",
-            1: "1 day rest",
-            2: "2 days rest (optimal)",
-            3: "3 days rest",
-            4: "4+ days rest"
-        }.get(capped_rest, f"{days_rest} days rest")
-
-        print(f"Rest: {rest_description}")
-        print(f"Rest Adjustment: {adjustment:+.1f}")
-        print(f"Base Prediction: {base_prediction:.2f} → Adjusted: {adjusted_prediction:.2f}")
 
-        return adjusted_prediction
-
-    def predict_with_opponent_adjustment(self, player_name, opponent_name, league_avg=112.0, use_weighted=True, decay=0.9):
+        if capped_rest >= 0 and capped_rest == int(capped_rest):
+            adjustment = float(REST_ADJUSTMENTS[int(capped_rest)])
+            rest_description = REST_DESCRIPTIONS[int(capped_rest)]
+        else:
+            # Negative or fractional rest: no adjustment
+            adjustment = 0.0
+            rest_description = f"{days_rest} days rest"
+
+        return AdjustmentTrace(
+            before=base_prediction,
+            after=base_prediction + adjustment,
+            rest_description=rest_description,
+            rest_adjustment=adjustment
+        )
+
+    def predict_with_opponent_adjustment(self, player_name, opponent_name, league_avg=None, use_weighted=True, decay=0.9):
         """
         Make a prediction with opponent defensive adjustment
 
         Args:
             player_name: Name of the player
             opponent_name: Name or abbreviation of the opponent team
-            league_avg: League average defensive rating
+            league_avg: League average defensive rating (defaults to self.league_avg)
             use_weighted: If True, use weighted average; otherwise simple average
             decay: Decay factor for weighted average
 
@@ -255,10 +626,13 @@ class SimplePredictor:
         # Calculate how many standard deviations away the line is
         z_score = (prediction - line) / std_dev if std_dev > 0 else 0
         
-        # Simple probability estimate (assuming normal distribution)
-        from scipy.stats import norm
-        prob_over = 1 - norm.cdf(line, prediction, std_dev)
-        prob_under = norm.cdf(line, prediction, std_dev)
+        # Simple probability estimate (assuming normal distribution); normal CDF
+        # via erf. A zero spread gives NaN, as scipy's norm.cdf did
+        if std_dev > 0:
+            prob_under = 0.5 * (1.0 + erf((line - prediction) / (std_dev * _SQRT2)))
+        else:
+            prob_under = float('nan')
+        prob_over = 1.0 - prob_under
         
         # Expected value (assuming -110 odds, need to win 52.4% to break even)
         ev_over = prob_over * 0.909 - prob_under * 1.0  # Win $0.909 per $1, lose $1
@@ -276,8 +650,51 @@ class SimplePredictor:
             'recommendation': 'OVER' if ev_over > 0 else ('UNDER' if ev_under > 0 else 'SKIP'),
             'confidence': abs(z_score)
         }
+
+    def evaluate_against_lines(self, predictions, std_devs, lines):
+        """
+        Vectorized evaluate_against_line for several picks at once
+
+        Args:
+            predictions: Array-like of predicted values
+            std_devs: Array-like of prediction standard deviations
+            lines: Array-like of PrizePicks lines
+
+        Returns:
+            dict with the same keys as evaluate_against_line, each an np.ndarray
+        """
+        predictions = np.asarray(predictions, dtype=np.float64)
+        std_devs = np.asarray(std_devs, dtype=np.float64)
+        lines = np.asarray(lines, dtype=np.float64)
+        has_spread = std_devs > 0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = np.where(has_spread, (predictions - lines) / std_devs, 0.0)
+            prob_under = np.where(
+                has_spread,
+                0.5 * (1.0 + erf_array((lines - predictions) / (std_devs * _SQRT2))),
+                np.nan
+            )
+        prob_over = 1.0 - prob_under
+
+        # Expected value (assuming -110 odds)
+        ev_over = prob_over * 0.909 - prob_under
+        ev_under = prob_under * 0.909 - prob_over
+
+        return {
+            'prediction': predictions,
+            'line': lines,
+            'std_dev': std_devs,
+            'z_score': z_scores,
+            'prob_over': prob_over,
+            'prob_under': prob_under,
+            'ev_over': ev_over,
+            'ev_under': ev_under,
+            'recommendation': np.where(ev_over > 0, 'OVER', np.where(ev_under > 0, 'UNDER', 'SKIP')),
+            'confidence': np.abs(z_scores)
+        }
     
-    def analyze_player(self, player_name, line=None, opponent=None, days_rest=None, league_avg=112.0):
+    def analyze_player(self, player_name, line=None, opponent=None, days_rest=None, league_avg=None):
         """
         Complete analysis for a player
 
@@ -286,15 +703,16 @@ class SimplePredictor:
             line: PrizePicks line (optional)
             opponent: Opponent team name for defensive adjustment (optional)
             days_rest: Days of rest before the game (optional)
-            league_avg: League average defensive rating
+            league_avg: League average defensive rating (defaults to self.league_avg)
         """
         print(f"\n{'='*60}")
         print(f"Analysis for {player_name} - {self.stat_type.upper()}")
         print(f"{'='*60}")
 
-        # Get predictions
-        simple_pred, simple_std, recent_stats = self.predict_simple_average(player_name)
-        weighted_pred, weighted_std, _ = self.predict_weighted_average(player_name)
+        # Get predictions (one fetch shared by both averages)
+        recent_stats, stat_values = self.get_recent_stat_values(player_name)
+        simple_pred, simple_std = self._predict_from_values(stat_values)
+        weighted_pred, weighted_std = self._predict_from_values(stat_values, decay_factor=0.9)
 
         if simple_pred is None:
             print(f"No data available for {player_name}")
@@ -312,13 +730,13 @@ class SimplePredictor:
         # Apply opponent adjustment if opponent is provided
         if opponent:
             print(f"\n--- Opponent Adjustment ---")
-            final_pred = self.apply_opponent_adjustment(final_pred, opponent, league_avg)
+            final_pred = self.apply_opponent_adjustment(final_pred, opponent, league_avg, verbose=True)
             print(f"---------------------------")
 
         # Apply rest adjustment if days_rest is provided
         if days_rest is not None:
             print(f"\n--- Rest Adjustment ---")
-            final_pred = self.apply_rest_adjustment(final_pred, days_rest)
+            final_pred = self.apply_rest_adjustment(final_pred, days_rest, verbose=True)
             print(f"-----------------------")
 
         if line is not None:
@@ -339,15 +757,6 @@ class SimplePredictor:
         self.session.close()
 
 if __name__ == "__main__":
-    # Need scipy for probability calculations
-    try:
-        from scipy.stats import norm
-    except ImportError:
-        print("Installing scipy for probability calculations...")
-        import subprocess
-        subprocess.check_call(['pip', 'install', 'scipy'])
-        from scipy.stats import norm
-    
     # Example usage
     predictor = SimplePredictor(stat_type='points', lookback_games=10)
     
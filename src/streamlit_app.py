@@ -2,11 +2,13 @@
 Streamlit web app for NBA player performance predictions
 """
 
+import time
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from simple_model import SimplePredictor
-from database import get_session, Player, GameStats
+from database import Session, Player, GameStats, Team, TeamDefensiveStats
+from paper_trading import PaperTradingManager
 from data_collector import NBADataCollector
 from multi_pick_analyzer import Pick, Parlay, MultiPickAnalyzer
 import numpy as np
@@ -14,6 +16,31 @@ from datetime import datetime, timedelta
 from sqlalchemy import desc
 from scipy.stats import norm
 
+# Add to Parlay skips the NBA API refresh for a player refreshed this recently (seconds)
+PLAYER_REFRESH_INTERVAL = 300
+
+# Standard payout multipliers by number of parlay legs
+STANDARD_MULTIPLIERS = {2: 3.0, 3: 6.0, 4: 10.0, 5: 15.0, 6: 25.0}
+
+# Display labels for days of rest
+REST_DESCRIPTIONS = {
+    0: "Back-to-back",
+    1: "1 day rest",
+    2: "2 days rest (optimal)",
+    3: "3 days rest"
+}
+
+# Individual Pick Breakdown keeps numeric columns; formats are applied on display
+PICK_BREAKDOWN_COLUMNS = {
+    'Line': st.column_config.NumberColumn(format="%g"),
+    'Prediction': st.column_config.NumberColumn(format="%.2f"),
+    'Probability': st.column_config.NumberColumn(format="%.1f%%"),
+    'Edge': st.column_config.NumberColumn(format="%+.2f"),
+}
+
+# Recent Games Details keeps a datetime64 date column; shown as a plain date
+RECENT_GAMES_COLUMNS = {'Date': st.column_config.DateColumn(format="YYYY-MM-DD")}
+
 # Page configuration
 st.set_page_config(
     page_title="NBA Player Performance Predictor",
@@ -28,14 +55,26 @@ if 'mode_selected' not in st.session_state:
 if 'parlay_picks' not in st.session_state:
     st.session_state.parlay_picks = []
 
+if 'parlay_keys' not in st.session_state:
+    st.session_state.parlay_keys = set()  # (player, stat_type) of each pick in parlay_picks
+
 if 'parlay_result' not in st.session_state:
     st.session_state.parlay_result = None
 
+if 'parlay_maps' not in st.session_state:
+    st.session_state.parlay_maps = ({}, {})  # (opponent_map, rest_map) for parlay_result
+
+if 'player_prediction' not in st.session_state:
+    st.session_state.player_prediction = None
+
+if 'player_refreshed_at' not in st.session_state:
+    st.session_state.player_refreshed_at = {}  # player name -> time.time() of last data refresh
+
 # Helper functions
 @st.cache_data(ttl=3600)
 def check_and_update_data():
     """Check if data needs updating"""
-    session = get_session()
+    session = Session()
     try:
         most_recent_game = session.query(GameStats).order_by(desc(GameStats.game_date)).first()
         if most_recent_game:
@@ -55,6 +94,7 @@ def update_player_data(player_name):
         collector = NBADataCollector()
         collector.fetch_player_game_stats(player_name, season='2025-26', max_games=30)
         collector.close()
+        st.session_state.player_refreshed_at[player_name] = time.time()
         return True
     except Exception as e:
         st.error(f"Error updating data: {e}")
@@ -62,26 +102,38 @@ def update_player_data(player_name):
 
 @st.cache_resource
 def get_players_list():
-    session = get_session()
-    players = session.query(Player).order_by(Player.name).all()
-    player_names = [p.name for p in players]
+    session = Session()
+    player_names = [name for (name,) in session.query(Player.name).order_by(Player.name)]
     session.close()
     return player_names
 
 @st.cache_resource
 def get_teams_list():
-    from database import Team
-    session = get_session()
-    teams = session.query(Team).order_by(Team.abbreviation).all()
-    team_options = {f"{t.abbreviation} - {t.name}": t.abbreviation for t in teams}
+    session = Session()
+    teams = session.query(Team.abbreviation, Team.name).order_by(Team.abbreviation).all()
+    team_options = {f"{abbreviation} - {name}": abbreviation for abbreviation, name in teams}
     session.close()
     return team_options
 
+@st.cache_data(ttl=3600)
+def get_team_defense_map():
+    """Team abbreviation -> (team name, defensive rating), from one join"""
+    session = Session()
+    try:
+        rows = session.query(Team.abbreviation, Team.name, TeamDefensiveStats.def_rating)\
+            .join(TeamDefensiveStats, TeamDefensiveStats.team_id == Team.id)\
+            .all()
+        defense_map = {}
+        for abbreviation, name, def_rating in rows:
+            defense_map.setdefault(abbreviation, (name, def_rating))
+        return defense_map
+    finally:
+        session.close()
+
 @st.cache_data(ttl=3600)
 def get_league_average_def_rating():
     """Calculate league average defensive rating"""
-    from database import TeamDefensiveStats
-    session = get_session()
+    session = Session()
     try:
         teams = session.query(TeamDefensiveStats).all()
         ratings = [t.def_rating for t in teams if t.def_rating is not None]
@@ -92,9 +144,10 @@ def get_league_average_def_rating():
     finally:
         session.close()
 
+@st.cache_data(ttl=3600)
 def get_days_since_last_game(player_name):
     """Calculate days since player's last game"""
-    session = get_session()
+    session = Session()
     try:
         player = session.query(Player).filter_by(name=player_name).first()
         if player:
@@ -111,6 +164,259 @@ def get_days_since_last_game(player_name):
         session.close()
     return None
 
+def recent_games_table(recent_stats, stat_type):
+    """Recent Games Details table from the predictor's recent stats"""
+    display_df = recent_stats[['date', 'opponent', 'is_home', 'days_rest', stat_type]].copy()
+    # Native datetime64/categorical columns go to Arrow without a per-cell
+    # string conversion; the date format is set by RECENT_GAMES_COLUMNS
+    if not pd.api.types.is_datetime64_any_dtype(display_df['date']):
+        display_df['date'] = pd.to_datetime(display_df['date'])
+    is_home = display_df['is_home']
+    display_df['is_home'] = pd.Categorical.from_codes(
+        np.where(is_home.isna(), -1, is_home.fillna(False).astype(bool).astype(np.int8)),
+        categories=['Away', 'Home']
+    )
+    display_df.columns = ['Date', 'Opponent', 'Home/Away', 'Days Rest', stat_type.capitalize()]
+    return display_df
+
+def pick_adjustment_maps(pick_keys):
+    """(opponent_map, rest_map) by player name from evaluate_parlay_picks-style pick keys"""
+    opponent_map = {key[0]: key[4] for key in pick_keys if key[4]}
+    rest_map = {key[0]: key[5] for key in pick_keys if key[5] is not None}
+    return opponent_map, rest_map
+
+@st.cache_data(ttl=900, show_spinner=False)
+def evaluate_parlay_picks(pick_keys):
+    """
+    Model predictions/probabilities for the parlay picks, in one batch
+
+    pick_keys is a tuple of (player, stat_type, line, direction, opponent,
+    days_rest). Stake and payout multiplier are not part of the key, so
+    changing them re-prices the parlay without re-running the model.
+
+    Returns: list of (prediction, probability) in pick order
+    """
+    # Built per cache miss, like cached_player_prediction, so no predictor
+    # session is shared between browser sessions
+    predictor = SimplePredictor(stat_type='points', lookback_games=10)
+    analyzer = MultiPickAnalyzer(predictor)
+    picks = [
+        Pick(player_name=player, stat_type=stat_type, line=line, direction=direction)
+        for player, stat_type, line, direction, _, _ in pick_keys
+    ]
+    opponent_map, rest_map = pick_adjustment_maps(pick_keys)
+
+    try:
+        evaluated = analyzer.predict_many(picks, opponent_map, rest_map)
+    finally:
+        predictor.close()
+
+    return [(pick.prediction, pick.probability) for pick in evaluated]
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_player_prediction(player_name, stat_type, lookback_games, decay_factor,
+                             opponent_name, days_rest, league_avg, line):
+    """
+    Player-mode prediction for one set of inputs, cached so reruns with the
+    same sidebar values skip the queries and math
+
+    Returns:
+        dict with recent_values (stat per game, most recent first),
+        recent_games (display table), simple/weighted predictions, final_pred,
+        adjustments_applied and eval_result (None without a line), or None
+        if the player has no data
+    """
+    # Only reached on a cache miss. The predictor (its session and memoized
+    # games) lives for this call alone; only the plain result below is
+    # cached and shared between browser sessions
+    predictor = SimplePredictor(stat_type=stat_type, lookback_games=lookback_games)
+
+    try:
+        recent_stats = predictor.get_player_recent_stats(player_name)
+
+        if recent_stats is None or recent_stats.empty:
+            return None
+
+        simple_pred, simple_std, _ = predictor.predict_simple_average(player_name, decay=decay_factor)
+        weighted_pred, weighted_std, _ = predictor.predict_weighted_average(player_name, decay_factor=decay_factor)
+
+        final_pred = weighted_pred
+        adjustments_applied = []
+
+        if opponent_name:
+            trace = predictor.trace_opponent_adjustment(
+                final_pred, opponent_name, league_avg, def_map=get_team_defense_map()
+            )
+            if trace.after != trace.before:
+                adjustments_applied.append(f"Opponent: {opponent_name} (x{trace.factor:.3f})")
+                final_pred = trace.after
+
+        if days_rest is not None:
+            trace = predictor.trace_rest_adjustment(final_pred, days_rest)
+            if trace.after != trace.before:
+                adjustments_applied.append(f"Rest: {trace.rest_description} ({trace.rest_adjustment:+.1f})")
+                final_pred = trace.after
+
+        eval_result = predictor.evaluate_against_line(final_pred, weighted_std, line) if line is not None else None
+
+        return {
+            'recent_values': recent_stats[stat_type].to_numpy(dtype=np.float64),
+            'recent_games': recent_games_table(recent_stats, stat_type),
+            'simple_pred': simple_pred,
+            'simple_std': simple_std,
+            'weighted_pred': weighted_pred,
+            'weighted_std': weighted_std,
+            'final_pred': final_pred,
+            'adjustments_applied': adjustments_applied,
+            'eval_result': eval_result
+        }
+    finally:
+        predictor.close()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_recent_games_chart(values, final_pred, weighted_std, line, stat_type):
+    """Recent games chart (most recent game first in values) with the prediction band and line"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=np.arange(len(values), 0, -1),
+        y=values,
+        mode='lines+markers',
+        name='Actual',
+        line=dict(color='#1f77b4', width=2),
+        marker=dict(size=8)
+    ))
+
+    fig.add_hline(
+        y=final_pred,
+        line_dash="dash",
+        line_color="green",
+        annotation_text=f"Prediction: {final_pred:.2f}",
+        annotation_position="right"
+    )
+
+    fig.add_hrect(
+        y0=final_pred - weighted_std,
+        y1=final_pred + weighted_std,
+        fillcolor="green",
+        opacity=0.1,
+        line_width=0,
+        annotation_text="±1 SD",
+        annotation_position="left"
+    )
+
+    if line is not None:
+        fig.add_hline(
+            y=line,
+            line_dash="dot",
+            line_color="red",
+            annotation_text=f"Line: {line}",
+            annotation_position="right"
+        )
+
+    fig.update_layout(
+        xaxis_title="Games Ago",
+        yaxis_title=stat_type.capitalize(),
+        hovermode='x unified',
+        showlegend=True,
+        height=400
+    )
+
+    return fig
+
+@st.fragment
+def save_player_bet_section(submitted_inputs):
+    """Save as Paper Trade controls for the stored player prediction; they rerun only this section"""
+    player_name = submitted_inputs['player_name']
+    stat_type = submitted_inputs['stat_type']
+    opponent_name = submitted_inputs['opponent_name']
+    days_rest = submitted_inputs['days_rest']
+    line = submitted_inputs['line']
+    prediction = submitted_inputs['prediction']
+    final_pred, weighted_std = prediction['final_pred'], prediction['weighted_std']
+    eval_result = prediction['eval_result']
+    recommendation = eval_result['recommendation']
+    z_score = eval_result['z_score']
+
+    st.markdown("---")
+    st.markdown("### 💾 Save as Paper Trade")
+
+    col_save1, col_save2, col_save3 = st.columns([1, 2, 1])
+
+    with col_save1:
+        stake_input = st.number_input(
+            "Stake Amount ($)",
+            min_value=1.0,
+            max_value=1000.0,
+            value=10.0,
+            step=1.0,
+            key="player_stake"
+        )
+
+    with col_save2:
+        direction_input = st.radio(
+            "Direction",
+            ["OVER", "UNDER"],
+            horizontal=True,
+            index=0 if recommendation == "OVER" else 1,
+            key="player_direction"
+        )
+
+    with col_save3:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if st.button("💾 Save Bet", type="primary", use_container_width=True, key="save_player_bet"):
+            manager = PaperTradingManager()
+
+            sufficient, available = manager.check_sufficient_funds(stake_input)
+            if not sufficient:
+                st.error(f"Insufficient funds! Available: ${available:.2f}")
+            else:
+                # Player list is already loaded (place_single_bet resolves the id)
+                if player_name in player_names:
+                    # Model probability for the selected direction
+                    prob = eval_result['prob_over'] if direction_input == 'OVER' else eval_result['prob_under']
+
+                    bet_id = manager.place_single_bet(
+                        player_name=player_name,
+                        stat_type=stat_type,
+                        line=line,
+                        direction=direction_input,
+                        stake=stake_input,
+                        prediction=final_pred,
+                        probability=prob,
+                        confidence=abs(z_score),
+                        std_dev=weighted_std,
+                        opponent=opponent_name,
+                        days_rest=days_rest
+                    )
+
+                    if bet_id:
+                        st.success(f"✅ Bet saved! Bet ID: {bet_id}")
+                        st.balloons()
+                    else:
+                        st.error("Failed to save bet")
+                else:
+                    st.error(f"Player {player_name} not found in database")
+
+            manager.close()
+
+def clear_game_data_caches():
+    """Evict the cached reads of game stats after a player's data is refreshed"""
+    for cached in (cached_player_prediction, evaluate_parlay_picks, check_and_update_data,
+                   get_days_since_last_game):
+        cached.clear()
+
+def remove_parlay_pick(index):
+    """Remove button callback: drop one parlay pick and its now-stale result"""
+    pick = st.session_state.parlay_picks.pop(index)
+    st.session_state.parlay_keys.discard((pick['player'], pick['stat_type']))
+    st.session_state.parlay_result = None
+
+def clear_parlay_picks():
+    """Clear All Picks button callback"""
+    st.session_state.parlay_picks = []
+    st.session_state.parlay_keys = set()
+    st.session_state.parlay_result = None
+
 # Load data
 player_names = get_players_list()
 teams_dict = get_teams_list()
@@ -157,6 +463,7 @@ elif st.session_state.mode_selected == "player":
     # Back button
     if st.sidebar.button("← Back to Mode Selection"):
         st.session_state.mode_selected = None
+        st.session_state.player_prediction = None
         st.rerun()
 
     st.sidebar.markdown("---")
@@ -181,340 +488,236 @@ elif st.session_state.mode_selected == "player":
         with st.spinner(f"Updating data for {player_name}..."):
             if update_player_data(player_name):
                 st.sidebar.success(f"✅ Updated data for {player_name}")
-                st.cache_data.clear()
+                clear_game_data_caches()
+                st.session_state.player_prediction = None
                 st.rerun()
             else:
                 st.sidebar.error("Failed to update data")
 
-    # Opponent Team Selection
-    st.sidebar.subheader("🏀 Opponent Team")
-    if teams_dict:
-        opponent_selection = st.sidebar.selectbox(
-            "Who are they playing against?",
-            options=["None"] + list(teams_dict.keys()),
-            index=0,
-            help="Adjusts prediction based on opponent's defensive strength"
-        )
-        opponent_name = teams_dict[opponent_selection] if opponent_selection != "None" else None
-
-        if opponent_name and opponent_name != "None":
-            from database import Team, TeamDefensiveStats
-            session = get_session()
-            team = session.query(Team).filter_by(abbreviation=opponent_name).first()
-            if team:
-                def_stats = session.query(TeamDefensiveStats).filter_by(team_id=team.id).first()
-                if def_stats and def_stats.def_rating:
-                    diff = def_stats.def_rating - league_avg_def
-                    if diff > 0:
-                        st.sidebar.info(f"📊 {team.name} allows {def_stats.def_rating:.1f} pts/game ({diff:+.1f} vs league avg) - Easier matchup!")
-                    else:
-                        st.sidebar.info(f"📊 {team.name} allows {def_stats.def_rating:.1f} pts/game ({diff:+.1f} vs league avg) - Tougher matchup!")
-            session.close()
-    else:
-        st.sidebar.warning("No teams in database")
-        opponent_name = None
-
-    # Stat type
-    stat_type = st.sidebar.selectbox(
-        "Stat Type",
-        options=['points', 'rebounds', 'assists'],
-        index=0
-    )
+    # Auto-calculate days of rest
+    auto_days_rest = get_days_since_last_game(player_name)
 
-    # Lookback games
-    lookback_games = st.sidebar.slider(
-        "Number of Recent Games",
-        min_value=3,
-        max_value=20,
-        value=10,
-        help="How many recent games to analyze"
-    )
+    # Prediction inputs are collected in a form, so changing them does not
+    # rerun the page until the prediction is requested
+    with st.sidebar.form("player_form"):
+        # Opponent Team Selection
+        st.subheader("🏀 Opponent Team")
+        if teams_dict:
+            opponent_selection = st.selectbox(
+                "Who are they playing against?",
+                options=["None"] + list(teams_dict.keys()),
+                index=0,
+                help="Adjusts prediction based on opponent's defensive strength"
+            )
+            opponent_name = teams_dict[opponent_selection] if opponent_selection != "None" else None
+        else:
+            st.warning("No teams in database")
+            opponent_name = None
+
+        # Stat type
+        stat_type = st.selectbox(
+            "Stat Type",
+            options=['points', 'rebounds', 'assists'],
+            index=0
+        )
 
-    # Decay factor
-    decay_factor = st.sidebar.slider(
-        "Decay Factor",
-        min_value=0.7,
-        max_value=1.0,
-        value=0.9,
-        step=0.05,
-        help="Weight for recent games"
-    )
+        # Lookback games
+        lookback_games = st.slider(
+            "Number of Recent Games",
+            min_value=3,
+            max_value=20,
+            value=10,
+            help="How many recent games to analyze"
+        )
 
-    # Auto-calculate days of rest
-    auto_days_rest = get_days_since_last_game(player_name)
+        # Decay factor
+        decay_factor = st.slider(
+            "Decay Factor",
+            min_value=0.7,
+            max_value=1.0,
+            value=0.9,
+            step=0.05,
+            help="Weight for recent games"
+        )
 
-    # Advanced options
-    with st.sidebar.expander("Advanced Options"):
-        if auto_days_rest is not None:
-            st.info(f"Auto-detected: {auto_days_rest} days since last game")
-            override_rest = st.checkbox("Override days of rest", value=False)
-            if override_rest:
-                days_rest = st.number_input(
+        # Advanced options
+        with st.expander("Advanced Options"):
+            if auto_days_rest is not None:
+                st.info(f"Auto-detected: {auto_days_rest} days since last game")
+                # Both inputs are always shown: widgets inside a form cannot
+                # appear/disappear before it is submitted
+                override_rest = st.checkbox("Override days of rest", value=False)
+                custom_days_rest = st.number_input(
                     "Custom Days of Rest",
                     min_value=0,
                     max_value=7,
-                    value=auto_days_rest,
+                    value=min(auto_days_rest, 7),
                     step=1
                 )
+                days_rest = custom_days_rest if override_rest else auto_days_rest
             else:
-                days_rest = auto_days_rest
-        else:
-            days_rest = st.number_input(
-                "Days of Rest (optional)",
-                min_value=0,
-                max_value=7,
+                days_rest = st.number_input(
+                    "Days of Rest (optional)",
+                    min_value=0,
+                    max_value=7,
+                    value=None,
+                    step=1
+                )
+
+            st.markdown(f"**League Avg Defensive Rating:** {league_avg_def} pts/game")
+            st.caption("Used as baseline for opponent adjustments")
+            league_avg = league_avg_def
+
+            line = st.number_input(
+                "PrizePicks Line (optional)",
+                min_value=0.0,
                 value=None,
-                step=1
+                step=0.5,
+                help="Set to enable betting analysis"
             )
 
-        st.markdown(f"**League Avg Defensive Rating:** {league_avg_def} pts/game")
-        st.caption("Used as baseline for opponent adjustments")
-        league_avg = league_avg_def
+        # Generate Prediction button
+        submitted = st.form_submit_button("🔮 Generate Prediction", type="primary")
 
-        line = st.number_input(
-            "PrizePicks Line (optional)",
-            min_value=0.0,
-            value=None,
-            step=0.5,
-            help="Set to enable betting analysis"
-        )
+    # Matchup note for the submitted opponent
+    if opponent_name:
+        team_name, def_rating = get_team_defense_map().get(opponent_name, (None, None))
+        if def_rating:
+            diff = def_rating - league_avg_def
+            if diff > 0:
+                st.sidebar.info(f"📊 {team_name} allows {def_rating:.1f} pts/game ({diff:+.1f} vs league avg) - Easier matchup!")
+            else:
+                st.sidebar.info(f"📊 {team_name} allows {def_rating:.1f} pts/game ({diff:+.1f} vs league avg) - Tougher matchup!")
 
-    # Generate Prediction button
-    if st.sidebar.button("🔮 Generate Prediction", type="primary"):
+    if submitted:
         with st.spinner("Analyzing player performance..."):
-            predictor = SimplePredictor(stat_type=stat_type, lookback_games=lookback_games)
-            recent_stats = predictor.get_player_recent_stats(player_name)
-
-            if recent_stats is None or recent_stats.empty:
-                st.error(f"No data available for {player_name}")
-                predictor.close()
-            else:
-                simple_pred, simple_std, _ = predictor.predict_simple_average(player_name, decay=decay_factor)
-                weighted_pred, weighted_std, _ = predictor.predict_weighted_average(player_name, decay_factor=decay_factor)
-
-                final_pred = weighted_pred
-                adjustments_applied = []
-
-                if opponent_name:
-                    adjusted = predictor.apply_opponent_adjustment(final_pred, opponent_name, league_avg)
-                    if adjusted != final_pred:
-                        adjustments_applied.append(f"Opponent: {opponent_name}")
-                        final_pred = adjusted
-
-                if days_rest is not None:
-                    adjusted = predictor.apply_rest_adjustment(final_pred, days_rest)
-                    if adjusted != final_pred:
-                        rest_desc = {0: "Back-to-back", 1: "1 day", 2: "2 days (optimal)", 3: "3 days", 4: "4+ days"}.get(min(days_rest, 4))
-                        adjustments_applied.append(f"Rest: {rest_desc}")
-                        final_pred = adjusted
-
-                # Display results
-                col1, col2, col3 = st.columns(3)
-
-                with col1:
-                    st.metric(
-                        label="Simple Average",
-                        value=f"{simple_pred:.2f}",
-                        delta=f"± {simple_std:.2f}"
-                    )
+            prediction = cached_player_prediction(
+                player_name, stat_type, lookback_games, decay_factor,
+                opponent_name, days_rest, league_avg, line
+            )
+        # Keep the result with the inputs it was made from, so later reruns
+        # (e.g. the Save Bet click) show and save it without predicting again
+        st.session_state.player_prediction = {
+            'player_name': player_name,
+            'stat_type': stat_type,
+            'opponent_name': opponent_name,
+            'days_rest': days_rest,
+            'line': line,
+            'prediction': prediction
+        }
+
+    if st.session_state.player_prediction is not None:
+        submitted_inputs = st.session_state.player_prediction
+        player_name = submitted_inputs['player_name']
+        stat_type = submitted_inputs['stat_type']
+        opponent_name = submitted_inputs['opponent_name']
+        days_rest = submitted_inputs['days_rest']
+        line = submitted_inputs['line']
+        prediction = submitted_inputs['prediction']
+
+        if prediction is None:
+            st.error(f"No data available for {player_name}")
+        else:
+            recent_values = prediction['recent_values']
+            simple_pred, simple_std = prediction['simple_pred'], prediction['simple_std']
+            weighted_pred, weighted_std = prediction['weighted_pred'], prediction['weighted_std']
+            final_pred = prediction['final_pred']
+            adjustments_applied = prediction['adjustments_applied']
 
-                with col2:
-                    st.metric(
-                        label="Weighted Average",
-                        value=f"{weighted_pred:.2f}",
-                        delta=f"± {weighted_std:.2f}"
-                    )
+            # Display results
+            col1, col2, col3 = st.columns(3)
 
-                with col3:
-                    delta_val = final_pred - weighted_pred if adjustments_applied else None
-                    st.metric(
-                        label="Final Prediction",
-                        value=f"{final_pred:.2f}",
-                        delta=f"{delta_val:+.2f}" if delta_val else None
-                    )
+            with col1:
+                st.metric(
+                    label="Simple Average",
+                    value=f"{simple_pred:.2f}",
+                    delta=f"± {simple_std:.2f}"
+                )
 
-                if adjustments_applied:
-                    st.info(f"**Adjustments Applied:** {', '.join(adjustments_applied)}")
-
-                # Chart
-                st.subheader(f"Recent {len(recent_stats)} Games Performance")
-
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=list(range(len(recent_stats), 0, -1)),
-                    y=recent_stats[stat_type],
-                    mode='lines+markers',
-                    name='Actual',
-                    line=dict(color='#1f77b4', width=2),
-                    marker=dict(size=8)
-                ))
-
-                fig.add_hline(
-                    y=final_pred,
-                    line_dash="dash",
-                    line_color="green",
-                    annotation_text=f"Prediction: {final_pred:.2f}",
-                    annotation_position="right"
+            with col2:
+                st.metric(
+                    label="Weighted Average",
+                    value=f"{weighted_pred:.2f}",
+                    delta=f"± {weighted_std:.2f}"
                 )
 
-                fig.add_hrect(
-                    y0=final_pred - weighted_std,
-                    y1=final_pred + weighted_std,
-                    fillcolor="green",
-                    opacity=0.1,
-                    line_width=0,
-                    annotation_text="±1 SD",
-                    annotation_position="left"
+            with col3:
+                delta_val = final_pred - weighted_pred if adjustments_applied else None
+                st.metric(
+                    label="Final Prediction",
+                    value=f"{final_pred:.2f}",
+                    delta=f"{delta_val:+.2f}" if delta_val else None
                 )
 
-                if line is not None:
-                    fig.add_hline(
-                        y=line,
-                        line_dash="dot",
-                        line_color="red",
-                        annotation_text=f"Line: {line}",
-                        annotation_position="right"
-                    )
+            if adjustments_applied:
+                st.info(f"**Adjustments Applied:** {', '.join(adjustments_applied)}")
 
-                fig.update_layout(
-                    xaxis_title="Games Ago",
-                    yaxis_title=stat_type.capitalize(),
-                    hovermode='x unified',
-                    showlegend=True,
-                    height=400
-                )
+            # Chart
+            st.subheader(f"Recent {len(recent_values)} Games Performance")
 
-                st.plotly_chart(fig, use_container_width=True)
-
-                # Recent games table
-                st.subheader("Recent Games Details")
-                display_df = recent_stats[['date', 'opponent', 'is_home', 'days_rest', stat_type]].copy()
-                display_df['date'] = pd.to_datetime(display_df['date']).dt.strftime('%Y-%m-%d')
-                display_df['is_home'] = display_df['is_home'].map({True: 'Home', False: 'Away'})
-                display_df.columns = ['Date', 'Opponent', 'Home/Away', 'Days Rest', stat_type.capitalize()]
-                st.dataframe(display_df, use_container_width=True, hide_index=True)
-
-                # Betting analysis
-                if line is not None:
-                    st.subheader("📊 Betting Analysis")
-                    eval_result = predictor.evaluate_against_line(final_pred, weighted_std, line)
-
-                    if eval_result:
-                        col1, col2 = st.columns(2)
-
-                        with col1:
-                            st.markdown("#### Probabilities")
-                            prob_df = pd.DataFrame({
-                                'Outcome': ['OVER', 'UNDER'],
-                                'Probability': [
-                                    f"{eval_result['prob_over']*100:.1f}%",
-                                    f"{eval_result['prob_under']*100:.1f}%"
-                                ],
-                                'Expected Value': [
-                                    f"{eval_result['ev_over']:.3f}",
-                                    f"{eval_result['ev_under']:.3f}"
-                                ]
-                            })
-                            st.dataframe(prob_df, use_container_width=True, hide_index=True)
-
-                        with col2:
-                            st.markdown("#### Recommendation")
-                            recommendation = eval_result['recommendation']
-                            confidence = eval_result['confidence']
-
-                            if recommendation == 'OVER':
-                                st.success(f"**BET OVER {line}**")
-                            elif recommendation == 'UNDER':
-                                st.success(f"**BET UNDER {line}**")
-                            else:
-                                st.warning("**SKIP THIS BET**")
-
-                            st.metric(
-                                label="Confidence Level",
-                                value=f"{confidence:.2f} σ",
-                                help="Standard deviations from the line"
-                            )
-
-                            z_score = eval_result['z_score']
-                            if abs(z_score) >= 1.5:
-                                st.info("High confidence bet")
-                            elif abs(z_score) >= 1.0:
-                                st.info("Moderate confidence bet")
-                            else:
-                                st.warning("Low confidence - consider skipping")
-
-                        # Save as Paper Trade
-                        st.markdown("---")
-                        st.markdown("### 💾 Save as Paper Trade")
-
-                        col_save1, col_save2, col_save3 = st.columns([1, 2, 1])
-
-                        with col_save1:
-                            stake_input = st.number_input(
-                                "Stake Amount ($)",
-                                min_value=1.0,
-                                max_value=1000.0,
-                                value=10.0,
-                                step=1.0,
-                                key="player_stake"
-                            )
-
-                        with col_save2:
-                            direction_input = st.radio(
-                                "Direction",
-                                ["OVER", "UNDER"],
-                                horizontal=True,
-                                index=0 if recommendation == "OVER" else 1,
-                                key="player_direction"
-                            )
-
-                        with col_save3:
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            if st.button("💾 Save Bet", type="primary", use_container_width=True, key="save_player_bet"):
-                                from paper_trading import PaperTradingManager
-
-                                manager = PaperTradingManager()
-
-                                sufficient, available = manager.check_sufficient_funds(stake_input)
-                                if not sufficient:
-                                    st.error(f"Insufficient funds! Available: ${available:.2f}")
-                                else:
-                                    # Get player_id from database
-                                    from database import Player
-                                    session = manager.session
-                                    player = session.query(Player).filter_by(name=player_name).first()
-
-                                    if player:
-                                        # Calculate EV for the selected direction
-                                        prob = eval_result['prob_over'] if direction_input == 'OVER' else eval_result['prob_under']
-                                        potential_payout = stake_input * (100 / 110)  # -110 odds
-                                        ev = (prob * potential_payout) - ((1 - prob) * stake_input)
-
-                                        bet_id = manager.place_single_bet(
-                                            player_name=player_name,
-                                            stat_type=stat_type,
-                                            line=line,
-                                            direction=direction_input,
-                                            stake=stake_input,
-                                            prediction=final_pred,
-                                            probability=prob,
-                                            confidence=abs(z_score),
-                                            std_dev=weighted_std,
-                                            opponent=opponent_name,
-                                            days_rest=days_rest
-                                        )
-
-                                        if bet_id:
-                                            st.success(f"✅ Bet saved! Bet ID: {bet_id}")
-                                            st.balloons()
-                                        else:
-                                            st.error("Failed to save bet")
-                                    else:
-                                        st.error(f"Player {player_name} not found in database")
-
-                                manager.close()
-
-                predictor.close()
+            fig = build_recent_games_chart(
+                recent_values,
+                final_pred, weighted_std, line, stat_type
+            )
+
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Recent games table
+            st.subheader("Recent Games Details")
+            st.dataframe(prediction['recent_games'], use_container_width=True, hide_index=True,
+                         column_config=RECENT_GAMES_COLUMNS)
+
+            # Betting analysis
+            if line is not None:
+                st.subheader("📊 Betting Analysis")
+                eval_result = prediction['eval_result']
+
+                if eval_result:
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        st.markdown("#### Probabilities")
+                        prob_df = pd.DataFrame({
+                            'Outcome': ['OVER', 'UNDER'],
+                            'Probability': [
+                                f"{eval_result['prob_over']*100:.1f}%",
+                                f"{eval_result['prob_under']*100:.1f}%"
+                            ],
+                            'Expected Value': [
+                                f"{eval_result['ev_over']:.3f}",
+                                f"{eval_result['ev_under']:.3f}"
+                            ]
+                        })
+                        st.dataframe(prob_df, use_container_width=True, hide_index=True)
+
+                    with col2:
+                        st.markdown("#### Recommendation")
+                        recommendation = eval_result['recommendation']
+                        confidence = eval_result['confidence']
+
+                        if recommendation == 'OVER':
+                            st.success(f"**BET OVER {line}**")
+                        elif recommendation == 'UNDER':
+                            st.success(f"**BET UNDER {line}**")
+                        else:
+                            st.warning("**SKIP THIS BET**")
+
+                        st.metric(
+                            label="Confidence Level",
+                            value=f"{confidence:.2f} σ",
+                            help="Standard deviations from the line"
+                        )
+
+                        z_score = eval_result['z_score']
+                        if abs(z_score) >= 1.5:
+                            st.info("High confidence bet")
+                        elif abs(z_score) >= 1.0:
+                            st.info("Moderate confidence bet")
+                        else:
+                            st.warning("Low confidence - consider skipping")
+
+                    # Save as Paper Trade
+                    save_player_bet_section(submitted_inputs)
 
 # ==========================================
 # PARLAY BUILDER MODE
@@ -523,7 +726,7 @@ elif st.session_state.mode_selected == "parlay":
     # Back button
     if st.sidebar.button("← Back to Mode Selection"):
         st.session_state.mode_selected = None
-        st.session_state.parlay_picks = []  # Clear picks when going back
+        clear_parlay_picks()  # Clear picks when going back
         st.rerun()
 
     st.sidebar.markdown("---")
@@ -616,20 +819,25 @@ elif st.session_state.mode_selected == "parlay":
         else:
             days_rest = None
 
+        force_refresh = st.checkbox(
+            "Always refresh player data",
+            value=False,
+            key="parlay_force_refresh",
+            help=f"Fetch new games even if this player was refreshed in the last {PLAYER_REFRESH_INTERVAL // 60} minutes"
+        )
+
     # Add to Parlay button
     st.sidebar.markdown("---")
     if st.sidebar.button("➕ Add to Parlay", use_container_width=True):
         # Check duplicates
-        duplicate = False
-        for pick in st.session_state.parlay_picks:
-            if pick['player'] == player_name and pick['stat_type'] == stat_type:
-                st.sidebar.error(f"{player_name} {stat_type} already in parlay!")
-                duplicate = True
-                break
-
-        if not duplicate:
-            with st.spinner(f"Refreshing data for {player_name}..."):
-                update_player_data(player_name)
+        if (player_name, stat_type) in st.session_state.parlay_keys:
+            st.sidebar.error(f"{player_name} {stat_type} already in parlay!")
+        else:
+            last_refresh = st.session_state.player_refreshed_at.get(player_name, 0.0)
+            if force_refresh or time.time() - last_refresh > PLAYER_REFRESH_INTERVAL:
+                with st.spinner(f"Refreshing data for {player_name}..."):
+                    if update_player_data(player_name):
+                        clear_game_data_caches()
 
             pick_config = {
                 'player': player_name,
@@ -639,9 +847,11 @@ elif st.session_state.mode_selected == "parlay":
                 'direction': direction,
                 'days_rest': days_rest,
                 'lookback_games': lookback_games,
-                'decay_factor': decay_factor
+                'decay_factor': decay_factor,
+                'label': f"{player_name} | {stat_type.upper()} {direction} {line}"
             }
             st.session_state.parlay_picks.append(pick_config)
+            st.session_state.parlay_keys.add((player_name, stat_type))
             st.sidebar.success(f"Added {player_name} {stat_type} {direction} {line}")
             st.rerun()
 
@@ -652,7 +862,7 @@ elif st.session_state.mode_selected == "parlay":
     if st.session_state.parlay_picks:
         for i, pick in enumerate(st.session_state.parlay_picks):
             with st.sidebar.expander(
-                f"Pick {i+1}: {pick['player']} | {pick['stat_type'].upper()} {pick['direction']} {pick['line']}",
+                f"Pick {i+1}: {pick['label']}",
                 expanded=False
             ):
                 st.write(f"**Player:** {pick['player']}")
@@ -664,16 +874,20 @@ elif st.session_state.mode_selected == "parlay":
                 if pick['days_rest'] is not None:
                     st.write(f"**Days Rest:** {pick['days_rest']}")
 
-                if st.button(f"❌ Remove", key=f"remove_{i}", use_container_width=True):
-                    st.session_state.parlay_picks.pop(i)
-                    st.rerun()
+                # Removal happens in the click callback, before the next run
+                # renders, instead of mid-loop followed by a second rerun
+                st.button("❌ Remove", key=f"remove_{i}", use_container_width=True,
+                          on_click=remove_parlay_pick, args=(i,))
 
-        if st.sidebar.button("🗑️ Clear All Picks", use_container_width=True):
-            st.session_state.parlay_picks = []
-            st.rerun()
+        st.sidebar.button("🗑️ Clear All Picks", use_container_width=True, on_click=clear_parlay_picks)
     else:
         st.sidebar.info("No picks added yet. Configure a pick above and click 'Add to Parlay'.")
 
+    # Drop the cached pick evaluations so the next calculation re-runs the
+    # model against the database
+    st.sidebar.button("🔄 Reset Model", use_container_width=True, on_click=evaluate_parlay_picks.clear,
+                      help="Re-run the model for every pick on the next calculation")
+
     # Main area
     if len(st.session_state.parlay_picks) == 0:
         st.info("👈 Add at least 2 picks using the sidebar to create a parlay!")
@@ -686,8 +900,7 @@ elif st.session_state.mode_selected == "parlay":
 
         with col1:
             num_picks = len(st.session_state.parlay_picks)
-            standard_multipliers = {2: 3.0, 3: 6.0, 4: 10.0, 5: 15.0, 6: 25.0}
-            default_multiplier = standard_multipliers.get(num_picks, num_picks * 2.5)
+            default_multiplier = STANDARD_MULTIPLIERS.get(num_picks, num_picks * 2.5)
 
             payout_multiplier = st.number_input(
                 f"Payout Multiplier ({num_picks}-leg parlay)",
@@ -711,56 +924,51 @@ elif st.session_state.mode_selected == "parlay":
 
         if calculate_button:
             with st.spinner("Calculating parlay probabilities..."):
-                picks = []
-                opponent_map = {}
-                rest_map = {}
+                # Model evaluations are cached on the picks alone; stake and
+                # multiplier only go into the pricing below
+                pick_keys = tuple(
+                    (
+                        config['player'],
+                        config['stat_type'],
+                        config['line'],
+                        config['direction'],
+                        config['opponent'],
+                        config['days_rest']
+                    )
+                    for config in st.session_state.parlay_picks
+                )
+                evaluations = evaluate_parlay_picks(pick_keys)
 
-                for config in st.session_state.parlay_picks:
-                    pick = Pick(
+                picks = [
+                    Pick(
                         player_name=config['player'],
                         stat_type=config['stat_type'],
                         line=config['line'],
-                        direction=config['direction']
+                        direction=config['direction'],
+                        prediction=prediction,
+                        probability=probability
                     )
-                    picks.append(pick)
-
-                    if config['opponent']:
-                        opponent_map[config['player']] = config['opponent']
-                    if config['days_rest'] is not None:
-                        rest_map[config['player']] = config['days_rest']
+                    for config, (prediction, probability) in zip(st.session_state.parlay_picks, evaluations)
+                ]
 
                 parlay = Parlay(
                     picks=picks,
                     payout_multiplier=payout_multiplier,
                     stake=stake
                 )
+                # Pricing is arithmetic on the cached probabilities; it
+                # never touches the analyzer's model
+                result = MultiPickAnalyzer(prediction_model=None).price_parlay(parlay)
 
-                predictor = SimplePredictor(stat_type='points', lookback_games=10)
-                analyzer = MultiPickAnalyzer(predictor)
-
-                result = analyzer.analyze_parlay(
-                    parlay,
-                    opponent_map=opponent_map,
-                    rest_map=rest_map
-                )
-
-                predictor.close()
-
-                # Store result in session state
+                # Store result in session state, with the adjustments it used
                 st.session_state.parlay_result = result
+                st.session_state.parlay_maps = pick_adjustment_maps(pick_keys)
 
-        # Display results if they exist
-        if st.session_state.parlay_result is not None:
-            result = st.session_state.parlay_result
-
-            # Recreate opponent_map and rest_map from session state
-            opponent_map = {}
-            rest_map = {}
-            for config in st.session_state.parlay_picks:
-                if config['opponent']:
-                    opponent_map[config['player']] = config['opponent']
-                if config['days_rest'] is not None:
-                    rest_map[config['player']] = config['days_rest']
+        # Display results if they exist and still match the current picks
+        result = st.session_state.parlay_result
+        if result is not None and len(result.picks) == len(st.session_state.parlay_picks):
+            # Adjustments the result was calculated with
+            opponent_map, rest_map = st.session_state.parlay_maps
 
             st.markdown("---")
             st.markdown("## 📊 Parlay Analysis Results")
@@ -814,23 +1022,26 @@ elif st.session_state.mode_selected == "parlay":
             # Individual pick breakdown
             st.markdown("### 📈 Individual Pick Breakdown")
 
-            pick_data = []
-            for pick in result.picks:
-                if pick.prediction is not None and pick.probability is not None:
-                    edge = pick.prediction - pick.line if pick.direction == "OVER" else pick.line - pick.prediction
-                    pick_data.append({
-                        "Player": pick.player_name,
-                        "Stat": pick.stat_type.upper(),
-                        "Line": pick.line,
-                        "Direction": pick.direction,
-                        "Prediction": f"{pick.prediction:.2f}",
-                        "Probability": f"{pick.probability*100:.1f}%",
-                        "Edge": f"{edge:+.2f}"
-                    })
-
-            if pick_data:
-                df = pd.DataFrame(pick_data)
-                st.dataframe(df, use_container_width=True, hide_index=True)
+            scored_picks = [p for p in result.picks if p.prediction is not None and p.probability is not None]
+            if scored_picks:
+                n_scored = len(scored_picks)
+                predictions = np.fromiter((p.prediction for p in scored_picks), dtype=np.float64, count=n_scored)
+                lines = np.fromiter((p.line for p in scored_picks), dtype=np.float64, count=n_scored)
+                probabilities = np.fromiter((p.probability for p in scored_picks), dtype=np.float64, count=n_scored)
+                directions = np.array([p.direction for p in scored_picks])
+                edges = np.where(directions == "OVER", predictions - lines, lines - predictions)
+
+                df = pd.DataFrame({
+                    "Player": [p.player_name for p in scored_picks],
+                    "Stat": [p.stat_type.upper() for p in scored_picks],
+                    "Line": lines,
+                    "Direction": directions,
+                    "Prediction": predictions,
+                    "Probability": probabilities * 100,
+                    "Edge": edges
+                })
+                st.dataframe(df, use_container_width=True, hide_index=True,
+                             column_config=PICK_BREAKDOWN_COLUMNS)
 
             # Adjustments
             if opponent_map or rest_map:
@@ -843,12 +1054,7 @@ elif st.session_state.mode_selected == "parlay":
                         adjustments.append(f"Opponent: {opponent_map[pick.player_name]}")
                     if pick.player_name in rest_map:
                         days = rest_map[pick.player_name]
-                        rest_desc = {
-                            0: "Back-to-back",
-                            1: "1 day rest",
-                            2: "2 days rest (optimal)",
-                            3: "3 days rest"
-                        }.get(days, f"{days} days rest")
+                        rest_desc = REST_DESCRIPTIONS.get(days, f"{days} days rest")
                         adjustments.append(f"Rest: {rest_desc}")
 
                     if adjustments:
@@ -862,24 +1068,27 @@ elif st.session_state.mode_selected == "parlay":
                     st.dataframe(adj_df, use_container_width=True, hide_index=True)
 
             # Explanation
-            with st.expander("📖 How is Parlay Probability Calculated?"):
-                st.markdown("**Individual Probabilities:**")
-                for i, pick in enumerate(result.picks, 1):
-                    if pick.probability:
-                        st.write(f"- Pick {i} ({pick.player_name} {pick.stat_type.upper()} {pick.direction} {pick.line}): {pick.probability*100:.1f}%")
+            # The explanation is only built while toggled open; an expander
+            # would format it on every rerun even when collapsed
+            if st.toggle("📖 How is Parlay Probability Calculated?", key="parlay_explain"):
+                with st.container(border=True):
+                    st.markdown("**Individual Probabilities:**")
+                    for i, pick in enumerate(result.picks, 1):
+                        if pick.probability:
+                            st.write(f"- Pick {i} ({pick.player_name} {pick.stat_type.upper()} {pick.direction} {pick.line}): {pick.probability*100:.1f}%")
 
-                st.markdown(f"""
-                **Parlay Probability (assuming independence):**
+                    st.markdown(f"""
+                    **Parlay Probability (assuming independence):**
 
-                = {" × ".join([f"{p.probability*100:.1f}%" for p in result.picks if p.probability])}
-                = **{result.parlay_probability*100:.1f}%**
+                    = {" × ".join([f"{p.probability*100:.1f}%" for p in result.picks if p.probability])}
+                    = **{result.parlay_probability*100:.1f}%**
 
-                **Expected Value:**
+                    **Expected Value:**
 
-                = (Probability × Payout) - ((1 - Probability) × Stake)
-                = ({result.parlay_probability:.3f} × ${stake * payout_multiplier:.2f}) - ({1 - result.parlay_probability:.3f} × ${stake:.2f})
-                = **${result.expected_value:.2f}**
-                """)
+                    = (Probability × Payout) - ((1 - Probability) × Stake)
+                    = ({result.parlay_probability:.3f} × ${stake * payout_multiplier:.2f}) - ({1 - result.parlay_probability:.3f} × ${stake:.2f})
+                    = **${result.expected_value:.2f}**
+                    """)
 
             # Save Parlay as Paper Trade
             st.markdown("---")
@@ -892,42 +1101,44 @@ elif st.session_state.mode_selected == "parlay":
 
             with col_parlay2:
                 if st.button("💾 Save Parlay", type="primary", use_container_width=True, key="save_parlay_bet"):
-                    from paper_trading import PaperTradingManager
-
                     manager = PaperTradingManager()
 
                     sufficient, available = manager.check_sufficient_funds(stake)
                     if not sufficient:
                         st.error(f"Insufficient funds! Available: ${available:.2f}")
                     else:
+                        # Player ids for every leg in one query, and the pick
+                        # configs (rest/opponent info) by (player, stat)
+                        player_ids = dict(manager.session.query(Player.name, Player.id).filter(
+                            Player.name.in_([pick.player_name for pick in result.picks])
+                        ).all())
+                        configs = {(c['player'], c['stat_type']): c for c in st.session_state.parlay_picks}
+
+                        # Confidence as a z-score from each leg's probability, via one
+                        # inverse normal CDF call (3.0 for a certain leg)
+                        probabilities = np.array(
+                            [np.nan if pick.probability is None else pick.probability for pick in result.picks],
+                            dtype=np.float64
+                        )
+                        z_scores = np.where(probabilities < 1, np.abs(norm.ppf(1 - probabilities)), 3.0)
+
                         # Prepare picks data
                         picks_data = []
-                        for pick in result.picks:
-                            # Get player_id from database
-                            from database import Player
-                            session = manager.session
-                            player = session.query(Player).filter_by(name=pick.player_name).first()
-
-                            if player and pick.prediction is not None and pick.probability is not None:
-                                # Find the corresponding config to get rest/opponent info
-                                config = next((c for c in st.session_state.parlay_picks if c['player'] == pick.player_name and c['stat_type'] == pick.stat_type), None)
-
-                                # Calculate confidence using z-score from normal distribution
-                                # Using inverse CDF to get z-score from probability
-                                if pick.direction == "OVER":
-                                    z_score = abs(norm.ppf(1 - pick.probability)) if pick.probability < 1 else 3.0
-                                else:
-                                    z_score = abs(norm.ppf(1 - pick.probability)) if pick.probability < 1 else 3.0
+                        for pick, z_score in zip(result.picks, z_scores):
+                            player_id = player_ids.get(pick.player_name)
+
+                            if player_id and pick.prediction is not None and pick.probability is not None:
+                                config = configs.get((pick.player_name, pick.stat_type))
 
                                 picks_data.append({
-                                    'player_id': player.id,
+                                    'player_id': player_id,
                                     'player_name': pick.player_name,
                                     'stat_type': pick.stat_type,
                                     'line': pick.line,
                                     'direction': pick.direction,
                                     'prediction': pick.prediction,
                                     'probability': pick.probability,
-                                    'confidence': z_score,
+                                    'confidence': float(z_score),
                                     'opponent': config['opponent'] if config else None,
                                     'days_rest': config['days_rest'] if config else None
                                 })
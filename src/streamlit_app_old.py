@@ -12,6 +12,9 @@ import numpy as np
 from datetime import datetime, timedelta
 from sqlalchemy import desc
 
+# Rest labels indexed by days of rest capped at 4
+REST_DESCRIPTIONS = ("Back-to-back", "1 day", "2 days (optimal)", "3 days", "4+ days")
+
 # Page configuration
 st.set_page_config(
     page_title="NBA Player Performance Predictor",
@@ -278,7 +281,7 @@ if st.sidebar.button("🔮 Generate Prediction", type="primary"):
             if days_rest is not None:
                 adjusted = predictor.apply_rest_adjustment(final_pred, days_rest)
                 if adjusted != final_pred:
-                    rest_desc = {0: "Back-to-back", 1: "1 day", 2: "2 days (optimal)", 3: "3 days", 4: "4+ days"}.get(min(days_rest, 4))
+                    rest_desc = REST_DESCRIPTIONS[min(days_rest, 4)]
                     adjustments_applied.append(f"Rest: {rest_desc}")
                     final_pred = adjusted
 
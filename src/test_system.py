@@ -39,15 +39,13 @@ def collect_sample_data():
     try:
         collector = NBADataCollector()
         
-        # Check if we already have data
-        session = get_session()
-        game_count = session.query(GameStats).count()
+        # Check if we already have data (on the collector's own session)
+        game_count = collector.session.query(GameStats).count()
         
         if game_count > 0:
             print(f"✓ Database already has {game_count} games")
             print("  Skipping data collection...")
             collector.close()
-            session.close()
             return True
         
         print("Fetching all NBA players... (this takes ~30 seconds)")
@@ -65,7 +63,6 @@ def collect_sample_data():
             collector.fetch_player_game_stats(player, season='2024-25')
         
         collector.close()
-        session.close()
         print("✓ Data collection complete!")
         return True
         
@@ -3,53 +3,110 @@ Script to update game stats for all players in the database
 Run this periodically to keep data fresh
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from data_collector import NBADataCollector
 from database import get_session, Player
+import threading
 import time
 
-def update_all_players(season='2025-26', max_games=30):
+# Minimum spacing between NBA API requests, across all worker threads
+REQUEST_INTERVAL = 0.7
+
+class RateLimiter:
+    """Space calls at least `interval` seconds apart, shared by several threads"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        """Block until this caller's slot comes up"""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+def update_players(player_names, season='2025-26', max_games=30, max_workers=4):
+    """
+    Update game stats for several players with a pool of worker threads
+
+    Each worker has its own NBADataCollector (database session and HTTP
+    client are not shared between threads), and requests are spaced
+    REQUEST_INTERVAL apart overall to respect the API rate limit.
+
+    Returns:
+        (successful, failed) counts
+    """
+    limiter = RateLimiter(REQUEST_INTERVAL)
+    local = threading.local()
+    collectors = []
+    collectors_lock = threading.Lock()
+
+    def update_one(player_name):
+        if not hasattr(local, 'collector'):
+            local.collector = NBADataCollector()
+            with collectors_lock:
+                collectors.append(local.collector)
+
+        limiter.wait()
+        local.collector.fetch_player_game_stats(player_name, season=season, max_games=max_games)
+
+    total_players = len(player_names)
+    successful = 0
+    failed = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(update_one, name): name for name in player_names}
+
+            for i, future in enumerate(as_completed(futures), 1):
+                player_name = futures[future]
+                try:
+                    future.result()
+                    print(f"[{i}/{total_players}] {player_name} ✓")
+                    successful += 1
+                except Exception as e:
+                    print(f"[{i}/{total_players}] {player_name} ✗ Error: {e}")
+                    failed += 1
+    finally:
+        for collector in collectors:
+            collector.close()
+
+    return successful, failed
+
+def update_all_players(season='2025-26', max_games=30, max_workers=4):
     """
     Update game stats for all players in the database
 
     Args:
         season: NBA season (e.g., '2025-26')
         max_games: Maximum number of recent games to fetch per player
+        max_workers: Number of players fetched concurrently
     """
     session = get_session()
-    collector = NBADataCollector()
 
     try:
-        # Get all players from database
-        all_players = session.query(Player).all()
-        total_players = len(all_players)
-
-        print(f"Updating data for {total_players} players...")
-        print(f"Season: {season}, Max games per player: {max_games}")
-        print("-" * 60)
-
-        successful = 0
-        failed = 0
-
-        for i, player in enumerate(all_players, 1):
-            try:
-                print(f"[{i}/{total_players}] Updating {player.name}...", end=" ")
-                collector.fetch_player_game_stats(player.name, season=season, max_games=max_games)
-                print("✓")
-                successful += 1
-                time.sleep(0.7)  # Respect API rate limits
-            except Exception as e:
-                print(f"✗ Error: {e}")
-                failed += 1
-                time.sleep(1)  # Wait a bit longer after errors
-
-        print("-" * 60)
-        print(f"\nUpdate complete!")
-        print(f"Successful: {successful}")
-        print(f"Failed: {failed}")
-
+        # Get all player names from database
+        player_names = [name for (name,) in session.query(Player.name)]
     finally:
         session.close()
-        collector.close()
+
+    total_players = len(player_names)
+
+    print(f"Updating data for {total_players} players...")
+    print(f"Season: {season}, Max games per player: {max_games}, Workers: {max_workers}")
+    print("-" * 60)
+
+    successful, failed = update_players(player_names, season, max_games, max_workers)
+
+    print("-" * 60)
+    print(f"\nUpdate complete!")
+    print(f"Successful: {successful}")
+    print(f"Failed: {failed}")
 
 if __name__ == "__main__":
     import argparse
@@ -61,22 +118,16 @@ if __name__ == "__main__":
                         help='Maximum number of recent games to fetch per player')
     parser.add_argument('--players', type=str, nargs='+',
                         help='Specific player names to update (optional)')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Number of players fetched concurrently')
 
     args = parser.parse_args()
 
     if args.players:
         # Update only specific players
-        collector = NBADataCollector()
         print(f"Updating {len(args.players)} specific players...")
-        for player_name in args.players:
-            try:
-                print(f"Updating {player_name}...", end=" ")
-                collector.fetch_player_game_stats(player_name, season=args.season, max_games=args.max_games)
-                print("✓")
-                time.sleep(0.7)
-            except Exception as e:
-                print(f"✗ Error: {e}")
-        collector.close()
+        update_players(args.players, season=args.season, max_games=args.max_games,
+                       max_workers=args.workers)
     else:
         # Update all players
-        update_all_players(season=args.season, max_games=args.max_games)
+        update_all_players(season=args.season, max_games=args.max_games, max_workers=args.workers)
@@ -3,54 +3,148 @@ Quick script to view player data from the database
 """
 
 from database import get_session, Player, GameStats
-from sqlalchemy import desc
+from functools import lru_cache
+from sqlalchemy import bindparam, desc, func, select
 import pandas as pd
+import orjson
+import sys
+import time
+import numpy as np
+
+# Longest a player's fetched games stay cached for the interactive viewer (seconds)
+PLAYER_GAMES_TTL = 300
+
+# Columns covered by the statistical summary
+SUMMARY_STATS = ['points', 'rebounds', 'assists', 'minutes']
+
+# describe() rows, in order, as SQL aggregates of one column
+SUMMARY_AGGREGATES = {
+    'count': func.count,
+    'mean': func.avg,
+    'std': func.stddev_samp,
+    'min': func.min,
+    '25%': lambda column: func.percentile_cont(0.25).within_group(column),
+    '50%': lambda column: func.percentile_cont(0.5).within_group(column),
+    '75%': lambda column: func.percentile_cont(0.75).within_group(column),
+    'max': func.max,
+}
+
+# Statements built once at import and executed with bound parameters
+_Q_PLAYER_ID_BY_NAME = select(Player.id).where(Player.name == bindparam('name'))
+
+# All of a player's games (the displayed columns), most recent first
+_Q_PLAYER_GAMES = select(
+    GameStats.game_date,
+    GameStats.opponent,
+    GameStats.is_home,
+    GameStats.days_rest,
+    GameStats.is_back_to_back,
+    GameStats.points,
+    GameStats.rebounds,
+    GameStats.assists,
+    GameStats.minutes
+).where(GameStats.player_id == bindparam('player_id'))\
+    .order_by(desc(GameStats.game_date))
+
+_Q_RECENT_GAMES = _Q_PLAYER_GAMES.limit(bindparam('limit'))
+
+# Every player with its game count, in one grouped query
+_Q_ALL_PLAYERS_WITH_COUNT = select(Player.name, func.count(GameStats.id))\
+    .outerjoin(GameStats, GameStats.player_id == Player.id)\
+    .group_by(Player.id, Player.name)\
+    .order_by(Player.name)
+
+# Game count, date range, then the describe() table in SUMMARY_AGGREGATES x
+# SUMMARY_STATS order, as one row
+_Q_STATS_SUMMARY = select(
+    func.count(),
+    func.max(GameStats.game_date),
+    func.min(GameStats.game_date),
+    *[aggregate(getattr(GameStats, stat))
+      for aggregate in SUMMARY_AGGREGATES.values()
+      for stat in SUMMARY_STATS]
+).where(GameStats.player_id == bindparam('player_id'))
+
+# Player name -> Player.id, kept across lookups (the interactive loop and
+# view_player_report ask for the same player repeatedly)
+_player_ids = {}
+
+def _get_player_id(session, player_name):
+    """Player.id for a name (None if not found), cached once found"""
+    player_id = _player_ids.get(player_name)
+    if player_id is None:
+        player_id = session.scalar(_Q_PLAYER_ID_BY_NAME, {'name': player_name})
+        if player_id is not None:
+            _player_ids[player_name] = player_id
+    return player_id
+
+def _flags(values):
+    """Boolean array from nullable column values (missing counts as False)"""
+    return pd.array(values, dtype='boolean').fillna(False).to_numpy(dtype=bool)
+
+def _recent_games_frame(games):
+    """
+    Recent games display table
+
+    Args:
+        games: Mapping of GameStats column name -> sequence of values,
+            most recent game first (a DataFrame or dict of columns)
+    """
+    return pd.DataFrame({
+        'Date': games['game_date'],
+        'Opponent': games['opponent'],
+        'Home/Away': np.where(_flags(games['is_home']), 'Home', 'Away'),
+        'Days Rest': games['days_rest'],
+        'B2B': np.where(_flags(games['is_back_to_back']), 'Yes', 'No'),
+        'Points': games['points'],
+        'Rebounds': games['rebounds'],
+        'Assists': games['assists'],
+        'Minutes': games['minutes']
+    })
+
+def _print_recent_games(player_name, df, cached=False):
+    """Print the recent games table"""
+    print(f"\n{'='*80}")
+    print(f"Recent Games for {player_name} ({len(df)} games){' (cached)' if cached else ''}")
+    print(f"{'='*80}")
+    df.to_string(buf=sys.stdout, index=False)
+    sys.stdout.write('\n')
+    print(f"{'='*80}\n")
+
+def _print_stats_summary(player_name, total_games, most_recent, oldest, summary):
+    """Print the statistical summary (summary is a describe()-shaped DataFrame)"""
+    print(f"\n{'='*60}")
+    print(f"Statistical Summary for {player_name}")
+    print(f"{'='*60}")
+    print(f"Total games: {total_games}")
+    print(f"\nMost recent game: {most_recent}")
+    print(f"Oldest game: {oldest}")
+    print(f"\n{summary}")
+    print(f"{'='*60}\n")
 
 def view_player_games(player_name, limit=20):
     """View recent games for a player"""
     session = get_session()
 
     try:
-        # Find player
-        player = session.query(Player).filter_by(name=player_name).first()
+        player_id = _get_player_id(session, player_name)
 
-        if not player:
+        if player_id is None:
             print(f"Player '{player_name}' not found in database.")
             return
 
-        # Get recent games
-        games = session.query(GameStats)\
-            .filter_by(player_id=player.id)\
-            .order_by(desc(GameStats.game_date))\
-            .limit(limit)\
-            .all()
+        # Get recent games, only the displayed columns
+        games = session.execute(
+            _Q_RECENT_GAMES, {'player_id': player_id, 'limit': limit}
+        ).all()
 
         if not games:
             print(f"No games found for {player_name}")
             return
 
-        # Convert to DataFrame for nice display
-        data = []
-        for game in games:
-            data.append({
-                'Date': game.game_date,
-                'Opponent': game.opponent,
-                'Home/Away': 'Home' if game.is_home else 'Away',
-                'Days Rest': game.days_rest,
-                'B2B': 'Yes' if game.is_back_to_back else 'No',
-                'Points': game.points,
-                'Rebounds': game.rebounds,
-                'Assists': game.assists,
-                'Minutes': game.minutes
-            })
-
-        df = pd.DataFrame(data)
-
-        print(f"\n{'='*80}")
-        print(f"Recent Games for {player_name} ({len(games)} games)")
-        print(f"{'='*80}")
-        print(df.to_string(index=False))
-        print(f"{'='*80}\n")
+        # Build the DataFrame column by column for nice display
+        df = _recent_games_frame(dict(zip(games[0]._fields, zip(*games))))
+        _print_recent_games(player_name, df)
 
         return df
 
@@ -62,14 +156,14 @@ def list_all_players():
     session = get_session()
 
     try:
-        players = session.query(Player).order_by(Player.name).all()
+        players = session.execute(_Q_ALL_PLAYERS_WITH_COUNT).all()
 
         print(f"\nTotal players in database: {len(players)}\n")
 
-        for i, player in enumerate(players, 1):
-            # Count games for each player
-            game_count = session.query(GameStats).filter_by(player_id=player.id).count()
-            print(f"{i:3d}. {player.name:30s} - {game_count} games")
+        sys.stdout.write(''.join(
+            f"{i:3d}. {name:30s} - {game_count} games\n"
+            for i, (name, game_count) in enumerate(players, 1)
+        ))
 
     finally:
         session.close()
@@ -79,51 +173,119 @@ def view_player_stats_summary(player_name):
     session = get_session()
 
     try:
-        player = session.query(Player).filter_by(name=player_name).first()
+        player_id = _get_player_id(session, player_name)
 
-        if not player:
+        if player_id is None:
             print(f"Player '{player_name}' not found in database.")
             return
 
-        games = session.query(GameStats)\
-            .filter_by(player_id=player.id)\
-            .order_by(desc(GameStats.game_date))\
-            .all()
+        # The whole describe() table computed by the database, one row back
+        row = session.execute(_Q_STATS_SUMMARY, {'player_id': player_id}).one()
 
-        if not games:
+        total_games, most_recent, oldest = row[:3]
+
+        if not total_games:
             print(f"No games found for {player_name}")
             return
 
-        # Convert to DataFrame for statistics
-        data = {
-            'points': [g.points for g in games if g.points is not None],
-            'rebounds': [g.rebounds for g in games if g.rebounds is not None],
-            'assists': [g.assists for g in games if g.assists is not None],
-            'minutes': [g.minutes for g in games if g.minutes is not None],
-        }
+        values = np.array(row[3:], dtype=float).reshape(len(SUMMARY_AGGREGATES), len(SUMMARY_STATS))
+        summary = pd.DataFrame(values, index=list(SUMMARY_AGGREGATES), columns=SUMMARY_STATS)
+        _print_stats_summary(player_name, total_games, most_recent, oldest, summary)
+
+    finally:
+        session.close()
+
+@lru_cache(maxsize=32)
+def _fetch_player_games(player_name, ttl_window):
+    """
+    All games for a player, most recent first
+
+    Cached so the interactive loop can re-show a player without going back to
+    the database. ttl_window is time.monotonic() // PLAYER_GAMES_TTL, so a
+    cached frame stops matching once its window has passed. Raises
+    LookupError if the player is not found (lru_cache does not keep
+    exceptions, so a player added later is found on the next lookup).
+    Callers must not modify the returned DataFrame.
+    """
+    session = get_session()
+
+    try:
+        player_id = _get_player_id(session, player_name)
 
-        df = pd.DataFrame(data)
+        if player_id is None:
+            raise LookupError(player_name)
 
-        print(f"\n{'='*60}")
-        print(f"Statistical Summary for {player_name}")
-        print(f"{'='*60}")
-        print(f"Total games: {len(games)}")
-        print(f"\nMost recent game: {games[0].game_date}")
-        print(f"Oldest game: {games[-1].game_date}")
-        print(f"\n{df.describe()}")
-        print(f"{'='*60}\n")
+        return pd.read_sql_query(
+            _Q_PLAYER_GAMES, session.connection(), params={'player_id': player_id}
+        )
+
+    finally:
+        session.close()
+
+def clear_player_cache():
+    """Forget cached player games and player ids"""
+    _fetch_player_games.cache_clear()
+    _player_ids.clear()
+
+def view_player_report(player_name, limit=20):
+    """View recent games and the statistical summary for a player, from one games query"""
+    hits = _fetch_player_games.cache_info().hits
+
+    try:
+        games = _fetch_player_games(player_name, int(time.monotonic() // PLAYER_GAMES_TTL))
+    except LookupError:
+        print(f"Player '{player_name}' not found in database.")
+        return
+
+    cached = _fetch_player_games.cache_info().hits > hits
+
+    if games.empty:
+        print(f"No games found for {player_name}")
+        return
+
+    # The recent view is the first `limit` rows
+    df = _recent_games_frame(games.head(limit))
+    _print_recent_games(player_name, df, cached)
+    _print_stats_summary(player_name, len(games), games['game_date'].iloc[0],
+                         games['game_date'].iloc[-1], games[SUMMARY_STATS].describe())
+
+    return df
+
+def dump_player_games_json(player_name, limit=20):
+    """Write a player's recent games to stdout as a JSON array of row objects"""
+    session = get_session()
+
+    try:
+        player_id = _get_player_id(session, player_name)
+
+        if player_id is None:
+            print(f"Player '{player_name}' not found in database.", file=sys.stderr)
+            return
+
+        # Straight from the result rows to JSON, no DataFrame or table formatting
+        games = session.execute(
+            _Q_RECENT_GAMES, {'player_id': player_id, 'limit': limit}
+        ).mappings().all()
+
+        sys.stdout.buffer.write(orjson.dumps([dict(game) for game in games]))
+        sys.stdout.buffer.write(b'\n')
 
     finally:
         session.close()
 
 if __name__ == "__main__":
-    import sys
+    args = sys.argv[1:]
+    as_json = '--json' in args
+    if as_json:
+        args.remove('--json')
 
-    if len(sys.argv) > 1:
+    if args:
         # Player name provided as argument
-        player_name = ' '.join(sys.argv[1:])
-        view_player_games(player_name)
-        view_player_stats_summary(player_name)
+        player_name = ' '.join(args)
+        if as_json:
+            dump_player_games_json(player_name)
+        else:
+            view_player_report(player_name)
     else:
         # Interactive mode
         print("\nNBA Player Data Viewer")
@@ -132,17 +294,30 @@ if __name__ == "__main__":
         print("2. List all players")
         print("3. Exit")
 
+        def run_player_report():
+            player_name = input("Enter player name: ").strip()
+            view_player_report(player_name)
+
+        actions = {
+            '1': run_player_report,
+            '2': list_all_players,
+        }
+
         while True:
             choice = input("\nEnter choice (1-3): ").strip()
 
-            if choice == '1':
-                player_name = input("Enter player name: ").strip()
-                view_player_games(player_name)
-                view_player_stats_summary(player_name)
-            elif choice == '2':
-                list_all_players()
-            elif choice == '3':
+            if choice == '3':
                 print("Goodbye!")
                 break
+
+            if choice == 'r':
+                # Hidden option: forget cached player games and ids
+                clear_player_cache()
+                print("Cache cleared.")
+                continue
+
+            action = actions.get(choice)
+            if action:
+                action()
             else:
                 print("Invalid choice. Please enter 1, 2, or 3.")